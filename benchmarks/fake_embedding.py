@@ -0,0 +1,57 @@
+import asyncio
+import hashlib
+from typing import List
+
+import numpy as np
+
+from src.embeddings.base import EmbeddingProvider, as_float32_matrix
+
+
+class DeterministicEmbeddingProvider(EmbeddingProvider):
+    """
+    Embedding provider that derives unit vectors from a hash of the text.
+    The same text always gets the same vector, so benchmarks run offline and reproducibly.
+    :param vector_size: The size of the vectors.
+    :param latency_ms: Simulated time spent in each embedding call.
+    """
+
+    def __init__(self, vector_size: int = 384, latency_ms: float = 0.0) -> None:
+        super().__init__()
+        self.vector_size = vector_size
+        self.latency_ms = latency_ms
+
+    def _embed(self, text: str) -> np.ndarray:
+        seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+        vector = np.random.default_rng(seed).standard_normal(self.vector_size, dtype=np.float32)
+        vector /= np.linalg.norm(vector)
+        return vector
+
+    def _embed_all(self, texts: List[str]) -> np.ndarray:
+        return as_float32_matrix([self._embed(text) for text in texts])
+
+    async def _simulate_latency(self) -> None:
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+
+    async def embed_documents(self, documents: List[str]) -> List[List[float]]:
+        return (await self.embed_documents_array(documents)).tolist()
+
+    async def embed_query(self, query: str) -> List[float]:
+        return (await self.embed_queries_array([query]))[0].tolist()
+
+    async def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        return (await self.embed_queries_array(queries)).tolist()
+
+    async def embed_documents_array(self, documents: List[str]) -> np.ndarray:
+        await self._simulate_latency()
+        return self._embed_all(documents)
+
+    async def embed_queries_array(self, queries: List[str]) -> np.ndarray:
+        await self._simulate_latency()
+        return self._embed_all(queries)
+
+    def get_vector_name(self) -> str:
+        return "deterministic"
+
+    def get_vector_size(self) -> int:
+        return self.vector_size
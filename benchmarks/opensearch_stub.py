@@ -0,0 +1,221 @@
+import json
+import threading
+import time
+import typing as T
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+
+class OpenSearchStub:
+    """
+    Minimal OpenSearch HTTP stand-in for offline benchmarks.
+    Serves a single knn index from memory, with brute-force cosine search.
+    Supports the requests made by AOSSConnector: index mapping, _search, _msearch and _bulk.
+    Bulk requests can be throttled, to exercise retries: set `throttled_requests` to answer
+    the next requests with a 429, or `throttled_items` to reject the next documents with a 429.
+    Set `rejected_items` to reject the next documents with a 400, which is not worth retrying,
+    or `refused_requests` to answer the next requests with a 400.
+    The size of each bulk request body is recorded in `bulk_request_bytes`.
+    :param index_name: The name of the index.
+    :param dimension: The dimension of the embedding field.
+    :param latency_ms: Simulated network and server time added to every request.
+    """
+
+    def __init__(self, index_name: str, dimension: int, latency_ms: float = 0.0) -> None:
+        self.index_name = index_name
+        self.dimension = dimension
+        self.latency_ms = latency_ms
+        self._lock = threading.Lock()
+        self._sources: T.List[T.Dict[str, T.Any]] = []
+        self._vectors = np.zeros((0, dimension), dtype=np.float32)
+        self._server: T.Optional[ThreadingHTTPServer] = None
+        self.throttled_requests = 0
+        self.throttled_items = 0
+        self.rejected_items = 0
+        self.refused_requests = 0
+        self.bulk_requests = 0
+        self.bulk_request_bytes: T.List[int] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "OpenSearchStub":
+        stub = self
+
+        class Handler(_StubRequestHandler):
+            pass
+
+        Handler.stub = stub
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def add_documents(self, documents: T.List[T.Dict[str, T.Any]]) -> None:
+        """
+        Index documents, each with text, metadata and embedding fields.
+        """
+        if not documents:
+            return
+        vectors = np.asarray([document["embedding"] for document in documents], dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        with self._lock:
+            self._sources.extend(documents)
+            self._vectors = np.vstack([self._vectors, vectors])
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._sources)
+
+    def search(self, body: T.Dict[str, T.Any]) -> T.Dict[str, T.Any]:
+        knn = body["query"]["knn"]["embedding"]
+        query = np.asarray(knn["vector"], dtype=np.float32)
+        query /= np.linalg.norm(query)
+        size = body.get("size", knn.get("k", 10))
+        with self._lock:
+            vectors, sources = self._vectors, self._sources
+        scores = vectors @ query
+        top = np.argsort(-scores)[:size]
+        fields = body.get("_source")
+        return {
+            "hits": {
+                "total": {"value": len(top), "relation": "eq"},
+                "hits": [
+                    {"_index": self.index_name, "_score": float(scores[i]), "_source": _project(sources[i], fields)}
+                    for i in top
+                ]
+            }
+        }
+
+    def bulk(self, body: bytes) -> T.Union[int, T.Dict[str, T.Any]]:
+        """
+        Index the documents of a _bulk request.
+        :return: The bulk response, or the HTTP status if the whole request is throttled or refused.
+        """
+        with self._lock:
+            self.bulk_requests += 1
+            self.bulk_request_bytes.append(len(body))
+            if self.throttled_requests:
+                self.throttled_requests -= 1
+                return 429
+            if self.refused_requests:
+                self.refused_requests -= 1
+                return 400
+        lines = [json.loads(line) for line in body.splitlines() if line.strip()]
+        items, documents = [], []
+        for action, source in zip(lines[::2], lines[1::2]):
+            with self._lock:
+                throttled = self.throttled_items > 0
+                self.throttled_items -= throttled
+                rejected = not throttled and self.rejected_items > 0
+                self.rejected_items -= rejected
+            if throttled:
+                items.append({"index": {"status": 429, "error": {"type": "es_rejected_execution_exception"}}})
+            elif rejected:
+                items.append({"index": {"status": 400, "error": {"type": "mapper_parsing_exception"}}})
+            else:
+                items.append({"index": {"_index": action["index"]["_index"], "status": 201, "result": "created"}})
+                documents.append(source)
+        self.add_documents(documents)
+        return {"took": 1, "errors": len(documents) < len(items), "items": items}
+
+    def mapping(self) -> T.Dict[str, T.Any]:
+        return {
+            self.index_name: {
+                "mappings": {
+                    "properties": {
+                        "embedding": {"type": "knn_vector", "dimension": self.dimension},
+                        "text": {"type": "text"},
+                        "metadata": {"type": "object"}
+                    }
+                }
+            }
+        }
+
+
+def _project(source: T.Dict[str, T.Any], fields: T.Optional[T.List[str]]) -> T.Dict[str, T.Any]:
+    """
+    Keep only the requested fields of a document, supporting one level of nesting such as metadata.key.
+    """
+    if fields is None:
+        return source
+    projected: T.Dict[str, T.Any] = {}
+    for field in fields:
+        name, _, nested = field.partition(".")
+        if name not in source:
+            continue
+        if not nested:
+            projected[name] = source[name]
+        elif isinstance(source[name], dict) and nested in source[name]:
+            projected.setdefault(name, {})[nested] = source[name][nested]
+    return projected
+
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    stub: OpenSearchStub
+    protocol_version = "HTTP/1.1"
+    # Responses are written as headers then body, Nagle with delayed ACKs would hold the body back ~40 ms
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: T.Optional[T.Dict[str, T.Any]] = None) -> None:
+        data = json.dumps(body).encode() if body is not None else b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _not_found(self) -> None:
+        self._send(404, {
+            "error": {"type": "index_not_found_exception", "reason": "no such index"},
+            "status": 404
+        })
+
+    def _path_parts(self) -> T.List[str]:
+        return [part for part in self.path.split("?")[0].split("/") if part]
+
+    def _handle(self) -> None:
+        if self.stub.latency_ms:
+            time.sleep(self.stub.latency_ms / 1000)
+        parts = self._path_parts()
+        body = self._read_body()
+        if parts and not parts[0].startswith("_") and parts[0] != self.stub.index_name:
+            return self._not_found()
+
+        if self.command == "HEAD" and len(parts) == 1:
+            return self._send(200)
+        if self.command == "GET" and parts[1:] == ["_mapping"]:
+            return self._send(200, self.stub.mapping())
+        if parts[-1:] == ["_search"]:
+            return self._send(200, self.stub.search(json.loads(body)))
+        if parts[-1:] == ["_msearch"]:
+            lines = [json.loads(line) for line in body.splitlines() if line.strip()]
+            return self._send(200, {
+                "responses": [{**self.stub.search(search), "status": 200} for search in lines[1::2]]
+            })
+        if parts[-1:] == ["_bulk"]:
+            response = self.stub.bulk(body)
+            if response == 429:
+                return self._send(429, {"error": {"type": "too_many_requests"}, "status": 429})
+            if response == 400:
+                return self._send(400, {"error": {"type": "illegal_argument_exception"}, "status": 400})
+            return self._send(200, response)
+        self._send(400, {"error": {"type": "illegal_argument_exception", "reason": f"unsupported {self.path}"}})
+
+    do_GET = do_HEAD = do_POST = do_PUT = _handle
@@ -0,0 +1,352 @@
+"""
+Throughput and latency benchmarks for the store and find tools of the MCP servers.
+
+The servers are driven through an in-memory MCP client session and run fully offline:
+Qdrant in local mode, AOSS against a local OpenSearch stand-in, the embedded local store
+in a temporary directory, and a deterministic embedding provider instead of a real model.
+Results are written as JSON so that runs on different commits can be compared.
+
+    python -m benchmarks.run --providers QDRANT AOSS --concurrency 1 8 32 --output bench.json
+    python -m benchmarks.run --output new.json --compare bench.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import typing as T
+
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from benchmarks.fake_embedding import DeterministicEmbeddingProvider
+from benchmarks.opensearch_stub import OpenSearchStub
+from src.embeddings.types import EmbeddingProviderSettings
+from src.vectordb_mcp_servers.base_provider.base_mcp import Entry
+
+WORDS = (
+    "apple river mountain coffee meeting project deadline budget travel flight hotel "
+    "birthday music guitar python database vector search memory agent weather garden "
+    "doctor appointment invoice family weekend report design review release customer"
+).split()
+
+BENCHMARK_COLLECTION = "benchmark"
+
+
+def make_text(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 24)))
+
+
+def percentile(values: T.List[float], q: float) -> float:
+    """
+    Nearest-rank percentile of a list of values.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+async def run_workload(
+    call: T.Callable[[int], T.Awaitable[T.Any]],
+    operations: int,
+    concurrency: int
+) -> T.Dict[str, float]:
+    """
+    Run `operations` calls with at most `concurrency` of them in flight.
+    :return: Latency percentiles in milliseconds and throughput in operations per second.
+    """
+    latencies: T.List[float] = []
+    next_operation = 0
+
+    async def worker():
+        nonlocal next_operation
+        while next_operation < operations:
+            operation = next_operation
+            next_operation += 1
+            start = time.perf_counter()
+            await call(operation)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return {
+        "operations": len(latencies),
+        "elapsed_s": elapsed,
+        "ops_per_sec": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": sum(latencies_ms) / len(latencies_ms) if latencies_ms else 0.0,
+        "p50_ms": percentile(latencies_ms, 50),
+        "p95_ms": percentile(latencies_ms, 95),
+        "p99_ms": percentile(latencies_ms, 99),
+    }
+
+
+async def call_tool(session, name: str, arguments: T.Dict[str, T.Any]) -> str:
+    result = await session.call_tool(name, arguments)
+    if result.isError:
+        raise RuntimeError(f"Tool {name} failed: {result.content[0].text}")
+    return result.content[0].text
+
+
+class QdrantTarget:
+    """
+    Qdrant server in local mode, preloaded with documents.
+    """
+    name = "QDRANT"
+    find_tool = "qdrant-find"
+    store_tool = "qdrant-store"
+
+    def __init__(self, args: argparse.Namespace, embedding_provider: DeterministicEmbeddingProvider) -> None:
+        self.args = args
+        self.embedding_provider = embedding_provider
+        self._tmpdir = None
+
+    async def setup(self, collection_size: int, rng: random.Random):
+        from src.vectordb_mcp_servers.qdrant_mcp_server.mcp_server import QdrantMCPServer
+        from src.vectordb_mcp_servers.qdrant_mcp_server.settings import QdrantSettings, QdrantToolSettings
+
+        location = {"QDRANT_URL": ":memory:"}
+        if self.args.qdrant_local_path:
+            self._tmpdir = tempfile.TemporaryDirectory(dir=self.args.qdrant_local_path)
+            location = {"QDRANT_LOCAL_PATH": self._tmpdir.name}
+        self.server = QdrantMCPServer(
+            tool_settings=QdrantToolSettings(),
+            qdrant_settings=QdrantSettings(COLLECTION_NAME=BENCHMARK_COLLECTION, **location),
+            embedding_provider_settings=EmbeddingProviderSettings(),
+            embedding_provider=self.embedding_provider,
+            eager_startup=True,
+            log_level="WARNING"
+        )
+        connector = self.server.qdrant_connector
+        for offset in range(0, collection_size, 256):
+            await asyncio.gather(*(
+                connector.store(Entry(content=make_text(rng), metadata={"i": i}))
+                for i in range(offset, min(offset + 256, collection_size))
+            ))
+        return self.server
+
+    def teardown(self):
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
+
+class AossTarget:
+    """
+    AOSS server connected to a local OpenSearch stand-in, preloaded with documents.
+    """
+    name = "AOSS"
+    find_tool = "opensearch-find"
+    store_tool = "opensearch-store"
+
+    def __init__(self, args: argparse.Namespace, embedding_provider: DeterministicEmbeddingProvider) -> None:
+        self.args = args
+        self.embedding_provider = embedding_provider
+        self.stub: T.Optional[OpenSearchStub] = None
+
+    async def setup(self, collection_size: int, rng: random.Random):
+        from src.vectordb_mcp_servers.aoss.aoss_mcp import AossMCPServer
+        from src.vectordb_mcp_servers.aoss.settings import AossSettings, AossToolSettings
+
+        self.stub = OpenSearchStub(
+            BENCHMARK_COLLECTION, self.embedding_provider.vector_size, latency_ms=self.args.backend_latency_ms
+        ).start()
+        texts = [make_text(rng) for _ in range(collection_size)]
+        embeddings = await self.embedding_provider.embed_documents(texts)
+        self.stub.add_documents([
+            {"text": text, "metadata": {"i": i}, "embedding": embedding}
+            for i, (text, embedding) in enumerate(zip(texts, embeddings))
+        ])
+        self.server = AossMCPServer(
+            tool_settings=AossToolSettings(),
+            aoss_settings=AossSettings(
+                AOSS_HOST_URL=self.stub.url,
+                AOSS_INDEX_NAME=BENCHMARK_COLLECTION,
+                AWS_REGION="us-east-1",
+                AOSS_USE_SIGV4=False
+            ),
+            embedding_provder_settings=EmbeddingProviderSettings(),
+            embedding_provider=self.embedding_provider,
+            eager_startup=True,
+            log_level="WARNING"
+        )
+        return self.server
+
+    def teardown(self):
+        if self.stub is not None:
+            self.stub.stop()
+            self.stub = None
+
+
+class LocalTarget:
+    """
+    Embedded local store in a temporary directory, preloaded with documents.
+    """
+    name = "LOCAL"
+    find_tool = "local-find"
+    store_tool = "local-store"
+
+    def __init__(self, args: argparse.Namespace, embedding_provider: DeterministicEmbeddingProvider) -> None:
+        self.args = args
+        self.embedding_provider = embedding_provider
+        self._tmpdir = None
+
+    async def setup(self, collection_size: int, rng: random.Random):
+        from src.vectordb_mcp_servers.local.local_mcp import LocalMCPServer
+        from src.vectordb_mcp_servers.local.settings import LocalSettings, LocalToolSettings
+
+        self._tmpdir = tempfile.TemporaryDirectory()
+        self.server = LocalMCPServer(
+            tool_settings=LocalToolSettings(),
+            local_settings=LocalSettings(LOCAL_STORE_PATH=self._tmpdir.name),
+            embedding_provider_settings=EmbeddingProviderSettings(),
+            embedding_provider=self.embedding_provider,
+            eager_startup=True,
+            log_level="WARNING"
+        )
+        connector = self.server.local_connector
+        for offset in range(0, collection_size, 256):
+            await connector.store_many([
+                Entry(content=make_text(rng), metadata={"i": i})
+                for i in range(offset, min(offset + 256, collection_size))
+            ])
+        return self.server
+
+    def teardown(self):
+        if self._tmpdir is not None:
+            self._tmpdir.cleanup()
+            self._tmpdir = None
+
+
+TARGETS = {"QDRANT": QdrantTarget, "AOSS": AossTarget, "LOCAL": LocalTarget}
+
+
+async def benchmark_target(target, args: argparse.Namespace) -> T.List[T.Dict[str, T.Any]]:
+    results = []
+    for collection_size in args.collection_sizes:
+        rng = random.Random(args.seed)
+        server = await target.setup(collection_size, rng)
+        try:
+            async with create_connected_server_and_client_session(server._mcp_server) as session:
+                for concurrency in args.concurrency:
+                    workloads = {
+                        "find": lambda i: call_tool(session, target.find_tool, {"query": make_text(rng)}),
+                    }
+                    if target.store_tool is not None:
+                        workloads["store"] = lambda i: call_tool(
+                            session, target.store_tool, {"information": make_text(rng), "metadata": {"op": i}}
+                        )
+                        # One store for every `mixed_store_every` operations, finds otherwise
+                        workloads["mixed"] = lambda i: (
+                            workloads["store"](i) if i % args.mixed_store_every == 0 else workloads["find"](i)
+                        )
+                    for workload, call in workloads.items():
+                        await run_workload(call, min(args.warmup, args.operations), concurrency)
+                        stats = await run_workload(call, args.operations, concurrency)
+                        result = {
+                            "provider": target.name,
+                            "workload": workload,
+                            "collection_size": collection_size,
+                            "concurrency": concurrency,
+                            **stats
+                        }
+                        results.append(result)
+                        print(format_result(result), file=sys.stderr)
+        finally:
+            target.teardown()
+    return results
+
+
+def result_key(result: T.Dict[str, T.Any]) -> T.Tuple:
+    return (result["provider"], result["workload"], result["collection_size"], result["concurrency"])
+
+
+def format_result(result: T.Dict[str, T.Any], baseline: T.Optional[T.Dict[str, T.Any]] = None) -> str:
+    line = (
+        f"{result['provider']:<7} {result['workload']:<6} size={result['collection_size']:<7} "
+        f"c={result['concurrency']:<4} {result['ops_per_sec']:>9.1f} ops/s  "
+        f"p50={result['p50_ms']:>8.2f}ms  p95={result['p95_ms']:>8.2f}ms  p99={result['p99_ms']:>8.2f}ms"
+    )
+    if baseline is not None:
+        def change(key):
+            return (result[key] / baseline[key] - 1) * 100 if baseline[key] else 0.0
+        line += f"  (ops/s {change('ops_per_sec'):+.1f}%, p99 {change('p99_ms'):+.1f}%)"
+    return line
+
+
+def git_commit() -> T.Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv: T.Optional[T.List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--providers", nargs="+", choices=sorted(TARGETS), default=sorted(TARGETS))
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--collection-sizes", nargs="+", type=int, default=[100, 1000])
+    parser.add_argument("--operations", type=int, default=200, help="Measured operations per workload")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured operations before each workload")
+    parser.add_argument("--mixed-store-every", type=int, default=5, help="Ratio of stores in the mixed workload")
+    parser.add_argument("--vector-size", type=int, default=384)
+    parser.add_argument("--embed-latency-ms", type=float, default=0.0, help="Simulated embedding time per call")
+    parser.add_argument("--backend-latency-ms", type=float, default=0.0, help="Simulated OpenSearch request time")
+    parser.add_argument("--qdrant-local-path", default=None, help="Use on-disk Qdrant local mode under this directory")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Write the results as JSON to this file")
+    parser.add_argument("--compare", default=None, help="JSON results of a previous run to compare with")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> T.Dict[str, T.Any]:
+    embedding_provider = DeterministicEmbeddingProvider(args.vector_size, latency_ms=args.embed_latency_ms)
+    results = []
+    for provider in args.providers:
+        results.extend(await benchmark_target(TARGETS[provider](args, embedding_provider), args))
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        },
+        "results": results,
+    }
+
+
+def main(argv: T.Optional[T.List[str]] = None):
+    logging.basicConfig(level=logging.WARNING)
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {result_key(result): result for result in json.load(f)["results"]}
+        print("\nComparison with", args.compare, file=sys.stderr)
+        for result in report["results"]:
+            print(format_result(result, baseline.get(result_key(result))), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
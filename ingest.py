@@ -0,0 +1,101 @@
+"""
+Bulk load a JSONL or CSV file into Qdrant, with the collection and embedding model configured
+through the same environment variables as the server.
+
+JSONL files hold one object per line with a content field and an optional metadata object.
+In CSV files, the columns other than the content column become the metadata.
+With a checkpoint file, an interrupted run resumes after the last written entry.
+
+    python ingest.py memories.jsonl
+    python ingest.py notes.csv --content-field text --checkpoint notes.checkpoint
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import typing as T
+
+from main import get_mcp
+from src.vectordb_mcp_servers.qdrant_mcp_server.ingest import IngestProgress, ingest, read_csv, read_jsonl
+
+logger = logging.getLogger("ingest")
+
+
+def load_checkpoint(path: T.Optional[str], source: str) -> int:
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("source") != os.path.abspath(source):
+        raise ValueError(f"Checkpoint {path} was written for {checkpoint.get('source')}, not {source}")
+    return checkpoint["offset"]
+
+
+def save_checkpoint(path: str, source: str, offset: int) -> None:
+    # Write then rename, so an interrupted run never leaves a truncated checkpoint
+    with open(f"{path}.tmp", "w") as f:
+        json.dump({"source": os.path.abspath(source), "offset": offset}, f)
+    os.replace(f"{path}.tmp", path)
+
+
+def parse_args(argv: T.Optional[T.List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="The JSONL or CSV file to load")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default=None, help="Defaults to the file extension")
+    parser.add_argument("--content-field", default="content")
+    parser.add_argument("--metadata-field", default="metadata", help="Field holding the metadata object in JSONL files")
+    parser.add_argument("--collection", default=None, help="Defaults to COLLECTION_NAME")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Defaults to QDRANT_INGEST_CHUNK_SIZE")
+    parser.add_argument("--concurrency", type=int, default=None, help="Defaults to QDRANT_INGEST_CONCURRENCY")
+    parser.add_argument("--checkpoint", default=None, help="File recording the offset of the last written entry")
+    parser.add_argument("--progress-interval", type=float, default=5.0, help="Seconds between progress reports")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> IngestProgress:
+    file_format = args.format or ("csv" if args.path.lower().endswith(".csv") else "jsonl")
+    if file_format == "csv":
+        entries = read_csv(args.path, content_field=args.content_field)
+    else:
+        entries = read_jsonl(args.path, content_field=args.content_field, metadata_field=args.metadata_field)
+
+    start_offset = load_checkpoint(args.checkpoint, args.path)
+    if start_offset:
+        logger.info("Resuming %s from offset %d", args.path, start_offset)
+        entries = itertools.islice(entries, start_offset, None)
+
+    mcp = get_mcp("QDRANT", eager_startup=True)
+    settings = mcp.qdrant_settings
+    await mcp.startup()
+
+    last_report = 0.0
+
+    def on_progress(progress: IngestProgress):
+        nonlocal last_report
+        if args.checkpoint:
+            save_checkpoint(args.checkpoint, args.path, progress.offset)
+        if progress.elapsed - last_report >= args.progress_interval:
+            last_report = progress.elapsed
+            logger.info("Progress %s", progress.summary())
+
+    try:
+        progress = await ingest(
+            mcp.qdrant_connector,
+            entries,
+            collection_name=args.collection,
+            chunk_size=args.chunk_size or settings.ingest_chunk_size,
+            concurrency=args.concurrency or settings.ingest_concurrency,
+            start_offset=start_offset,
+            on_progress=on_progress
+        )
+    finally:
+        await mcp.shutdown()
+    logger.info("Done, %s", progress.summary())
+    return progress
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(run(parse_args()))
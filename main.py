@@ -1,15 +1,40 @@
+import typing as T
 from typing import Literal
+from src.embeddings.factory import prefetch_embedding_model
 from src.embeddings.types import EmbeddingProviderSettings
-from src.vectordb_mcp_servers.base_provider.settings import ProviderSettings, ValidProviders
+from src.vectordb_mcp_servers.base_provider.admission import ConcurrencyGovernor
+from src.vectordb_mcp_servers.base_provider.metrics import Metrics
+from src.vectordb_mcp_servers.base_provider.settings import (
+    AdmissionSettings, MetricsSettings, ProviderSettings, ValidProviders
+)
 
-def get_mcp(provider: ValidProviders):
+def get_mcp(provider: ValidProviders, eager_startup: bool = False, **settings: T.Any):
+    metrics_settings = MetricsSettings()
+    metrics = Metrics(
+        enabled=metrics_settings.enabled,
+        slow_call_threshold_ms=metrics_settings.slow_call_threshold_ms
+    )
+    admission_settings = AdmissionSettings()
+    governor = ConcurrencyGovernor(
+        embedding_concurrency=admission_settings.embedding_concurrency,
+        backend_concurrency=admission_settings.backend_concurrency,
+        max_queue=admission_settings.max_queue,
+        call_timeout_ms=admission_settings.call_timeout_ms,
+        embedding_target_latency_ms=admission_settings.embedding_target_latency_ms,
+        backend_target_latency_ms=admission_settings.backend_target_latency_ms,
+        metrics=metrics
+    )
     if provider == "QDRANT":
         from src.vectordb_mcp_servers.qdrant_mcp_server.settings import QdrantSettings, QdrantToolSettings
         from src.vectordb_mcp_servers.qdrant_mcp_server.mcp_server import QdrantMCPServer
         return QdrantMCPServer(
             qdrant_settings=QdrantSettings(),
             tool_settings=QdrantToolSettings(),
-            embedding_provider_settings=EmbeddingProviderSettings()
+            embedding_provider_settings=EmbeddingProviderSettings(),
+            eager_startup=eager_startup,
+            metrics=metrics,
+            governor=governor,
+            **settings
         )
     if provider == "AOSS":
         from src.vectordb_mcp_servers.aoss.settings import AossSettings, AossToolSettings
@@ -17,14 +42,86 @@ def get_mcp(provider: ValidProviders):
         return AossMCPServer(
             tool_settings=AossToolSettings(),
             aoss_settings=AossSettings(),
-            embedding_provder_settings=EmbeddingProviderSettings()
+            embedding_provder_settings=EmbeddingProviderSettings(),
+            eager_startup=eager_startup,
+            metrics=metrics,
+            governor=governor,
+            **settings
+        )
+    if provider == "LOCAL":
+        from src.vectordb_mcp_servers.local.settings import LocalSettings, LocalToolSettings
+        from src.vectordb_mcp_servers.local.local_mcp import LocalMCPServer
+        return LocalMCPServer(
+            tool_settings=LocalToolSettings(),
+            local_settings=LocalSettings(),
+            embedding_provider_settings=EmbeddingProviderSettings(),
+            eager_startup=eager_startup,
+            metrics=metrics,
+            governor=governor,
+            **settings
         )
     raise ValueError(f"Provider {provider} not implemented.")
 
+def create_app():
+    """
+    Build the HTTP app of the configured server. Uvicorn calls this in each worker process,
+    so every worker has its own server, embedding model and connections.
+    """
+    provider_settings = ProviderSettings()
+    mcp = get_mcp(
+        provider_settings.provider_name,
+        eager_startup=provider_settings.eager_startup,
+        host=provider_settings.host,
+        port=provider_settings.port,
+        # Requests of a session may reach any worker, so sessions cannot live in a worker
+        stateless_http=provider_settings.stateless_http or provider_settings.workers > 1
+    )
+    return mcp.http_app(provider_settings.transport)
+
+def check_workers(provider_settings: ProviderSettings):
+    """
+    Refuse to run several workers on storage that only one process can write.
+    """
+    if provider_settings.transport == "sse":
+        raise ValueError("SSE sessions are bound to the worker that opened them, use streamable-http with MCP_WORKERS")
+    if provider_settings.provider_name == "QDRANT":
+        from src.vectordb_mcp_servers.qdrant_mcp_server.settings import QdrantSettings
+        if QdrantSettings().local_path:
+            raise ValueError("QDRANT_LOCAL_PATH can only be opened by one process, run a single worker")
+    if provider_settings.provider_name == "LOCAL":
+        from src.vectordb_mcp_servers.local.settings import LocalSettings
+        local_settings = LocalSettings()
+        if local_settings.store_path and not local_settings.read_only:
+            raise ValueError("LOCAL_STORE_PATH can only be written by one process, run a single worker or set LOCAL_READ_ONLY")
+
+def serve_http(provider_settings: ProviderSettings):
+    import uvicorn
+    if provider_settings.workers > 1:
+        check_workers(provider_settings)
+    # Download the model once, instead of every worker fetching it at the same time
+    prefetch_embedding_model(EmbeddingProviderSettings())
+    print(
+        f"Starting {provider_settings.provider_name} server on {provider_settings.transport} "
+        f"at {provider_settings.host}:{provider_settings.port} with {provider_settings.workers} workers..."
+    )
+    # With several workers, SIGHUP restarts them one at a time, letting each finish its requests
+    uvicorn.run(
+        "main:create_app",
+        factory=True,
+        host=provider_settings.host,
+        port=provider_settings.port,
+        workers=provider_settings.workers,
+        reload=provider_settings.reload,
+        timeout_graceful_shutdown=provider_settings.graceful_shutdown_s
+    )
+
 if __name__ == "__main__":
-    provider = ProviderSettings().provider_name
-    mcp = get_mcp(provider)
-    print(f"Starting {mcp.name} on stdio...")
-    mcp.run(transport="stdio")
+    provider_settings = ProviderSettings()
+    if provider_settings.transport != "stdio":
+        serve_http(provider_settings)
+    else:
+        mcp = get_mcp(provider_settings.provider_name, eager_startup=provider_settings.eager_startup)
+        print(f"Starting {mcp.name} on stdio...")
+        mcp.run(transport="stdio")
     
 
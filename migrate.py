@@ -0,0 +1,114 @@
+"""
+Re-embed a Qdrant collection with the embedding model configured through EMBEDDING_MODEL,
+after a model change left its points without a vector for the new model.
+
+Points are either copied with their payloads into a new collection, or updated in place when
+the collection already declares the vector of the new model. With a checkpoint file, an
+interrupted run resumes after the last written page. With an alias, the alias is switched to
+the migrated collection in a single atomic operation once every point is written.
+
+    EMBEDDING_MODEL=BAAI/bge-small-en-v1.5 python migrate.py --source memories --target memories-bge --alias memories
+    python migrate.py --source memories --checkpoint memories.checkpoint
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import typing as T
+
+from main import get_mcp
+from src.vectordb_mcp_servers.qdrant_mcp_server.migrate import MigrationProgress, migrate_collection, switch_alias
+
+logger = logging.getLogger("migrate")
+
+
+def load_checkpoint(path: T.Optional[str], args: argparse.Namespace, vector_name: str) -> T.Optional[T.Dict[str, T.Any]]:
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        checkpoint = json.load(f)
+    expected = {"source": args.source, "target": args.target, "vector_name": vector_name}
+    for key, value in expected.items():
+        if checkpoint.get(key) != value:
+            raise ValueError(f"Checkpoint {path} was written for {key} {checkpoint.get(key)}, not {value}")
+    return checkpoint
+
+
+def save_checkpoint(path: str, args: argparse.Namespace, vector_name: str, progress: MigrationProgress) -> None:
+    # Write then rename, so an interrupted run never leaves a truncated checkpoint
+    with open(f"{path}.tmp", "w") as f:
+        json.dump({
+            "source": args.source,
+            "target": args.target,
+            "vector_name": vector_name,
+            "next_offset": progress.next_offset,
+            "migrated": progress.migrated,
+            "done": progress.done
+        }, f, default=str)
+    os.replace(f"{path}.tmp", path)
+
+
+def parse_args(argv: T.Optional[T.List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", default=None, help="The collection to migrate. Defaults to COLLECTION_NAME")
+    parser.add_argument("--target", default=None, help="The collection to copy the points to. Defaults to updating the source")
+    parser.add_argument("--alias", default=None, help="Alias switched to the migrated collection at the end")
+    parser.add_argument("--batch-size", type=int, default=512, help="Points scrolled, embedded and written together")
+    parser.add_argument("--embed-concurrency", type=int, default=2, help="Pages embedded at the same time")
+    parser.add_argument("--upsert-concurrency", type=int, default=2, help="Pages written at the same time")
+    parser.add_argument("--checkpoint", default=None, help="File recording the scroll offset of the first page not written")
+    parser.add_argument("--progress-interval", type=float, default=5.0, help="Seconds between progress reports")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> MigrationProgress:
+    mcp = get_mcp("QDRANT", eager_startup=True)
+    args.source = args.source or mcp.qdrant_settings.collection_name
+    if args.target == args.source:
+        args.target = None
+    vector_name = mcp.embedding_provider.get_vector_name()
+    await mcp.startup()
+
+    last_report = 0.0
+
+    def on_progress(progress: MigrationProgress):
+        nonlocal last_report
+        if args.checkpoint:
+            save_checkpoint(args.checkpoint, args, vector_name, progress)
+        if progress.elapsed - last_report >= args.progress_interval:
+            last_report = progress.elapsed
+            logger.info("Progress %s", progress.summary())
+
+    try:
+        checkpoint = load_checkpoint(args.checkpoint, args, vector_name)
+        if checkpoint is not None and checkpoint["done"]:
+            logger.info("Checkpoint %s records a finished migration, only switching the alias", args.checkpoint)
+            progress = MigrationProgress(migrated=checkpoint["migrated"])
+            progress.done = True
+        else:
+            if checkpoint is not None:
+                logger.info("Resuming %s after %d points", args.source, checkpoint["migrated"])
+            progress = await migrate_collection(
+                mcp.qdrant_connector,
+                args.source,
+                target=args.target,
+                batch_size=args.batch_size,
+                embed_concurrency=args.embed_concurrency,
+                upsert_concurrency=args.upsert_concurrency,
+                start_offset=checkpoint["next_offset"] if checkpoint else None,
+                migrated=checkpoint["migrated"] if checkpoint else 0,
+                on_progress=on_progress
+            )
+        if args.alias:
+            await switch_alias(mcp.qdrant_connector, args.alias, args.target or args.source)
+            logger.info("Alias %s now points to %s", args.alias, args.target or args.source)
+    finally:
+        await mcp.shutdown()
+    logger.info("Done, %s", progress.summary())
+    return progress
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    asyncio.run(run(parse_args()))
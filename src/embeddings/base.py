@@ -1,5 +1,19 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Sequence
+
+import numpy as np
+
+
+def as_float32_matrix(embeddings: Sequence) -> np.ndarray:
+    """
+    Convert a batch of embeddings to a contiguous float32 array with one row per embedding.
+    Arrays that are already contiguous float32 matrices are returned without a copy.
+    """
+    if len(embeddings) == 0:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+
 
 class EmbeddingProvider(ABC):
     """
@@ -20,6 +34,35 @@ class EmbeddingProvider(ABC):
         """
         raise NotImplementedError("Subclasses must override embed_query method")
 
+    async def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed a list of queries into vectors.
+        Providers that can embed several queries in a single pass should override this.
+        """
+        return list(await asyncio.gather(*(self.embed_query(query) for query in queries)))
+
+    async def embed_documents_array(self, documents: List[str]) -> np.ndarray:
+        """
+        Embed a list of documents into a contiguous float32 array of shape (len(documents), vector size).
+        The default implementation converts the output of embed_documents.
+        Providers that produce NumPy arrays natively should override this to skip the list round trip.
+        """
+        return as_float32_matrix(await self.embed_documents(documents))
+
+    async def embed_queries_array(self, queries: List[str]) -> np.ndarray:
+        """
+        Embed a list of queries into a contiguous float32 array of shape (len(queries), vector size).
+        The default implementation converts the output of embed_queries.
+        Providers that produce NumPy arrays natively should override this to skip the list round trip.
+        """
+        return as_float32_matrix(await self.embed_queries(queries))
+
+    async def warmup(self) -> None:
+        """
+        Load the model and prepare it for the first request.
+        Providers that load models lazily should override this.
+        """
+
     @abstractmethod
     def get_vector_name(self) -> str:
         """
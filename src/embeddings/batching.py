@@ -0,0 +1,186 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.embeddings.base import EmbeddingProvider, as_float32_matrix
+
+logger = logging.getLogger(__name__)
+
+
+class BatchStats:
+    """
+    Running statistics about the batch sizes achieved by a micro-batcher.
+    """
+
+    def __init__(self) -> None:
+        self.batches = 0
+        self.items = 0
+        self.max_batch_size = 0
+        self.size_counts: Dict[int, int] = {}
+
+    def record(self, batch_size: int) -> None:
+        self.batches += 1
+        self.items += batch_size
+        self.max_batch_size = max(self.max_batch_size, batch_size)
+        self.size_counts[batch_size] = self.size_counts.get(batch_size, 0) + 1
+
+    def snapshot(self) -> Dict[str, object]:
+        """
+        Get a copy of the statistics.
+        :return: A dict with the number of batches, embedded items, mean and max batch size
+                 and a histogram of batch sizes.
+        """
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "batch_sizes": dict(sorted(self.size_counts.items())),
+        }
+
+
+class _MicroBatcher:
+    """
+    Collects texts submitted by concurrent callers and embeds them together.
+    A batch is flushed when it reaches max_batch_size or when window_s has passed
+    since its first text arrived, whichever happens first.
+    Each caller gets views of its rows in the embedded batch, without copying them.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[List[str]], Awaitable[np.ndarray]],
+        window_s: float,
+        max_batch_size: int,
+        stats: BatchStats,
+        kind: str,
+    ) -> None:
+        self._embed_fn = embed_fn
+        self._window_s = window_s
+        self._max_batch_size = max_batch_size
+        self._stats = stats
+        self._kind = kind
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, texts: List[str]) -> List[np.ndarray]:
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._pending.append((text, future))
+            futures.append(future)
+            if len(self._pending) >= self._max_batch_size:
+                self._flush()
+        if self._pending and self._timer is None:
+            self._timer = loop.call_later(self._window_s, self._flush)
+        return list(await asyncio.gather(*futures))
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self._stats.record(len(batch))
+        logger.debug("Flushing %s embedding batch of size %d", self._kind, len(batch))
+        if self._stats.batches % 100 == 0:
+            stats = self._stats.snapshot()
+            logger.info(
+                "Embedded %d %s texts in %d batches (mean batch size %.2f, max %d)",
+                stats["items"], self._kind, stats["batches"],
+                stats["mean_batch_size"], stats["max_batch_size"]
+            )
+        task = asyncio.ensure_future(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        try:
+            embeddings = await self._embed_fn([text for text, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), embedding in zip(batch, embeddings):
+            if not future.done():
+                future.set_result(embedding)
+
+
+class BatchingEmbeddingProvider(EmbeddingProvider):
+    """
+    Embedding provider that merges concurrent embedding calls into batches
+    before handing them to the wrapped provider, so that many simultaneous
+    requests share a single forward pass.
+    Calls of at least max_batch_size texts already fill a batch, so they go to the wrapped provider
+    directly and whole, which keeps large document batches eligible for its worker processes.
+    :param provider: The embedding provider to wrap.
+    :param window_ms: How long to wait for more calls after the first one of a batch arrives.
+    :param max_batch_size: The maximum number of texts of concurrent calls embedded in a single pass.
+    """
+
+    def __init__(self, provider: EmbeddingProvider, window_ms: float, max_batch_size: int) -> None:
+        super().__init__()
+        assert max_batch_size > 0, "max_batch_size must be positive"
+        self._provider = provider
+        self._max_batch_size = max_batch_size
+        self.query_stats = BatchStats()
+        self.document_stats = BatchStats()
+        self._query_batcher = _MicroBatcher(
+            provider.embed_queries_array, window_ms / 1000, max_batch_size, self.query_stats, "query"
+        )
+        self._document_batcher = _MicroBatcher(
+            provider.embed_documents_array, window_ms / 1000, max_batch_size, self.document_stats, "document"
+        )
+
+    async def embed_documents(self, documents: List[str]) -> List[List[float]]:
+        """Embed a list of documents, batched together with concurrent calls"""
+        embeddings = await self.embed_documents_array(documents)
+        return embeddings.tolist()
+
+    async def embed_query(self, query: str) -> List[float]:
+        """Embed a query, batched together with concurrent calls"""
+        embeddings = await self._query_batcher.submit([query])
+        return embeddings[0].tolist()
+
+    async def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed a list of queries, batched together with concurrent calls"""
+        embeddings = await self.embed_queries_array(queries)
+        return embeddings.tolist()
+
+    async def embed_documents_array(self, documents: List[str]) -> np.ndarray:
+        """Embed a list of documents into a float32 array, batched together with concurrent calls"""
+        if len(documents) >= self._max_batch_size:
+            self.document_stats.record(len(documents))
+            return await self._provider.embed_documents_array(documents)
+        return as_float32_matrix(await self._document_batcher.submit(documents))
+
+    async def embed_queries_array(self, queries: List[str]) -> np.ndarray:
+        """Embed a list of queries into a float32 array, batched together with concurrent calls"""
+        if len(queries) >= self._max_batch_size:
+            self.query_stats.record(len(queries))
+            return await self._provider.embed_queries_array(queries)
+        return as_float32_matrix(await self._query_batcher.submit(queries))
+
+    async def warmup(self) -> None:
+        await self._provider.warmup()
+
+    def get_vector_name(self) -> str:
+        return self._provider.get_vector_name()
+
+    def get_vector_size(self) -> str:
+        return self._provider.get_vector_size()
+
+    def get_stats(self) -> Dict[str, Dict[str, object]]:
+        """
+        Get the batch sizes achieved so far, separately for queries and documents.
+        """
+        return {
+            "query": self.query_stats.snapshot(),
+            "document": self.document_stats.snapshot(),
+        }
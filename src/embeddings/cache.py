@@ -0,0 +1,264 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.embeddings.base import EmbeddingProvider, as_float32_matrix
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query so that trivially different spellings share a cache entry.
+    """
+    return unicodedata.normalize("NFKC", " ".join(query.split()))
+
+
+class CacheStats:
+    """
+    Counters describing the effectiveness of an embedding cache.
+    """
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class _SqliteVectorStore:
+    """
+    Persistent tier of the embedding cache, storing float32 vectors in a sqlite file.
+    Calls are blocking, and are meant to run in a worker thread.
+    """
+
+    def __init__(self, path: str, ttl_seconds: Optional[float]) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS query_embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, created_at REAL NOT NULL)"
+        )
+        if ttl_seconds is not None:
+            self._conn.execute(
+                "DELETE FROM query_embeddings WHERE created_at < ?", (time.time() - ttl_seconds,)
+            )
+        self._conn.commit()
+
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[np.ndarray, float]]:
+        """
+        Look up several keys at once.
+        :return: The vector and creation time of each key found and not expired.
+        """
+        found = {}
+        with self._lock:
+            for key in keys:
+                row = self._conn.execute(
+                    "SELECT vector, created_at FROM query_embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    found[key] = row
+        now = time.time()
+        return {
+            key: (np.frombuffer(vector, dtype=np.float32), created_at)
+            for key, (vector, created_at) in found.items()
+            if self._ttl_seconds is None or now - created_at <= self._ttl_seconds
+        }
+
+    def put_many(self, entries: List[Tuple[str, np.ndarray, float]]) -> None:
+        """
+        Store several vectors in a single transaction.
+        :param entries: The key, vector and creation time of each entry.
+        """
+        rows = [
+            (key, vector.astype(np.float32, copy=False).tobytes(), created_at) for key, vector, created_at in entries
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO query_embeddings (key, vector, created_at) VALUES (?, ?, ?)", rows
+            )
+            self._conn.commit()
+
+
+class CachedEmbeddingProvider(EmbeddingProvider):
+    """
+    Embedding provider that caches query embeddings of the wrapped provider.
+    Entries are kept in a bounded in-memory LRU with an optional TTL, and
+    can additionally be persisted to a sqlite file so they survive restarts.
+    The sqlite file is read and written in a worker thread, off the event loop.
+    Vectors are kept as float32 arrays. Document embeddings are not cached.
+    :param provider: The embedding provider to wrap.
+    :param max_entries: The maximum number of queries kept in memory.
+    :param ttl_seconds: How long an entry stays valid. If not provided, entries never expire.
+    :param persist_path: Path of the sqlite file used as persistent tier. Optional.
+    """
+
+    def __init__(
+        self,
+        provider: EmbeddingProvider,
+        max_entries: int,
+        ttl_seconds: Optional[float] = None,
+        persist_path: Optional[str] = None,
+    ) -> None:
+        super().__init__()
+        assert max_entries > 0, "max_entries must be positive"
+        self._provider = provider
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[np.ndarray, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._disk = _SqliteVectorStore(persist_path, ttl_seconds) if persist_path else None
+        self.stats = CacheStats()
+
+    def _key(self, query: str) -> str:
+        return f"{self._provider.get_vector_name()}\x00{normalize_query(query)}"
+
+    def _get(self, key: str) -> Optional[np.ndarray]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            vector, created_at = entry
+            if self._ttl_seconds is None or time.time() - created_at <= self._ttl_seconds:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return vector
+            del self._entries[key]
+            self.stats.expirations += 1
+        return None
+
+    async def _get_many(self, keys: List[str]) -> List[Optional[np.ndarray]]:
+        """
+        Look up keys in memory, then the ones not found in the persistent tier, with a single thread hop.
+        """
+        results = [self._get(key) for key in keys]
+        missing = [key for key, result in zip(keys, results) if result is None]
+        if self._disk is None or not missing:
+            return results
+        try:
+            stored = await asyncio.to_thread(self._disk.get_many, missing)
+        except sqlite3.Error:
+            logger.warning("Failed to read persisted query embeddings", exc_info=True)
+            return results
+        for index, key in enumerate(keys):
+            if results[index] is None and key in stored:
+                self._remember(key, *stored[key])
+                self.stats.disk_hits += 1
+                results[index] = stored[key][0]
+        return results
+
+    def _remember(self, key: str, vector: np.ndarray, created_at: float) -> None:
+        self._entries[key] = (vector, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    async def _persist(self, entries: List[Tuple[str, np.ndarray, float]]) -> None:
+        if self._disk is None or not entries:
+            return
+        try:
+            await asyncio.to_thread(self._disk.put_many, entries)
+        except sqlite3.Error:
+            logger.warning("Failed to persist query embeddings", exc_info=True)
+
+    async def embed_documents(self, documents: List[str]) -> List[List[float]]:
+        """Embed a list of documents into vectors, bypassing the cache"""
+        return await self._provider.embed_documents(documents)
+
+    async def embed_query(self, query: str) -> List[float]:
+        """Embed a query into a vector, using the cached embedding if there is one"""
+        embeddings = await self.embed_queries_array([query])
+        return embeddings[0].tolist()
+
+    async def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed a list of queries into vectors, embedding only the ones not cached yet"""
+        embeddings = await self.embed_queries_array(queries)
+        return embeddings.tolist()
+
+    async def embed_documents_array(self, documents: List[str]) -> np.ndarray:
+        """Embed a list of documents into a float32 array, bypassing the cache"""
+        return await self._provider.embed_documents_array(documents)
+
+    async def embed_queries_array(self, queries: List[str]) -> np.ndarray:
+        """Embed a list of queries into a float32 array, embedding only the ones not cached yet"""
+        keys = [self._key(query) for query in queries]
+        results = await self._get_many(keys)
+
+        # Queries already being embedded by another caller are awaited instead of embedded twice
+        waiting: Dict[int, asyncio.Future] = {}
+        missing: Dict[str, List[int]] = {}
+        for index, (key, result) in enumerate(zip(keys, results)):
+            if result is not None:
+                continue
+            if key in self._inflight:
+                waiting[index] = self._inflight[key]
+            else:
+                missing.setdefault(key, []).append(index)
+
+        if missing:
+            self.stats.misses += len(missing)
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in missing}
+            self._inflight.update(futures)
+            try:
+                embeddings = await self._provider.embed_queries_array(
+                    [queries[indices[0]] for indices in missing.values()]
+                )
+            except BaseException as exc:
+                for future in futures.values():
+                    if isinstance(exc, Exception):
+                        future.set_exception(exc)
+                        # Mark the exception as retrieved, other callers may not be waiting
+                        future.exception()
+                    else:
+                        future.cancel()
+                raise
+            finally:
+                for key in futures:
+                    self._inflight.pop(key, None)
+            created_at = time.time()
+            for (key, indices), embedding in zip(missing.items(), embeddings):
+                self._remember(key, embedding, created_at)
+                futures[key].set_result(embedding)
+                for index in indices:
+                    results[index] = embedding
+            await self._persist([(key, embedding, created_at) for key, embedding in zip(missing, embeddings)])
+
+        for index, future in waiting.items():
+            results[index] = await asyncio.shield(future)
+        # Stacking copies the rows, so callers never share the cached vectors
+        return as_float32_matrix(results)
+
+    async def warmup(self) -> None:
+        await self._provider.warmup()
+
+    def get_vector_name(self) -> str:
+        return self._provider.get_vector_name()
+
+    def get_vector_size(self) -> str:
+        return self._provider.get_vector_size()
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the hit, miss and eviction counters of the cache.
+        """
+        return {**self.stats.snapshot(), "entries": len(self._entries)}
@@ -0,0 +1,46 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, TypeVar
+
+R = TypeVar("R")
+
+
+class EmbeddingExecutor:
+    """
+    Dedicated thread pool for blocking embedding calls.
+    Keeping embeddings off the default executor stops them from competing with other blocking work,
+    and a small pool lets the model use its own intra-op threads without oversubscribing the cores.
+    :param max_workers: The number of embedding calls that run at the same time.
+    :param queue_depth: The maximum number of calls queued or running. Further callers wait for a slot.
+    """
+
+    def __init__(self, max_workers: int = 1, queue_depth: int = 64) -> None:
+        assert max_workers > 0, "max_workers must be positive"
+        assert queue_depth >= max_workers, "queue_depth must be at least max_workers"
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="embedding")
+        self._slots = asyncio.Semaphore(queue_depth)
+        self.max_workers = max_workers
+        self.queue_depth = queue_depth
+        self._pending = 0
+
+    async def run(self, fn: Callable[..., R], *args, **kwargs) -> R:
+        """
+        Run a blocking function on the embedding threads, waiting for a queue slot first.
+        """
+        async with self._slots:
+            self._pending += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+            finally:
+                self._pending -= 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the number of calls currently queued or running, and the limits of the executor.
+        """
+        return {"pending": self._pending, "max_workers": self.max_workers, "queue_depth": self.queue_depth}
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
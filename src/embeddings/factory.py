@@ -7,7 +7,46 @@ def create_embedding_provider(settings: EmbeddingProviderSettings) -> EmbeddingP
     :param settings: The settings for the embedding provider
     :return: An instance of the specified embedding provider
     """
+    provider = _create_base_provider(settings)
+    if settings.batching_enabled:
+        from src.embeddings.batching import BatchingEmbeddingProvider
+        provider = BatchingEmbeddingProvider(
+            provider,
+            window_ms=settings.batch_window_ms,
+            max_batch_size=settings.batch_max_size
+        )
+    if settings.cache_enabled:
+        from src.embeddings.cache import CachedEmbeddingProvider
+        provider = CachedEmbeddingProvider(
+            provider,
+            max_entries=settings.cache_max_entries,
+            ttl_seconds=settings.cache_ttl_seconds,
+            persist_path=settings.cache_path
+        )
+    return provider
+
+def prefetch_embedding_model(settings: EmbeddingProviderSettings) -> None:
+    """
+    Download the model files to the local cache without loading the model, so that processes
+    started afterwards all load the same cached files instead of each downloading them.
+    :param settings: The settings for the embedding provider
+    """
+    if settings.provider_type == EmbeddingProviderType.FASTEMBED:
+        from fastembed import TextEmbedding
+        TextEmbedding(settings.model_name, lazy_load=True)
+
+def _create_base_provider(settings: EmbeddingProviderSettings) -> EmbeddingProvider:
     if settings.provider_type == EmbeddingProviderType.FASTEMBED:
+        from src.embeddings.execution import EmbeddingExecutor
         from src.embeddings.fastembed_provider import FastEmbedProvider
-        return FastEmbedProvider(settings.model_name)
+        # The model is loaded when the server warms up the provider, not at construction
+        return FastEmbedProvider(
+            settings.model_name,
+            lazy=True,
+            threads=settings.threads,
+            batch_size=settings.inference_batch_size,
+            parallel=settings.parallel,
+            parallel_min_documents=settings.parallel_min_documents,
+            executor=EmbeddingExecutor(settings.executor_workers, settings.queue_depth)
+        )
     raise ValueError(f"Unsupported embedding provider: {settings.provider_type}")
\ No newline at end of file
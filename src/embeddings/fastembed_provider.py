@@ -1,47 +1,108 @@
 import asyncio
-from typing import List
+import threading
+from typing import List, Optional
 
+import numpy as np
 from fastembed import TextEmbedding
 from fastembed.common.model_description import DenseModelDescription
 
-from src.embeddings.base import EmbeddingProvider
+from src.embeddings.base import EmbeddingProvider, as_float32_matrix
+from src.embeddings.execution import EmbeddingExecutor
 
 
 class FastEmbedProvider(EmbeddingProvider):
     """
     FastEmbed implementation of the embedding provider
     :param model_name: The name of the FastEmbed model to use.
+    :param lazy: Whether to defer loading the model until it is first used or warmed up.
+    :param threads: The number of ONNX intra-op threads. If not provided, onnxruntime decides.
+    :param batch_size: The number of texts passed to the model in a single inference.
+    :param parallel: The number of worker processes used for large document batches.
+                     0 uses all cores. If not provided, documents are always embedded in-process.
+    :param parallel_min_documents: The minimum number of documents for which the worker processes are used.
+    :param executor: The executor running the embedding calls.
+                     If not provided, calls run on the default asyncio executor.
     """
 
-    def __init__(self, model_name: str) -> None:
+    def __init__(
+        self,
+        model_name: str,
+        lazy: bool = False,
+        threads: Optional[int] = None,
+        batch_size: int = 256,
+        parallel: Optional[int] = None,
+        parallel_min_documents: int = 1024,
+        executor: Optional[EmbeddingExecutor] = None,
+    ) -> None:
         super().__init__()
         self.model_name = model_name
-        self.embedding_model = TextEmbedding(self.model_name)
+        self.threads = threads
+        self.batch_size = batch_size
+        self.parallel = parallel
+        self.parallel_min_documents = parallel_min_documents
+        self._executor = executor
+        self._embedding_model: Optional[TextEmbedding] = None
+        self._load_lock = threading.Lock()
+        if not lazy:
+            self._embedding_model = TextEmbedding(self.model_name, threads=self.threads)
+
+    @property
+    def embedding_model(self) -> TextEmbedding:
+        """The FastEmbed model, loaded on first access"""
+        if self._embedding_model is None:
+            with self._load_lock:
+                if self._embedding_model is None:
+                    self._embedding_model = TextEmbedding(self.model_name, threads=self.threads)
+        return self._embedding_model
+
+    async def _run(self, fn):
+        if self._executor is None:
+            return await asyncio.to_thread(fn)
+        return await self._executor.run(fn)
+
+    async def warmup(self) -> None:
+        """Load the model and run a dummy inference to initialize the ONNX session"""
+        await self._run(lambda: list(self.embedding_model.query_embed(["warmup"])))
     
     async def embed_documents(self, documents: List[str]) -> List[List[float]]:
         """Embed a list of documents into vectors"""
-        # loop = asyncio.get_event_loop()
-        embeddings = await asyncio.to_thread(
-            lambda: list(self.embedding_model.passage_embed(documents))
-        )
-        return [embedding.tolist() for embedding in embeddings]
+        embeddings = await self.embed_documents_array(documents)
+        return embeddings.tolist()
 
     async def embed_query(self, query: str) -> List[float]:
         """Embed a query into a vector"""
-        # loop = asyncio.get_event_loop()
-        embeddings = await asyncio.to_thread(
-            lambda: list(self.embedding_model.query_embed([query]))
-        )
+        embeddings = await self.embed_queries_array([query])
         return embeddings[0].tolist()
 
+    async def embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """Embed a list of queries into vectors in a single pass"""
+        embeddings = await self.embed_queries_array(queries)
+        return embeddings.tolist()
+
+    async def embed_documents_array(self, documents: List[str]) -> np.ndarray:
+        """Embed a list of documents into a float32 array, one row per document"""
+        # Starting the worker processes only pays off for large batches
+        parallel = self.parallel if len(documents) >= self.parallel_min_documents else None
+        return await self._run(
+            lambda: as_float32_matrix(list(self.embedding_model.passage_embed(
+                documents, batch_size=self.batch_size, parallel=parallel
+            )))
+        )
+
+    async def embed_queries_array(self, queries: List[str]) -> np.ndarray:
+        """Embed a list of queries into a float32 array in a single pass, one row per query"""
+        return await self._run(
+            lambda: as_float32_matrix(list(self.embedding_model.query_embed(queries, batch_size=self.batch_size)))
+        )
+
     def get_vector_name(self) -> str:
         """Get the name of the vector for Qdrant collection"""
-        model_name = self.embedding_model.model_name.split("/")[-1].lower()
+        model_name = self.model_name.split("/")[-1].lower()
         return f"fast-{model_name}"
     
     def get_vector_size(self) -> str:
         """Get the size of the vector for the Qdrant collection"""
         model_description: DenseModelDescription = (
-            self.embedding_model._get_model_description(self.model_name)
+            TextEmbedding._get_model_description(self.model_name)
         )
         return model_description.dim
\ No newline at end of file
@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -18,3 +19,55 @@ class EmbeddingProviderSettings(BaseSettings):
         default="sentence-transformers/all-MiniLM-L6-v2",
         validation_alias="EMBEDDING_MODEL"
     )
+    threads: Optional[int] = Field(
+        default=None,
+        validation_alias="EMBEDDING_THREADS"
+    )
+    inference_batch_size: int = Field(
+        default=256,
+        validation_alias="EMBEDDING_INFERENCE_BATCH_SIZE"
+    )
+    executor_workers: int = Field(
+        default=1,
+        validation_alias="EMBEDDING_EXECUTOR_WORKERS"
+    )
+    queue_depth: int = Field(
+        default=64,
+        validation_alias="EMBEDDING_QUEUE_DEPTH"
+    )
+    parallel: Optional[int] = Field(
+        default=None,
+        validation_alias="EMBEDDING_PARALLEL"
+    )
+    parallel_min_documents: int = Field(
+        default=1024,
+        validation_alias="EMBEDDING_PARALLEL_MIN_DOCUMENTS"
+    )
+    batching_enabled: bool = Field(
+        default=False,
+        validation_alias="EMBEDDING_BATCHING_ENABLED"
+    )
+    batch_window_ms: float = Field(
+        default=5.0,
+        validation_alias="EMBEDDING_BATCH_WINDOW_MS"
+    )
+    batch_max_size: int = Field(
+        default=32,
+        validation_alias="EMBEDDING_BATCH_MAX_SIZE"
+    )
+    cache_enabled: bool = Field(
+        default=False,
+        validation_alias="EMBEDDING_CACHE_ENABLED"
+    )
+    cache_max_entries: int = Field(
+        default=1024,
+        validation_alias="EMBEDDING_CACHE_MAX_ENTRIES"
+    )
+    cache_ttl_seconds: Optional[float] = Field(
+        default=3600,
+        validation_alias="EMBEDDING_CACHE_TTL_SECONDS"
+    )
+    cache_path: Optional[str] = Field(
+        default=None,
+        validation_alias="EMBEDDING_CACHE_PATH"
+    )
@@ -1,45 +1,168 @@
+import asyncio
+import functools
+import json
+import logging
 import os
+import random
 import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
 import boto3
-from opensearchpy import OpenSearch, RequestsHttpConnection, AWSV4SignerAuth
+from opensearchpy import OpenSearch, RequestsHttpConnection, AWSV4SignerAuth, NotFoundError, TransportError
 
+from src.vectordb_mcp_servers.base_provider.admission import ConcurrencyGovernor
 from src.vectordb_mcp_servers.base_provider.base_mcp import Entry
+from src.vectordb_mcp_servers.base_provider.metrics import Metrics
 from src.embeddings.base import EmbeddingProvider
 
+logger = logging.getLogger(__name__)
+
+
+def _is_retryable(status) -> bool:
+    """
+    Check if a failed bulk request or item is worth retrying: throttling, server errors,
+    and connection errors, which have no HTTP status.
+    """
+    return not isinstance(status, int) or status == 429 or status >= 500
+
+
+class BulkIndexError(RuntimeError):
+    """
+    Some documents could not be indexed. `indexed` is the number of documents indexed before the failure.
+    """
+
+    def __init__(self, message: str, indexed: int) -> None:
+        super().__init__(message)
+        self.indexed = indexed
+
+
 class AOSSConnector:
+    """
+    Encapsulates the connection to an OpenSearch Serverless collection.
+    The opensearch-py client is synchronous, so requests run on a dedicated thread pool
+    sized like the connection pool, and never block the event loop.
+    :param host_url: The URL of the collection endpoint. Defaults to https on port 443 if scheme or port are missing.
+    :param aws_region: The AWS region of the collection.
+    :param index_name: The name of the index to search.
+    :param embedding_provider: The embedding provider to use
+    :param pool_maxsize: The maximum number of connections, and of concurrent requests.
+    :param use_sigv4: Whether to sign requests with the AWS credentials. Disable for local OpenSearch endpoints.
+    :param metrics: The metrics recording the time spent in each stage. Optional.
+    :param metadata_keys: The metadata keys to fetch with the results. Optional. If not provided, all metadata is fetched.
+    :param bulk_max_documents: The maximum number of documents embedded together and sent in one _bulk request.
+    :param bulk_max_bytes: The maximum size of the body of a _bulk request.
+    :param bulk_concurrency: The maximum number of _bulk requests in flight.
+    :param bulk_max_retries: How many times throttled or failed documents are sent again.
+    :param bulk_retry_backoff_ms: The delay before the first retry, doubled for each following one.
+    :param governor: The admission control that embedding calls and OpenSearch requests run through. Optional.
+    """
 
     def __init__(
         self,
         host_url: str,
         aws_region: str,
         index_name: str,
-        embedding_provider: EmbeddingProvider
+        embedding_provider: EmbeddingProvider,
+        pool_maxsize: int = 20,
+        use_sigv4: bool = True,
+        metrics: Metrics | None = None,
+        metadata_keys: list | None = None,
+        bulk_max_documents: int = 500,
+        bulk_max_bytes: int = 5 * 1024 * 1024,
+        bulk_concurrency: int = 4,
+        bulk_max_retries: int = 5,
+        bulk_retry_backoff_ms: float = 200.0,
+        governor: ConcurrencyGovernor | None = None
     ) -> None:
-        self.host_url = host_url.lstrip("https://")
+        parsed_url = urlparse(host_url if "://" in host_url else f"https://{host_url}")
+        self.host_url = parsed_url.hostname
+        self.use_ssl = parsed_url.scheme == "https"
+        self.port = parsed_url.port or (443 if self.use_ssl else 80)
         self.region = aws_region
         self.index_name = index_name
+        self.pool_maxsize = pool_maxsize
+        self.use_sigv4 = use_sigv4
         self._embedding_provider = embedding_provider
-        self.client = self._connect()
-        assert self.client.indices.exists(index=self.index_name), f"Index {index_name} does not exist"
+        self._metrics = metrics or Metrics()
+        self._governor = governor or ConcurrencyGovernor()
+        # Only fetch the source fields used to build entries, never the stored embedding
+        self._source_fields = ["text", "metadata"]
+        if metadata_keys is not None:
+            self._source_fields = ["text"] + [f"metadata.{key}" for key in metadata_keys]
+        self.bulk_max_documents = bulk_max_documents
+        self.bulk_max_bytes = bulk_max_bytes
+        self.bulk_max_retries = bulk_max_retries
+        self.bulk_retry_backoff_ms = bulk_retry_backoff_ms
+        self._bulk_slots = asyncio.Semaphore(bulk_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=pool_maxsize, thread_name_prefix="aoss")
+        # Connecting needs network calls, so the client is created in initialize
+        self.client: OpenSearch | None = None
+        # Dimension of the index embedding field, None while the index is not known to exist
+        self._index_dimension: int | None = None
+        self._index_exists = False
+
+    async def initialize(self):
+        """
+        Connect to the collection and load the state of the index, without blocking the event loop.
+        """
+        await self._run(self._initialize)
+
+    def _initialize(self):
+        if self.client is None:
+            self.client = self._connect()
+        self._load_index_state()
     
     def _connect(self):
-        credentials = boto3.Session().get_credentials()
-        auth = AWSV4SignerAuth(credentials=credentials, region=self.region, service="aoss")
+        auth = None
+        if self.use_sigv4:
+            credentials = boto3.Session().get_credentials()
+            auth = AWSV4SignerAuth(credentials=credentials, region=self.region, service="aoss")
         return OpenSearch(
-            hosts=[{"host": self.host_url, "port": 443}],
+            hosts=[{"host": self.host_url, "port": self.port}],
             http_auth = auth,
-            use_ssl = True,
-            verify_certs = True,
+            use_ssl = self.use_ssl,
+            verify_certs = self.use_ssl,
             connection_class = RequestsHttpConnection,
-            pool_maxsize = 20
+            pool_maxsize = self.pool_maxsize
         )
 
-    async def search(self, query: str, limit: int = 10):
-        assert self.client.indices.exists(index=self.index_name), f"Index {self.index_name} does not exist"
-        query_embedding = await self._embedding_provider.embed_query(query)
+    async def _run(self, fn, *args, **kwargs):
+        """
+        Run a blocking client call on the connector thread pool, within the backend limit.
+        """
+        loop = asyncio.get_running_loop()
+        return await self._governor.run_backend(
+            loop.run_in_executor, self._executor, functools.partial(fn, *args, **kwargs)
+        )
+
+    def _load_index_state(self):
+        """
+        Check that the index exists and read the dimension of its embedding field.
+        """
+        try:
+            mappings = self.client.indices.get_mapping(index=self.index_name)
+        except NotFoundError:
+            self._index_exists = False
+            raise AssertionError(f"Index {self.index_name} does not exist")
+        self._index_exists = True
+        for index_mapping in mappings.values():
+            embedding_field = index_mapping.get("mappings", {}).get("properties", {}).get("embedding", {})
+            self._index_dimension = embedding_field.get("dimension")
+            break
 
-        search_body = {
+    def _check_dimension(self, embedding) -> None:
+        if self._index_dimension is not None and len(embedding) != self._index_dimension:
+            raise ValueError(
+                f"Index {self.index_name} stores vectors of dimension {self._index_dimension}, "
+                f"but the embedding model produces vectors of dimension {len(embedding)}"
+            )
+
+    def _knn_body(self, query_embedding, limit: int) -> dict:
+        # The embedding stays a float32 array, the client serializer converts it while encoding the body
+        return {
             "size": limit,
+            "_source": self._source_fields,
             "query": {
                 "knn": {
                     "embedding": {
@@ -49,6 +172,180 @@ class AOSSConnector:
                 }
             }
         }
-        response = self.client.search(index=self.index_name, body=search_body)
-        return [Entry(content=hit["_source"]["text"], metadata=hit["_source"]["metadata"]) for hit in response["hits"]["hits"]]
 
+    @staticmethod
+    def _to_entries(hits: list) -> list:
+        return [Entry(content=hit["_source"]["text"], metadata=hit["_source"].get("metadata")) for hit in hits]
+
+    async def search(self, query: str, limit: int = 10):
+        if not self._index_exists:
+            with self._metrics.stage("collection_check"):
+                await self.initialize()
+        with self._metrics.stage("embed"):
+            query_embeddings = await self._governor.run_embedding(self._embedding_provider.embed_queries_array, [query])
+        query_embedding = query_embeddings[0]
+        self._check_dimension(query_embedding)
+
+        search_body = self._knn_body(query_embedding, limit)
+        try:
+            with self._metrics.stage("query"):
+                response = await self._run(self.client.search, index=self.index_name, body=search_body)
+        except NotFoundError:
+            self._index_exists = False
+            raise AssertionError(f"Index {self.index_name} does not exist")
+        return self._to_entries(response["hits"]["hits"])
+
+    async def search_batch(self, queries: list, limit: int = 10):
+        """
+        Run several searches with a single embedding pass and a single _msearch request.
+        :return: A list of entries found for each query, in the order of the queries.
+        """
+        if not queries:
+            return []
+        if not self._index_exists:
+            with self._metrics.stage("collection_check"):
+                await self.initialize()
+        with self._metrics.stage("embed"):
+            query_embeddings = await self._governor.run_embedding(self._embedding_provider.embed_queries_array, queries)
+
+        search_body = []
+        for query_embedding in query_embeddings:
+            self._check_dimension(query_embedding)
+            search_body.append({"index": self.index_name})
+            search_body.append(self._knn_body(query_embedding, limit))
+        try:
+            with self._metrics.stage("query"):
+                response = await self._run(self.client.msearch, body=search_body)
+        except NotFoundError:
+            self._index_exists = False
+            raise AssertionError(f"Index {self.index_name} does not exist")
+
+        results = []
+        for query_response in response["responses"]:
+            if "error" in query_response:
+                raise RuntimeError(f"Search in index {self.index_name} failed: {query_response['error']}")
+            results.append(self._to_entries(query_response["hits"]["hits"]))
+        return results
+
+    async def store_many(self, entries: list) -> int:
+        """
+        Index entries with the _bulk API. Entries are embedded in chunks of `bulk_max_documents`,
+        each chunk is split into requests of at most `bulk_max_bytes`, and up to `bulk_concurrency`
+        chunks are in flight. Throttled and failed documents are retried with exponential backoff.
+        :return: The number of documents indexed. Documents rejected by OpenSearch are logged and skipped.
+        :raises BulkIndexError: If a chunk failed after other documents were indexed, with their number.
+        """
+        if not self._index_exists:
+            with self._metrics.stage("collection_check"):
+                await self.initialize()
+        chunks = [
+            entries[start:start + self.bulk_max_documents]
+            for start in range(0, len(entries), self.bulk_max_documents)
+        ]
+        results = await asyncio.gather(*(self._index_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        indexed, errors = 0, []
+        for result in results:
+            if isinstance(result, BaseException):
+                indexed += getattr(result, "indexed", 0)
+                errors.append(result)
+            else:
+                indexed += result
+        if not errors:
+            return indexed
+        if not indexed:
+            raise errors[0]
+        raise BulkIndexError(
+            f"Indexed {indexed} of {len(entries)} documents in {self.index_name}, "
+            f"{len(errors)} of {len(chunks)} chunks failed: {errors[0]}", indexed
+        ) from errors[0]
+
+    async def _index_chunk(self, entries: list) -> int:
+        async with self._bulk_slots:
+            with self._metrics.stage("embed"):
+                embeddings = await self._governor.run_embedding(
+                    self._embedding_provider.embed_documents_array, [entry.content for entry in entries]
+                )
+            if len(embeddings):
+                self._check_dimension(embeddings[0])
+
+            action = json.dumps({"index": {"_index": self.index_name}})
+            documents = [
+                f"{action}\n" + json.dumps({"text": entry.content, "metadata": entry.metadata, "embedding": embedding}) + "\n"
+                for entry, embedding in zip(entries, embeddings.tolist())
+            ]
+            requests = []
+            request, request_bytes = [], 0
+            for document in documents:
+                document_bytes = len(document.encode())
+                if request and request_bytes + document_bytes > self.bulk_max_bytes:
+                    requests.append(request)
+                    request, request_bytes = [], 0
+                request.append(document)
+                request_bytes += document_bytes
+            if request:
+                requests.append(request)
+
+            indexed = 0
+            for request in requests:
+                try:
+                    indexed += await self._bulk(request)
+                except BulkIndexError as e:
+                    e.indexed += indexed
+                    raise
+                except Exception as e:
+                    if not indexed:
+                        raise
+                    raise BulkIndexError(str(e), indexed) from e
+            return indexed
+
+    async def _bulk(self, documents: list) -> int:
+        """
+        Send a _bulk request, retrying the whole request or the failed documents.
+        :param documents: The action and source lines of each document.
+        :return: The number of documents indexed.
+        :raises BulkIndexError: If documents still fail after the retries, or the request is refused.
+        """
+        indexed = 0
+        for attempt in range(self.bulk_max_retries + 1):
+            retry = []
+            try:
+                with self._metrics.stage("bulk"):
+                    response = await self._run(self.client.bulk, body="".join(documents))
+            except NotFoundError:
+                self._index_exists = False
+                raise AssertionError(f"Index {self.index_name} does not exist")
+            except TransportError as e:
+                if not _is_retryable(e.status_code):
+                    raise BulkIndexError(
+                        f"Failed to index {len(documents)} documents in {self.index_name}: {e}", indexed
+                    ) from e
+                retry = documents
+            else:
+                if not response.get("errors"):
+                    return indexed + len(documents)
+                rejected = []
+                for document, item in zip(documents, response["items"]):
+                    result = next(iter(item.values()))
+                    status = result.get("status", 200)
+                    if status < 300:
+                        indexed += 1
+                    elif _is_retryable(status):
+                        retry.append(document)
+                    else:
+                        rejected.append(result.get("error"))
+                if rejected:
+                    logger.warning(
+                        "%d documents rejected by index %s, first error: %s", len(rejected), self.index_name, rejected[0]
+                    )
+                if not retry:
+                    return indexed
+            if attempt == self.bulk_max_retries:
+                break
+            documents = retry
+            delay = self.bulk_retry_backoff_ms / 1000 * 2 ** attempt
+            # Jitter keeps parallel requests from retrying in lockstep
+            await asyncio.sleep(delay * random.uniform(0.5, 1.0))
+        raise BulkIndexError(
+            f"Failed to index {len(retry)} documents in {self.index_name} after {self.bulk_max_retries} retries",
+            indexed
+        )
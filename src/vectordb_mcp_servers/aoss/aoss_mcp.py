@@ -1,8 +1,12 @@
+import asyncio
 import typing as T
+from src.embeddings.base import EmbeddingProvider
 from src.embeddings.factory import create_embedding_provider
 from src.vectordb_mcp_servers.base_provider.base_mcp import Entry, Metadata, BaseVectorDBMCPServer
+from src.vectordb_mcp_servers.base_provider.admission import ConcurrencyGovernor
+from src.vectordb_mcp_servers.base_provider.metrics import Metrics
 from src.embeddings.types import EmbeddingProviderSettings
-from src.vectordb_mcp_servers.aoss.aoss_connector import AOSSConnector
+from src.vectordb_mcp_servers.aoss.aoss_connector import AOSSConnector, BulkIndexError
 from src.vectordb_mcp_servers.aoss.settings import AossSettings, AossToolSettings
 
 
@@ -15,27 +19,50 @@ class AossMCPServer(BaseVectorDBMCPServer):
         embedding_provder_settings: EmbeddingProviderSettings,
         name: str  = "aoss-mcp-server", 
         instructions: str | None = None, 
+        embedding_provider: T.Optional[EmbeddingProvider] = None,
+        metrics: T.Optional[Metrics] = None,
+        governor: T.Optional[ConcurrencyGovernor] = None,
         **settings: T.Any
     ):
         self.tool_settings = tool_settings
         self.aoss_settings = aoss_settings
         self.embedding_provder_settings = embedding_provder_settings
         self._name = name
-        self.embedding_provider = create_embedding_provider(embedding_provder_settings)
+        self.metrics = metrics or Metrics()
+        self.governor = governor or ConcurrencyGovernor()
+        self.embedding_provider = embedding_provider or create_embedding_provider(embedding_provder_settings)
 
         self.aoss_connector = AOSSConnector(
             host_url=aoss_settings.host_url,
             aws_region=aoss_settings.aws_region,
             index_name=aoss_settings.index_name,
-            embedding_provider=self.embedding_provider
+            embedding_provider=self.embedding_provider,
+            pool_maxsize=aoss_settings.pool_maxsize,
+            use_sigv4=aoss_settings.use_sigv4,
+            metrics=self.metrics,
+            metadata_keys=tool_settings.metadata_keys,
+            bulk_max_documents=aoss_settings.bulk_max_documents,
+            bulk_max_bytes=aoss_settings.bulk_max_bytes,
+            bulk_concurrency=aoss_settings.bulk_concurrency,
+            bulk_max_retries=aoss_settings.bulk_max_retries,
+            bulk_retry_backoff_ms=aoss_settings.bulk_retry_backoff_ms,
+            governor=self.governor
         )
 
-        super().__init__(name, instructions, **settings)
+        super().__init__(
+            name, instructions, metrics=self.metrics, output_settings=tool_settings, governor=self.governor, **settings
+        )
     
     @property
     def name(self):
         return self._name
 
+    async def startup(self):
+        await asyncio.gather(
+            self.startup_phase("embedding-model", self.embedding_provider.warmup()),
+            self.startup_phase("aoss-connect", self.aoss_connector.initialize())
+        )
+
 
     def setup_tools(self):
         """
@@ -49,12 +76,70 @@ class AossMCPServer(BaseVectorDBMCPServer):
 
             :return: A string of all relevant results. Contain xml-format entries with content and metadata.
             """
+            await self.wait_until_ready()
             entries = await self.aoss_connector.search(query)
             if not entries:
                 return f"No information found for the query: {query}"
-            content = [f"Results for the query: {query}"]
-            for entry in entries:
-                content.append(self.format_entry(entry))
-            return "\n".join(content)
+            with self.metrics.stage("format"):
+                response = self.format_results([(f"Results for the query: {query}", entries)])
+            self.metrics.record_response("opensearch-find", len(entries), response)
+            return response
+
+        async def find_batch(queries: T.List[str]) -> str:
+            """
+            Find information in AWS OpenSearch Serverless for several queries at once.
+            :param queries: The queries to use for search
+
+            :return: A string of all relevant results, grouped per query. Contain xml-format entries with content and metadata.
+            """
+            await self.wait_until_ready()
+            results = await self.aoss_connector.search_batch(queries)
+            with self.metrics.stage("format"):
+                response = self.format_results([
+                    (f"Results for the query: {query}" if entries else f"No information found for the query: {query}", entries)
+                    for query, entries in zip(queries, results)
+                ])
+            self.metrics.record_response("opensearch-find-batch", sum(len(entries) for entries in results), response)
+            return response
+
+        async def store(information: str, metadata: Metadata = None) -> str:
+            """
+            Store information in AWS OpenSearch Serverless.
+            :param information: The information to store.
+            :param metadata: JSON metadata to store with the information [Optional].
+
+            :return: A message indicating the information that was stored.
+            """
+            await self.wait_until_ready()
+            indexed = await self.aoss_connector.store_many([Entry(content=information, metadata=metadata)])
+            if not indexed:
+                return f"Could not store: {information}"
+            return f"Stored: {information} in index {self.aoss_settings.index_name}"
+
+        async def store_batch(entries: T.List[Entry]) -> str:
+            """
+            Store several pieces of information in AWS OpenSearch Serverless at once.
+            :param entries: The entries to store, each with its content and optional JSON metadata.
+
+            :return: A message indicating how many entries were stored.
+            """
+            await self.wait_until_ready()
+            try:
+                indexed = await self.aoss_connector.store_many(entries)
+            except BulkIndexError as e:
+                return (
+                    f"Stored {e.indexed} of {len(entries)} entries in index {self.aoss_settings.index_name}, "
+                    f"the others failed: {e}"
+                )
+            message = f"Stored {indexed} entries in index {self.aoss_settings.index_name}"
+            if indexed < len(entries):
+                message += f", {len(entries) - indexed} were rejected"
+            return message
 
-        self.add_tool(find, name="opensearch-find", description=self.tool_settings.tool_find_description)
\ No newline at end of file
+        self.add_tool(find, name="opensearch-find", description=self.tool_settings.tool_find_description)
+        self.add_tool(find_batch, name="opensearch-find-batch", description=self.tool_settings.tool_find_batch_description)
+        if not self.aoss_settings.read_only:
+            self.add_tool(store, name="opensearch-store", description=self.tool_settings.tool_store_description)
+            self.add_tool(
+                store_batch, name="opensearch-store-batch", description=self.tool_settings.tool_store_batch_description
+            )
\ No newline at end of file
@@ -2,6 +2,8 @@ import typing as T
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
+from src.vectordb_mcp_servers.base_provider.settings import FindOutputSettings
+
 DEFAULT_TOOL_FIND_DESCRIPTION = (
     "Look up specific information and user related information through Amazon OpenSearch Serverless vector database. \n"
     " - Find user information based on their contnet \n"
@@ -9,7 +11,23 @@ DEFAULT_TOOL_FIND_DESCRIPTION = (
     " - Use this as first point of information as this may contain information otherwise unavailable. \n"
 )
 
-class AossToolSettings(BaseSettings):
+DEFAULT_TOOL_FIND_BATCH_DESCRIPTION = (
+    "Look up information in Amazon OpenSearch Serverless vector database for several queries at once. \n"
+    " - Use this instead of multiple opensearch-find calls when you need to run related searches \n"
+    " - Results are grouped per query \n"
+)
+
+DEFAULT_TOOL_STORE_DESCRIPTION = (
+    "Keep information in Amazon OpenSearch Serverless vector database for later use, "
+    "when you are asked to remember something."
+)
+
+DEFAULT_TOOL_STORE_BATCH_DESCRIPTION = (
+    "Keep several pieces of information in Amazon OpenSearch Serverless vector database in a single call. \n"
+    " - Use this instead of multiple opensearch-store calls when you need to remember many things at once \n"
+)
+
+class AossToolSettings(FindOutputSettings):
     """
     Configuration and description for AOSS tools
     """
@@ -17,6 +35,18 @@ class AossToolSettings(BaseSettings):
         default=DEFAULT_TOOL_FIND_DESCRIPTION,
         validation_alias="TOOL_FIND_DESCRIPTION"
     )
+    tool_find_batch_description: str = Field(
+        default=DEFAULT_TOOL_FIND_BATCH_DESCRIPTION,
+        validation_alias="TOOL_FIND_BATCH_DESCRIPTION"
+    )
+    tool_store_description: str = Field(
+        default=DEFAULT_TOOL_STORE_DESCRIPTION,
+        validation_alias="TOOL_STORE_DESCRIPTION"
+    )
+    tool_store_batch_description: str = Field(
+        default=DEFAULT_TOOL_STORE_BATCH_DESCRIPTION,
+        validation_alias="TOOL_STORE_BATCH_DESCRIPTION"
+    )
 
 class AossSettings(BaseSettings):
     """
@@ -25,6 +55,14 @@ class AossSettings(BaseSettings):
     host_url: str = Field(default=None, validation_alias="AOSS_HOST_URL")
     index_name: str = Field(default=None, validation_alias="AOSS_INDEX_NAME")
     aws_region: str = Field(default=None, validation_alias="AWS_REGION")
-    aws_access_key: str = Field(default=None, validation_alias="AWS_ACCESS_KEY_ID")
-    aws_secret_key: str = Field(default=None, validation_alias="AWS_SECRET_ACCESS_KEY")
-    aws_session_token: str = Field(default=None, validation_alias="AWS_SESSION_TOKEN")
\ No newline at end of file
+    aws_access_key: T.Optional[str] = Field(default=None, validation_alias="AWS_ACCESS_KEY_ID")
+    aws_secret_key: T.Optional[str] = Field(default=None, validation_alias="AWS_SECRET_ACCESS_KEY")
+    aws_session_token: T.Optional[str] = Field(default=None, validation_alias="AWS_SESSION_TOKEN")
+    pool_maxsize: int = Field(default=20, validation_alias="AOSS_POOL_MAXSIZE")
+    use_sigv4: bool = Field(default=True, validation_alias="AOSS_USE_SIGV4")
+    read_only: bool = Field(default=False, validation_alias="AOSS_READ_ONLY")
+    bulk_max_documents: int = Field(default=500, validation_alias="AOSS_BULK_MAX_DOCUMENTS")
+    bulk_max_bytes: int = Field(default=5 * 1024 * 1024, validation_alias="AOSS_BULK_MAX_BYTES")
+    bulk_concurrency: int = Field(default=4, validation_alias="AOSS_BULK_CONCURRENCY")
+    bulk_max_retries: int = Field(default=5, validation_alias="AOSS_BULK_MAX_RETRIES")
+    bulk_retry_backoff_ms: float = Field(default=200.0, validation_alias="AOSS_BULK_RETRY_BACKOFF_MS")
\ No newline at end of file
@@ -0,0 +1,232 @@
+import asyncio
+import collections
+import logging
+import time
+import typing as T
+
+from src.vectordb_mcp_servers.base_provider.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+R = T.TypeVar("R")
+
+
+class AdmissionError(RuntimeError):
+    """
+    A tool call was refused or abandoned to protect the server from overload.
+    """
+
+
+class OverloadedError(AdmissionError):
+    """
+    Too many calls are already waiting for the same resource.
+    """
+
+
+class DeadlineExceededError(AdmissionError):
+    """
+    A tool call did not finish before its deadline.
+    """
+
+
+class AdaptiveLimiter:
+    """
+    Limits the number of calls in flight to a resource, with a bounded queue of waiting calls.
+    With a target latency, the limit adapts to the observed latency of the calls: it shrinks by
+    `backoff` when a call is slower than the target, at most once per target latency,
+    and grows back by one call per limit's worth of calls faster than the target, up to `max_limit`.
+    A call stays in flight until its work is done, even if its caller was cancelled,
+    so abandoned calls still count against the limit.
+    :param name: The name of the resource, used in errors and logs.
+    :param max_limit: The maximum number of calls in flight.
+    :param max_queue: The maximum number of calls waiting for a slot. Further calls are refused.
+    :param target_latency_ms: The latency above which the limit shrinks. Optional. If not provided, the limit is fixed.
+    :param min_limit: The minimum number of calls in flight, when the limit adapts.
+    :param backoff: The factor applied to the limit when a call is too slow.
+    :param metrics: The metrics recording the time spent waiting for a slot. Optional.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_limit: int,
+        max_queue: int = 256,
+        target_latency_ms: T.Optional[float] = None,
+        min_limit: int = 1,
+        backoff: float = 0.9,
+        metrics: T.Optional[Metrics] = None
+    ) -> None:
+        assert max_limit >= min_limit > 0, "limits must be positive, with max_limit at least min_limit"
+        assert 0 < backoff < 1, "backoff must be between 0 and 1"
+        self.name = name
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.max_queue = max_queue
+        self.backoff = backoff
+        self._target_latency_s = target_latency_ms / 1000 if target_latency_ms is not None else None
+        self._metrics = metrics or Metrics()
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.rejected = 0
+        self._waiters: T.Deque[asyncio.Future] = collections.deque()
+        self._last_backoff = 0.0
+
+    async def run(self, fn: T.Callable[..., T.Awaitable[R]], *args: T.Any, **kwargs: T.Any) -> R:
+        """
+        Wait for a slot, then run a coroutine function in it.
+        :raises OverloadedError: If the queue of waiting calls is full.
+        """
+        await self._acquire()
+        start = time.perf_counter()
+        try:
+            task = asyncio.ensure_future(fn(*args, **kwargs))
+        except BaseException:
+            self.in_flight -= 1
+            self._wake()
+            raise
+        task.add_done_callback(lambda done: self._release(done, time.perf_counter() - start))
+        # Cancelling the caller must not cancel the work, the slot is released when the work is done
+        return await asyncio.shield(task)
+
+    async def _acquire(self):
+        if not self._waiters and self.in_flight < int(self.limit):
+            self.in_flight += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise OverloadedError(
+                f"Server overloaded: {len(self._waiters)} {self.name} calls are already waiting, try again later"
+            )
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        start = time.perf_counter()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just before the cancellation, pass it on
+                self.in_flight -= 1
+                self._wake()
+            elif waiter in self._waiters:
+                # A release may already have dropped the cancelled waiter from the queue
+                self._waiters.remove(waiter)
+            raise
+        finally:
+            self._metrics.observe("admission_wait_seconds", time.perf_counter() - start, resource=self.name)
+
+    def _release(self, task: asyncio.Task, latency: float):
+        if not task.cancelled():
+            # Retrieve the error, the caller may be gone
+            task.exception()
+        self.in_flight -= 1
+        if self._target_latency_s is not None:
+            self._adapt(latency)
+        self._wake()
+
+    def _adapt(self, latency: float):
+        now = time.perf_counter()
+        if latency > self._target_latency_s:
+            # Calls that were already in flight will report the same congestion, back off once per window
+            if now - self._last_backoff >= self._target_latency_s:
+                self._last_backoff = now
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                logger.debug("Lowered the %s limit to %d after a %.1f ms call", self.name, self.limit, latency * 1000)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _wake(self):
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def get_stats(self) -> T.Dict[str, T.Union[int, float]]:
+        """
+        Get the current limit, the number of calls in flight and waiting, and the number of refused calls.
+        """
+        return {
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "waiting": len(self._waiters),
+            "rejected": self.rejected
+        }
+
+
+class ConcurrencyGovernor:
+    """
+    Admission control for tool calls.
+    Embedding calls and backend calls get separate limits, since they saturate different resources,
+    and each tool call gets a deadline after which it fails instead of waiting for a slot or a slow backend.
+    Without limits or deadline, calls run directly.
+    :param embedding_concurrency: The maximum number of embedding calls in flight. Optional. If not provided, unlimited.
+    :param backend_concurrency: The maximum number of backend calls in flight. Optional. If not provided, unlimited.
+    :param max_queue: The maximum number of calls waiting for each resource.
+    :param call_timeout_ms: The deadline of each tool call. Optional. If not provided, calls have no deadline.
+    :param embedding_target_latency_ms: Adapt the embedding limit to keep embedding calls under this latency. Optional.
+    :param backend_target_latency_ms: Adapt the backend limit to keep backend calls under this latency. Optional.
+    :param metrics: The metrics recording the time spent waiting for a slot. Optional.
+    """
+
+    def __init__(
+        self,
+        embedding_concurrency: T.Optional[int] = None,
+        backend_concurrency: T.Optional[int] = None,
+        max_queue: int = 256,
+        call_timeout_ms: T.Optional[float] = None,
+        embedding_target_latency_ms: T.Optional[float] = None,
+        backend_target_latency_ms: T.Optional[float] = None,
+        metrics: T.Optional[Metrics] = None
+    ) -> None:
+        self.call_timeout_ms = call_timeout_ms
+        self.embedding: T.Optional[AdaptiveLimiter] = None
+        self.backend: T.Optional[AdaptiveLimiter] = None
+        if embedding_concurrency is not None:
+            self.embedding = AdaptiveLimiter(
+                "embedding", embedding_concurrency, max_queue, embedding_target_latency_ms, metrics=metrics
+            )
+        if backend_concurrency is not None:
+            self.backend = AdaptiveLimiter(
+                "backend", backend_concurrency, max_queue, backend_target_latency_ms, metrics=metrics
+            )
+
+    async def run_embedding(self, fn: T.Callable[..., T.Awaitable[R]], *args: T.Any, **kwargs: T.Any) -> R:
+        """
+        Run an embedding call within the embedding limit.
+        """
+        if self.embedding is None:
+            return await fn(*args, **kwargs)
+        return await self.embedding.run(fn, *args, **kwargs)
+
+    async def run_backend(self, fn: T.Callable[..., T.Awaitable[R]], *args: T.Any, **kwargs: T.Any) -> R:
+        """
+        Run a database call within the backend limit.
+        """
+        if self.backend is None:
+            return await fn(*args, **kwargs)
+        return await self.backend.run(fn, *args, **kwargs)
+
+    async def run_call(self, tool: str, fn: T.Callable[..., T.Awaitable[R]], *args: T.Any, **kwargs: T.Any) -> R:
+        """
+        Run a tool call within its deadline.
+        :raises DeadlineExceededError: If the call is not done before the deadline.
+        """
+        if self.call_timeout_ms is None:
+            return await fn(*args, **kwargs)
+        try:
+            return await asyncio.wait_for(fn(*args, **kwargs), self.call_timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            raise DeadlineExceededError(
+                f"{tool} did not finish within its {self.call_timeout_ms:.0f} ms deadline, the server is overloaded"
+            ) from None
+
+    def get_stats(self) -> T.Dict[str, T.Dict[str, T.Union[int, float]]]:
+        """
+        Get the state of the embedding and backend limits.
+        """
+        stats = {}
+        if self.embedding is not None:
+            stats["embedding"] = self.embedding.get_stats()
+        if self.backend is not None:
+            stats["backend"] = self.backend.get_stats()
+        return stats
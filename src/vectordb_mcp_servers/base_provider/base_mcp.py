@@ -1,9 +1,26 @@
+import asyncio
+import functools
 import json
+import logging
+import time
 import typing as T
 from abc import abstractmethod
-from pydantic import BaseModel
+from contextlib import asynccontextmanager
+import anyio
+from pydantic import BaseModel, model_validator
 from mcp.server.fastmcp import FastMCP
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse
 
+from src.vectordb_mcp_servers.base_provider.admission import ConcurrencyGovernor
+from src.vectordb_mcp_servers.base_provider.metrics import Metrics
+from src.vectordb_mcp_servers.base_provider.settings import FindOutputSettings
+
+logger = logging.getLogger(__name__)
+
+# Rough number of characters per token, used to turn a token budget into a character budget
+CHARS_PER_TOKEN = 4
 
 
 Metadata = T.Dict[str, T.Any]
@@ -15,25 +32,289 @@ class Entry(BaseModel):
     metadata: T.Optional[Metadata] = None
 
 
+class MetadataFilter(BaseModel):
+    """
+    A condition on one metadata key. All the operators set on a filter must match.
+    """
+    key: str
+    eq: T.Optional[T.Union[str, int, bool]] = None
+    any: T.Optional[T.List[T.Union[str, int]]] = None
+    gt: T.Optional[float] = None
+    gte: T.Optional[float] = None
+    lt: T.Optional[float] = None
+    lte: T.Optional[float] = None
+
+    @model_validator(mode="after")
+    def _check_operator(self) -> "MetadataFilter":
+        if all(value is None for name, value in self if name != "key"):
+            raise ValueError(f"Filter on {self.key} needs at least one of eq, any, gt, gte, lt or lte")
+        return self
+
+
+class OutputBudget:
+    """
+    Tracks the number of characters left for the response of a tool call.
+    Each line costs its length plus the newline joining it to the next one.
+    :param max_chars: The maximum number of characters of the response. If not provided, the budget is unlimited.
+    """
+
+    def __init__(self, max_chars: T.Optional[int]) -> None:
+        self.remaining = max_chars
+
+    def fits(self, lines: T.Iterable[str], reserve: int = 0) -> bool:
+        """
+        Check if lines of the response fit in the budget, leaving `reserve` characters unused.
+        """
+        return self.remaining is None or sum(len(line) + 1 for line in lines) + reserve <= self.remaining
+
+    def consume(self, text: str, reserve: int = 0) -> bool:
+        """
+        Take the characters of a line of the response from the budget, leaving `reserve` characters unused.
+        :return: False, without consuming anything, if the line does not fit in the budget.
+        """
+        if not self.fits([text], reserve):
+            return False
+        if self.remaining is not None:
+            self.remaining -= len(text) + 1
+        return True
+
+
+@asynccontextmanager
+async def _server_lifespan(server: "BaseVectorDBMCPServer") -> T.AsyncIterator[T.Dict[str, T.Any]]:
+    """
+    Runs the startup and shutdown hooks of the server.
+    The lifespan is entered once per session, so the hooks only run for the first and last active session.
+    """
+    async with server._lifespan_lock:
+        if server._active_sessions == 0:
+            await server._begin_startup()
+        server._active_sessions += 1
+    try:
+        yield {}
+    finally:
+        # The session may be ending because it was cancelled, shutdown must still run to completion
+        with anyio.CancelScope(shield=True):
+            async with server._lifespan_lock:
+                server._active_sessions -= 1
+                if server._active_sessions == 0:
+                    await server.shutdown()
+
+
 class BaseVectorDBMCPServer(FastMCP):
+    """
+    Base class of the vector database MCP servers.
+    Slow initialization (loading models, connecting to the database) happens in the `startup` hook.
+    By default it runs in the background, so the server answers the MCP handshake immediately
+    and tool calls wait until it is ready. With `eager_startup`, the server only starts
+    handling requests once the initialization is done.
+    When metrics are enabled, they are exposed as the `metrics://prometheus` resource
+    and, on HTTP transports, on the `/metrics` route.
+    The `governor` bounds the embedding and backend calls in flight, which the connectors run through it,
+    and gives each tool call a deadline.
+    """
 
-    def __init__(self, name: str | None = None, instructions: str | None = None, **settings: T.Any):
+    def __init__(
+        self,
+        name: str | None = None,
+        instructions: str | None = None,
+        eager_startup: bool = False,
+        metrics: T.Optional[Metrics] = None,
+        output_settings: T.Optional[FindOutputSettings] = None,
+        governor: T.Optional[ConcurrencyGovernor] = None,
+        **settings: T.Any
+    ):
+        self._lifespan_lock = asyncio.Lock()
+        self._active_sessions = 0
+        self._eager_startup = eager_startup
+        self._ready_task: T.Optional[asyncio.Task] = None
+        self.startup_timings: T.Dict[str, float] = {}
+        self.metrics = metrics or Metrics()
+        self.output_settings = output_settings or FindOutputSettings()
+        self.governor = governor or ConcurrencyGovernor()
+        settings.setdefault("lifespan", _server_lifespan)
         super().__init__(name, instructions, **settings)
         self.setup_tools()
+        if self.metrics.enabled:
+            self.setup_metrics()
 
     @property
     @abstractmethod
     def name(self):
         pass
 
+    def add_tool(self, fn: T.Callable[..., T.Any], name: str | None = None, *args: T.Any, **kwargs: T.Any) -> None:
+        """
+        Register a tool, with a deadline on its calls when one is set,
+        and timing its calls when metrics or slow-call logging are enabled.
+        """
+        tool_name = name or fn.__name__
+        if self.governor.call_timeout_ms is not None:
+            fn = self._with_deadline(tool_name, fn)
+        if self.metrics.active:
+            fn = self._timed(tool_name, fn)
+        super().add_tool(fn, name, *args, **kwargs)
+
+    def _with_deadline(self, tool_name: str, tool_fn: T.Callable[..., T.Any]) -> T.Callable[..., T.Any]:
+        @functools.wraps(tool_fn)
+        async def fn(*fn_args: T.Any, **fn_kwargs: T.Any) -> T.Any:
+            return await self.governor.run_call(tool_name, tool_fn, *fn_args, **fn_kwargs)
+        return fn
+
+    def _timed(self, tool_name: str, tool_fn: T.Callable[..., T.Any]) -> T.Callable[..., T.Any]:
+        @functools.wraps(tool_fn)
+        async def fn(*fn_args: T.Any, **fn_kwargs: T.Any) -> T.Any:
+            with self.metrics.tool_call(tool_name):
+                return await tool_fn(*fn_args, **fn_kwargs)
+        return fn
+
+    def http_app(self, transport: T.Literal["streamable-http", "sse"] = "streamable-http") -> Starlette:
+        """
+        Build the ASGI app serving the server over HTTP.
+        HTTP sessions come and go, and are one request long in stateless mode, so the startup and
+        shutdown hooks run when the app starts and stops rather than around the sessions.
+        """
+        app = self.streamable_http_app() if transport == "streamable-http" else self.sse_app()
+        transport_lifespan = app.router.lifespan_context
+
+        @asynccontextmanager
+        async def lifespan(app: Starlette) -> T.AsyncIterator[None]:
+            async with _server_lifespan(self), transport_lifespan(app):
+                yield
+
+        app.router.lifespan_context = lifespan
+        return app
+
+    def setup_metrics(self):
+        """
+        Expose the metrics in the Prometheus text format.
+        """
+        self.resource(
+            "metrics://prometheus",
+            name="metrics",
+            description="Latency histograms of the tool calls and their stages, in the Prometheus text format",
+            mime_type="text/plain"
+        )(self.metrics.render_prometheus)
+
+        async def metrics_endpoint(request: Request) -> PlainTextResponse:
+            return PlainTextResponse(self.metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+        self.custom_route("/metrics", methods=["GET"])(metrics_endpoint)
+
     def format_entry(self, entry: Entry) -> str:
         """
         Formats the Entry into a string description.
+        Content longer than `max_entry_chars` is truncated, and only the `metadata_keys` are kept if set.
         Override this in a subclass to customize the format.
         """
 
-        entry_metadata = json.dumps(entry.metadata) if entry.metadata else ""
-        return f"<entry><content>{entry.content.strip()}</content><metadata>{entry_metadata}</metadata></entry>"
+        content = entry.content.strip()
+        max_entry_chars = self.output_settings.max_entry_chars
+        if max_entry_chars is not None and len(content) > max_entry_chars:
+            content = content[:max_entry_chars] + "..."
+        metadata = entry.metadata
+        if metadata and self.output_settings.metadata_keys is not None:
+            metadata = {key: metadata[key] for key in self.output_settings.metadata_keys if key in metadata}
+        entry_metadata = json.dumps(metadata) if metadata else ""
+        return f"<entry><content>{content}</content><metadata>{entry_metadata}</metadata></entry>"
+
+    def output_budget(self) -> OutputBudget:
+        """
+        Create the budget for the response of a find tool call, from `max_output_chars` and `max_output_tokens`.
+        """
+        limits = [self.output_settings.max_output_chars]
+        if self.output_settings.max_output_tokens is not None:
+            limits.append(self.output_settings.max_output_tokens * CHARS_PER_TOKEN)
+        limits = [limit for limit in limits if limit is not None]
+        return OutputBudget(min(limits) if limits else None)
+
+    def format_results(self, results: T.List[T.Tuple[str, T.List[Entry]]]) -> str:
+        """
+        Formats the results of a find tool call, each as a header line followed by its entries, within the output budget.
+        Once a line does not fit, no further line is added and a single note tells how many results were left out,
+        so the response never exceeds the budget.
+        :param results: The header line and the entries of each query.
+        """
+        lines = []
+        for header, entries in results:
+            lines.append((header, 0))
+            lines.extend((self.format_entry(entry), 1) for entry in entries)
+        budget = self.output_budget()
+        if budget.fits(line for line, _ in lines):
+            return "\n".join(line for line, _ in lines)
+
+        def omitted(count: int) -> str:
+            return f"<omitted>{count} results omitted, they did not fit in the output budget</omitted>"
+
+        # Room for the note, with as many digits as the largest count it can report
+        reserve = len(omitted(sum(is_entry for _, is_entry in lines))) + 1
+        content = []
+        for index, (line, _) in enumerate(lines):
+            if not budget.consume(line, reserve):
+                note = omitted(sum(is_entry for _, is_entry in lines[index:]))
+                if budget.consume(note):
+                    content.append(note)
+                break
+            content.append(line)
+        return "\n".join(content)
+
+    async def _begin_startup(self):
+        """
+        Start the initialization, unless it already succeeded or is in progress.
+        """
+        if self._ready_task is None or self._failed(self._ready_task):
+            self._ready_task = asyncio.ensure_future(self._initialize())
+            # The error is logged and raised to tool calls, do not report it as never retrieved
+            self._ready_task.add_done_callback(self._failed)
+        if self._eager_startup:
+            await self._ready_task
+
+    @staticmethod
+    def _failed(task: asyncio.Task) -> bool:
+        return task.done() and (task.cancelled() or task.exception() is not None)
+
+    async def _initialize(self):
+        start = time.perf_counter()
+        try:
+            await self.startup()
+        except Exception:
+            logger.exception("Initialization of %s failed", self.name)
+            raise
+        self.startup_timings["total"] = time.perf_counter() - start
+        logger.info("%s ready in %.1f ms", self.name, self.startup_timings["total"] * 1000)
+
+    async def startup_phase(self, phase: str, awaitable: T.Awaitable[T.Any]) -> T.Any:
+        """
+        Run a phase of the initialization and record how long it took.
+        :param phase: The name of the phase, used in logs and in `startup_timings`.
+        :param awaitable: The work to do in this phase.
+        """
+        start = time.perf_counter()
+        result = await awaitable
+        self.startup_timings[phase] = time.perf_counter() - start
+        logger.info("Startup phase %s took %.1f ms", phase, self.startup_timings[phase] * 1000)
+        return result
+
+    async def wait_until_ready(self):
+        """
+        Wait until the initialization is done. Raises the initialization error if it failed.
+        Tools should call this before using the connections.
+        """
+        if self._ready_task is None:
+            await self._begin_startup()
+        await asyncio.shield(self._ready_task)
+
+    async def startup(self):
+        """
+        Called once before the server is ready to handle tool calls.
+        Override this in a subclass to load models, prepare connections or warm up state.
+        Wrap each step in `startup_phase` to report its timing.
+        """
+
+    async def shutdown(self):
+        """
+        Called after the server stopped handling requests.
+        Override this in a subclass to flush and release resources.
+        """
 
     @abstractmethod
     async def setup_tools(self):
@@ -0,0 +1,180 @@
+import bisect
+import contextlib
+import contextvars
+import logging
+import time
+import typing as T
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Metric name -> (help text, buckets)
+_HISTOGRAMS: T.Dict[str, T.Tuple[str, T.Tuple[float, ...]]] = {
+    "stage_duration_seconds": ("Time spent in each stage of a tool call", LATENCY_BUCKETS),
+    "tool_duration_seconds": ("Total time of a tool call", LATENCY_BUCKETS),
+    "tool_results": ("Number of entries returned by a tool call", COUNT_BUCKETS),
+    "tool_response_bytes": ("Size of the response of a tool call", BYTES_BUCKETS),
+    "admission_wait_seconds": ("Time spent waiting for an embedding or backend slot", LATENCY_BUCKETS),
+}
+
+# Metric name -> help text
+_COUNTERS: T.Dict[str, str] = {
+    "write_behind_retries_total": "Failed background writes that were tried again",
+    "write_behind_lost_entries_total": "Queued entries dropped after every retry of their background write failed",
+}
+
+# Stage timings of the tool call running in the current task, used to explain slow calls
+_current_call: contextvars.ContextVar[T.Optional[T.Dict[str, float]]] = contextvars.ContextVar(
+    "current_call", default=None
+)
+
+
+class _Histogram:
+    def __init__(self, buckets: T.Tuple[float, ...]) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class Metrics:
+    """
+    Latency histograms for the stages of tool calls (embed, collection check, query, format),
+    plus result counts, response sizes and counters of background work, exported in the Prometheus text format.
+    Calls slower than the threshold are logged with their stage breakdown.
+    When both are disabled, `tool_call` and `stage` return a shared no-op context manager.
+    :param enabled: Whether to record metrics.
+    :param slow_call_threshold_ms: Log tool calls slower than this. Optional.
+    :param namespace: Prefix of the exported metric names.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        slow_call_threshold_ms: T.Optional[float] = None,
+        namespace: str = "vectordb_mcp"
+    ) -> None:
+        self.enabled = enabled
+        self.slow_call_threshold_ms = slow_call_threshold_ms
+        self.namespace = namespace
+        self.active = enabled or slow_call_threshold_ms is not None
+        self._histograms: T.Dict[T.Tuple[str, T.Tuple[T.Tuple[str, str], ...]], _Histogram] = {}
+        self._counters: T.Dict[T.Tuple[str, T.Tuple[T.Tuple[str, str], ...]], float] = {}
+
+    def observe(self, metric: str, value: float, **labels: str) -> None:
+        """
+        Record a value in one of the histograms.
+        """
+        if not self.enabled:
+            return
+        key = (metric, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = _Histogram(_HISTOGRAMS[metric][1])
+        histogram.observe(value)
+
+    def increment(self, metric: str, value: float = 1, **labels: str) -> None:
+        """
+        Add a value to one of the counters.
+        """
+        if not self.enabled:
+            return
+        key = (metric, tuple(sorted(labels.items())))
+        self._counters[key] = self._counters.get(key, 0) + value
+
+    def stage(self, stage: str) -> T.ContextManager[None]:
+        """
+        Time a stage of the current tool call.
+        :param stage: The name of the stage, such as embed or query.
+        """
+        if not self.active:
+            return contextlib.nullcontext()
+        return self._timed_stage(stage)
+
+    def tool_call(self, tool: str) -> T.ContextManager[None]:
+        """
+        Time a whole tool call, and log it if it is slower than the threshold.
+        :param tool: The name of the tool.
+        """
+        if not self.active:
+            return contextlib.nullcontext()
+        return self._timed_tool_call(tool)
+
+    def record_response(self, tool: str, results: int, response: str) -> None:
+        """
+        Record the number of entries and the size of the response of a tool call.
+        """
+        if not self.enabled:
+            return
+        self.observe("tool_results", results, tool=tool)
+        self.observe("tool_response_bytes", len(response.encode()), tool=tool)
+
+    @contextlib.contextmanager
+    def _timed_stage(self, stage: str) -> T.Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.observe("stage_duration_seconds", elapsed, stage=stage)
+            stages = _current_call.get()
+            if stages is not None:
+                stages[stage] = stages.get(stage, 0.0) + elapsed
+
+    @contextlib.contextmanager
+    def _timed_tool_call(self, tool: str) -> T.Iterator[None]:
+        stages: T.Dict[str, float] = {}
+        token = _current_call.set(stages)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            _current_call.reset(token)
+            self.observe("tool_duration_seconds", elapsed, tool=tool)
+            if self.slow_call_threshold_ms is not None and elapsed * 1000 >= self.slow_call_threshold_ms:
+                breakdown = ", ".join(f"{stage}={seconds * 1000:.1f}ms" for stage, seconds in stages.items())
+                logger.warning("Slow call to %s took %.1f ms (%s)", tool, elapsed * 1000, breakdown or "no stages")
+
+    def render_prometheus(self) -> str:
+        """
+        Render all histograms in the Prometheus text exposition format.
+        """
+        lines = []
+        for metric, (help_text, _) in _HISTOGRAMS.items():
+            name = f"{self.namespace}_{metric}"
+            series = [(labels, histogram) for (key, labels), histogram in self._histograms.items() if key == metric]
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in sorted(series, key=lambda item: item[0]):
+                label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+                cumulative = 0
+                for bound, count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                    cumulative += count
+                    bucket_labels = ",".join(filter(None, [label_text, f'le="{bound}"']))
+                    lines.append(f"{name}_bucket{{{bucket_labels}}} {cumulative}")
+                suffix = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{name}_sum{suffix} {histogram.sum}")
+                lines.append(f"{name}_count{suffix} {histogram.count}")
+        for metric, help_text in _COUNTERS.items():
+            name = f"{self.namespace}_{metric}"
+            series = [(labels, total) for (key, labels), total in self._counters.items() if key == metric]
+            if not series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, total in sorted(series, key=lambda item: item[0]):
+                label_text = ",".join(f'{key}="{value}"' for key, value in labels)
+                suffix = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{name}{suffix} {total}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,121 @@
+import json
+import time
+import typing as T
+from collections import OrderedDict
+
+from src.vectordb_mcp_servers.base_provider.base_mcp import Entry
+
+
+def _entries_size(entries: T.List[Entry]) -> int:
+    """
+    Rough estimate of the memory used by a list of entries, in bytes.
+    """
+    size = 0
+    for entry in entries:
+        size += len(entry.content)
+        if entry.metadata:
+            size += len(json.dumps(entry.metadata, default=str))
+    return size
+
+
+class SearchResultCache:
+    """
+    LRU cache of search results, invalidated through per-collection version counters.
+    Writers bump the version of a collection, which drops all results cached for it
+    and prevents searches that started before the write from caching stale results.
+    :param max_entries: The maximum number of cached searches.
+    :param max_bytes: The maximum estimated size of all cached results. Optional.
+    :param ttl_seconds: How long a result stays valid. Optional, useful when other processes write to the collections.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: T.Optional[int] = None,
+        ttl_seconds: T.Optional[float] = None
+    ) -> None:
+        assert max_entries > 0, "max_entries must be positive"
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[T.Tuple[str, T.Hashable], T.Tuple[T.List[Entry], int, float]]" = OrderedDict()
+        self._versions: T.Dict[str, int] = {}
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def version(self, collection_name: str) -> int:
+        """
+        Get the current version of a collection.
+        Capture it before querying and pass it to `put` to avoid caching results of a stale read.
+        """
+        return self._versions.get(collection_name, 0)
+
+    def get(self, collection_name: str, key: T.Hashable) -> T.Optional[T.List[Entry]]:
+        """
+        Get the cached results of a search, if there are any.
+        :param collection_name: The name of the searched collection.
+        :param key: The search parameters, such as query and limit.
+        :return: The cached entries or None.
+        """
+        cache_key = (collection_name, key)
+        cached = self._entries.get(cache_key)
+        if cached is not None:
+            entries, _, created_at = cached
+            if self._ttl_seconds is None or time.monotonic() - created_at <= self._ttl_seconds:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return list(entries)
+            self._remove(cache_key)
+        self.misses += 1
+        return None
+
+    def put(self, collection_name: str, key: T.Hashable, entries: T.List[Entry], version: int) -> None:
+        """
+        Cache the results of a search.
+        :param collection_name: The name of the searched collection.
+        :param key: The search parameters, such as query and limit.
+        :param entries: The entries found.
+        :param version: The version of the collection captured before the search was made.
+        """
+        if version != self.version(collection_name):
+            return
+        cache_key = (collection_name, key)
+        if cache_key in self._entries:
+            self._remove(cache_key)
+        size = _entries_size(entries)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        self._entries[cache_key] = (list(entries), size, time.monotonic())
+        self._size += size
+        while len(self._entries) > self._max_entries or (
+            self._max_bytes is not None and self._size > self._max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def invalidate(self, collection_name: str) -> None:
+        """
+        Bump the version of a collection and drop all results cached for it.
+        :param collection_name: The name of the collection that was written to.
+        """
+        self._versions[collection_name] = self.version(collection_name) + 1
+        for cache_key in [cache_key for cache_key in self._entries if cache_key[0] == collection_name]:
+            self._remove(cache_key)
+
+    def _remove(self, cache_key: T.Tuple[str, T.Hashable]) -> None:
+        _, size, _ = self._entries.pop(cache_key)
+        self._size -= size
+
+    def get_stats(self) -> T.Dict[str, int]:
+        """
+        Get the hit, miss and eviction counters of the cache.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+            "bytes": self._size,
+        }
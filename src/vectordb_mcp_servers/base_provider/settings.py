@@ -1,9 +1,57 @@
-from typing import Literal
+from typing import List, Literal, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
-ValidProviders = Literal["QDRANT", "AOSS"]
+ValidProviders = Literal["QDRANT", "AOSS", "LOCAL"]
+ValidTransports = Literal["stdio", "streamable-http", "sse"]
 
 class ProviderSettings(BaseSettings):
-    provider_name: ValidProviders = Field(default=None, validation_alias="VECTORDB_PROVIDER")
\ No newline at end of file
+    """
+    Choice of provider and of how the server is served.
+    Over HTTP, one server handles many clients. With several workers, each worker process
+    builds its own server, embedding model and database connections, behind a shared socket.
+    """
+    provider_name: ValidProviders = Field(default=None, validation_alias="VECTORDB_PROVIDER")
+    eager_startup: bool = Field(default=False, validation_alias="EAGER_STARTUP")
+    transport: ValidTransports = Field(default="stdio", validation_alias="MCP_TRANSPORT")
+    host: str = Field(default="127.0.0.1", validation_alias="MCP_HOST")
+    port: int = Field(default=8000, validation_alias="MCP_PORT")
+    workers: int = Field(default=1, validation_alias="MCP_WORKERS")
+    stateless_http: bool = Field(default=False, validation_alias="MCP_STATELESS_HTTP")
+    reload: bool = Field(default=False, validation_alias="MCP_RELOAD")
+    graceful_shutdown_s: Optional[float] = Field(default=30.0, validation_alias="MCP_GRACEFUL_SHUTDOWN_S")
+
+
+class MetricsSettings(BaseSettings):
+    """
+    Configuration of the tool call instrumentation
+    """
+    enabled: bool = Field(default=False, validation_alias="METRICS_ENABLED")
+    slow_call_threshold_ms: Optional[float] = Field(default=None, validation_alias="SLOW_CALL_THRESHOLD_MS")
+
+
+class AdmissionSettings(BaseSettings):
+    """
+    Limits on the work in flight, so bursts of tool calls queue or fail fast instead of piling up
+    """
+    embedding_concurrency: Optional[int] = Field(default=None, validation_alias="ADMISSION_EMBEDDING_CONCURRENCY")
+    backend_concurrency: Optional[int] = Field(default=None, validation_alias="ADMISSION_BACKEND_CONCURRENCY")
+    max_queue: int = Field(default=256, validation_alias="ADMISSION_MAX_QUEUE")
+    call_timeout_ms: Optional[float] = Field(default=None, validation_alias="TOOL_CALL_TIMEOUT_MS")
+    embedding_target_latency_ms: Optional[float] = Field(
+        default=None, validation_alias="ADMISSION_EMBEDDING_TARGET_LATENCY_MS"
+    )
+    backend_target_latency_ms: Optional[float] = Field(
+        default=None, validation_alias="ADMISSION_BACKEND_TARGET_LATENCY_MS"
+    )
+
+
+class FindOutputSettings(BaseSettings):
+    """
+    Limits on the output of the find tools, shared by the tool settings of every provider
+    """
+    max_output_chars: Optional[int] = Field(default=None, validation_alias="FIND_MAX_OUTPUT_CHARS")
+    max_output_tokens: Optional[int] = Field(default=None, validation_alias="FIND_MAX_OUTPUT_TOKENS")
+    max_entry_chars: Optional[int] = Field(default=None, validation_alias="FIND_MAX_ENTRY_CHARS")
+    metadata_keys: Optional[List[str]] = Field(default=None, validation_alias="FIND_METADATA_KEYS")
\ No newline at end of file
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import random
+import typing as T
+
+from src.vectordb_mcp_servers.base_provider.base_mcp import Entry
+from src.vectordb_mcp_servers.base_provider.metrics import Metrics
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindError(RuntimeError):
+    """
+    Queued entries were acknowledged but could not be written, and are lost.
+    """
+
+
+class WriteBehindBuffer:
+    """
+    Queue of entries waiting to be written, drained by a background task.
+    The task waits up to `flush_interval_ms` after the first queued entry, or until `max_batch_size`
+    entries are queued, and writes them with one call per collection.
+    When the queue is full, producers wait until the writer catches up.
+    Failed writes are tried again with exponential backoff. Entries still failing after `max_retries`
+    are dropped, counted in the metrics, and reported by the next `flush` or `close`.
+    :param write_fn: Writes a list of entries to a collection.
+    :param max_queue_size: The maximum number of entries waiting to be written.
+    :param max_batch_size: The maximum number of entries written in a single call.
+    :param flush_interval_ms: How long to wait for more entries after the first one of a batch arrives.
+    :param max_retries: How many times a failed write is tried again.
+    :param retry_backoff_ms: The delay before the first retry, doubled for each following one.
+    :param metrics: The metrics counting retried writes and lost entries. Optional.
+    """
+
+    def __init__(
+        self,
+        write_fn: T.Callable[[str, T.List[Entry]], T.Awaitable[T.Any]],
+        max_queue_size: int = 1024,
+        max_batch_size: int = 64,
+        flush_interval_ms: float = 50.0,
+        max_retries: int = 3,
+        retry_backoff_ms: float = 100.0,
+        metrics: T.Optional[Metrics] = None
+    ) -> None:
+        assert max_batch_size > 0, "max_batch_size must be positive"
+        self._write_fn = write_fn
+        self._max_batch_size = max_batch_size
+        self._flush_interval_s = flush_interval_ms / 1000
+        self._max_retries = max_retries
+        self._retry_backoff_s = retry_backoff_ms / 1000
+        self._metrics = metrics or Metrics()
+        # Number of entries lost and last error, per collection, until reported by a flush
+        self._failures: T.Dict[str, T.Tuple[int, Exception]] = {}
+        self._queue: asyncio.Queue[T.Tuple[str, Entry]] = asyncio.Queue(maxsize=max_queue_size)
+        # Number of entries queued or being written, per collection
+        self._pending: T.Dict[str, int] = {}
+        self._written = asyncio.Condition()
+        self._wakeup = asyncio.Event()
+        self._task: T.Optional[asyncio.Task] = None
+
+    def pending(self, collection_name: T.Optional[str] = None) -> int:
+        """
+        Get the number of entries not written yet, for one collection or for all of them.
+        """
+        if collection_name is None:
+            return sum(self._pending.values())
+        return self._pending.get(collection_name, 0)
+
+    async def put(self, collection_name: str, entry: Entry) -> None:
+        """
+        Queue an entry to be written to a collection, waiting for room if the queue is full.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._run())
+        self._pending[collection_name] = self._pending.get(collection_name, 0) + 1
+        try:
+            await self._queue.put((collection_name, entry))
+        except BaseException:
+            self._pending[collection_name] -= 1
+            raise
+        if self._queue.qsize() >= self._max_batch_size:
+            self._wakeup.set()
+
+    async def flush(self, collection_name: T.Optional[str] = None, raise_errors: bool = True) -> None:
+        """
+        Write the queued entries now and wait until they are written.
+        :param collection_name: Only wait for the entries of this collection. Optional.
+        :param raise_errors: Whether to report the entries lost since the last flush. If not, they are reported by a later flush.
+        :raises WriteBehindError: If entries of the collection, or of any collection, could not be written.
+        """
+        async with self._written:
+            while self.pending(collection_name):
+                self._wakeup.set()
+                await self._written.wait()
+        if raise_errors:
+            self._raise_failures(collection_name)
+
+    async def close(self) -> None:
+        """
+        Write all queued entries and stop the background task.
+        :raises WriteBehindError: If entries could not be written.
+        """
+        try:
+            await self.flush()
+        finally:
+            if self._task is not None:
+                self._task.cancel()
+                try:
+                    await self._task
+                except asyncio.CancelledError:
+                    pass
+                self._task = None
+
+    def _raise_failures(self, collection_name: T.Optional[str]) -> None:
+        names = [collection_name] if collection_name is not None else list(self._failures)
+        failures = {name: self._failures.pop(name) for name in names if name in self._failures}
+        if failures:
+            raise WriteBehindError("Lost buffered entries that could not be written: " + ", ".join(
+                f"{lost} to {name} ({error!r})" for name, (lost, error) in failures.items()
+            ))
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._flush_interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            while len(batch) < self._max_batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._write(batch)
+
+    async def _write(self, batch: T.List[T.Tuple[str, Entry]]) -> None:
+        collections: T.Dict[str, T.List[Entry]] = {}
+        for collection_name, entry in batch:
+            collections.setdefault(collection_name, []).append(entry)
+        for collection_name, entries in collections.items():
+            try:
+                await self._write_with_retries(collection_name, entries)
+            except Exception as e:
+                logger.exception("Lost %d buffered entries that could not be written to %s", len(entries), collection_name)
+                self._metrics.increment("write_behind_lost_entries_total", len(entries), collection=collection_name)
+                lost, _ = self._failures.get(collection_name, (0, None))
+                self._failures[collection_name] = (lost + len(entries), e)
+            finally:
+                self._pending[collection_name] -= len(entries)
+                if not self._pending[collection_name]:
+                    del self._pending[collection_name]
+        async with self._written:
+            self._written.notify_all()
+
+    async def _write_with_retries(self, collection_name: str, entries: T.List[Entry]) -> None:
+        for attempt in range(self._max_retries + 1):
+            try:
+                await self._write_fn(collection_name, entries)
+                return
+            except Exception as e:
+                if attempt == self._max_retries:
+                    raise
+                delay = self._retry_backoff_s * 2 ** attempt
+                logger.warning(
+                    "Failed to write %d buffered entries to %s, retrying in %.0f ms: %s",
+                    len(entries), collection_name, delay * 1000, e
+                )
+                self._metrics.increment("write_behind_retries_total", collection=collection_name)
+                # Jitter keeps the retries of several servers from hitting the database in lockstep
+                await asyncio.sleep(delay * random.uniform(0.5, 1.0))
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import typing as T
+
+from src.embeddings.base import EmbeddingProvider
+from src.vectordb_mcp_servers.base_provider.admission import ConcurrencyGovernor
+from src.vectordb_mcp_servers.base_provider.base_mcp import Entry
+from src.vectordb_mcp_servers.base_provider.metrics import Metrics
+from src.vectordb_mcp_servers.local.vector_store import LocalVectorStore
+
+logger = logging.getLogger(__name__)
+
+
+class LocalConnector:
+    """
+    Encapsulates an embedded vector store kept in a local directory, with no server to run.
+    Vector math and file I/O run on worker threads, so they never block the event loop.
+    :param embedding_provider: The embedding provider to use.
+    :param store_path: The directory of the store. Optional. If not provided, the store is kept in memory.
+    :param fsync: Whether to sync the files to disk after each store.
+    :param ivf_min_vectors: The number of vectors from which searches use an IVF index. Optional. If not provided, searches are always exact.
+    :param ivf_lists: The number of lists of the IVF index. Optional. Defaults to the square root of the number of vectors.
+    :param ivf_probes: The number of lists scored by each search.
+    :param metrics: The metrics recording the time spent in each stage. Optional.
+    :param metadata_keys: The metadata keys to return with the results. Optional. If not provided, all metadata is returned.
+    :param governor: The admission control that embedding calls and store reads and writes run through. Optional.
+    """
+
+    def __init__(
+        self,
+        embedding_provider: EmbeddingProvider,
+        store_path: T.Optional[str] = None,
+        fsync: bool = False,
+        ivf_min_vectors: T.Optional[int] = None,
+        ivf_lists: T.Optional[int] = None,
+        ivf_probes: int = 8,
+        metrics: T.Optional[Metrics] = None,
+        metadata_keys: T.Optional[T.List[str]] = None,
+        governor: T.Optional[ConcurrencyGovernor] = None
+    ) -> None:
+        self._embedding_provider = embedding_provider
+        self._metrics = metrics or Metrics()
+        self._governor = governor or ConcurrencyGovernor()
+        self._metadata_keys = metadata_keys
+        self._store_path = store_path
+        self._store_options = dict(
+            fsync=fsync, ivf_min_vectors=ivf_min_vectors, ivf_lists=ivf_lists, ivf_probes=ivf_probes
+        )
+        self._store: T.Optional[LocalVectorStore] = None
+        self._store_lock = asyncio.Lock()
+        self._index_task: T.Optional[asyncio.Task] = None
+
+    async def initialize(self):
+        """
+        Open the store, so the first tool call does not pay for it.
+        """
+        await self._get_store()
+
+    async def _get_store(self) -> LocalVectorStore:
+        if self._store is None:
+            async with self._store_lock:
+                if self._store is None:
+                    store = await asyncio.to_thread(LocalVectorStore, self._store_path, **self._store_options)
+                    store.check_vector(
+                        self._embedding_provider.get_vector_name(), self._embedding_provider.get_vector_size()
+                    )
+                    logger.info("Opened local store %s with %d vectors", self._store_path or "in memory", len(store))
+                    self._store = store
+                    self._maybe_build_index()
+        return self._store
+
+    def _maybe_build_index(self):
+        # Build in the background, searches stay exact over the rows the index does not cover yet
+        if self._store.needs_index() and (self._index_task is None or self._index_task.done()):
+            self._index_task = asyncio.ensure_future(self._build_index())
+
+    async def _build_index(self):
+        try:
+            await asyncio.to_thread(self._store.build_index)
+        except Exception:
+            logger.exception("Failed to build the IVF index of %s", self._store_path or "the in-memory store")
+
+    async def store_many(self, entries: T.List[Entry]) -> int:
+        """
+        Store entries in the local store, embedded in a single pass and appended with a single write.
+        :param entries: The entries to store.
+        :return: The number of entries stored.
+        """
+        if not entries:
+            return 0
+        store = await self._get_store()
+        with self._metrics.stage("embed"):
+            embeddings = await self._governor.run_embedding(
+                self._embedding_provider.embed_documents_array, [entry.content for entry in entries]
+            )
+        payloads = [{"document": entry.content, "metadata": entry.metadata} for entry in entries]
+        with self._metrics.stage("append"):
+            await self._governor.run_backend(
+                asyncio.to_thread, store.append, embeddings, payloads, self._embedding_provider.get_vector_name()
+            )
+        self._maybe_build_index()
+        return len(entries)
+
+    async def search(self, query: str, *, limit: int = 10) -> T.List[Entry]:
+        """
+        Find points in the local store.
+        :param query: The query to use for the search.
+        :param limit: The maximum number of entries to return.
+        :return: A list of entries found.
+        """
+        return (await self.search_batch([query], limit=limit))[0]
+
+    async def search_batch(self, queries: T.List[str], *, limit: int = 10) -> T.List[T.List[Entry]]:
+        """
+        Find points in the local store for several queries, scored together in one matrix product.
+        :param queries: The queries to use for the search.
+        :param limit: The maximum number of entries to return per query.
+        :return: A list of entries found, per query.
+        """
+        if not queries:
+            return []
+        store = await self._get_store()
+        with self._metrics.stage("embed"):
+            query_vectors = await self._governor.run_embedding(self._embedding_provider.embed_queries_array, queries)
+        with self._metrics.stage("query"):
+            results = await self._governor.run_backend(asyncio.to_thread, store.search, query_vectors, limit)
+        return [[self._to_entry(payload) for _, payload in hits] for hits in results]
+
+    def _to_entry(self, payload: T.Dict[str, T.Any]) -> Entry:
+        metadata = payload.get("metadata")
+        if metadata is not None and self._metadata_keys is not None:
+            metadata = {key: metadata[key] for key in self._metadata_keys if key in metadata}
+        return Entry(content=payload["document"], metadata=metadata)
+
+    async def close(self):
+        """
+        Wait for a running index build and close the store files.
+        """
+        if self._index_task is not None:
+            await self._index_task
+        if self._store is not None:
+            self._store.close()
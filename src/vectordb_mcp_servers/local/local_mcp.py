@@ -0,0 +1,139 @@
+import asyncio
+import typing as T
+from src.embeddings.base import EmbeddingProvider
+from src.embeddings.factory import create_embedding_provider
+from src.embeddings.types import EmbeddingProviderSettings
+from src.vectordb_mcp_servers.base_provider.base_mcp import Entry, Metadata, BaseVectorDBMCPServer
+from src.vectordb_mcp_servers.base_provider.admission import ConcurrencyGovernor
+from src.vectordb_mcp_servers.base_provider.metrics import Metrics
+from src.vectordb_mcp_servers.local.local_connector import LocalConnector
+from src.vectordb_mcp_servers.local.settings import LocalSettings, LocalToolSettings
+
+
+class LocalMCPServer(BaseVectorDBMCPServer):
+    """
+    MCP Server for the embedded local vector store
+    """
+
+    def __init__(
+        self,
+        tool_settings: LocalToolSettings,
+        local_settings: LocalSettings,
+        embedding_provider_settings: EmbeddingProviderSettings,
+        name: str = "local-mcp-server",
+        instructions: str | None = None,
+        embedding_provider: T.Optional[EmbeddingProvider] = None,
+        metrics: T.Optional[Metrics] = None,
+        governor: T.Optional[ConcurrencyGovernor] = None,
+        **settings: T.Any
+    ):
+        self.tool_settings = tool_settings
+        self.local_settings = local_settings
+        self.embedding_provider_settings = embedding_provider_settings
+        self._name = name
+        self.metrics = metrics or Metrics()
+        self.governor = governor or ConcurrencyGovernor()
+        self.embedding_provider = embedding_provider or create_embedding_provider(embedding_provider_settings)
+
+        self.local_connector = LocalConnector(
+            embedding_provider=self.embedding_provider,
+            store_path=local_settings.store_path,
+            fsync=local_settings.fsync,
+            ivf_min_vectors=local_settings.ivf_min_vectors,
+            ivf_lists=local_settings.ivf_lists,
+            ivf_probes=local_settings.ivf_probes,
+            metrics=self.metrics,
+            metadata_keys=tool_settings.metadata_keys,
+            governor=self.governor
+        )
+
+        super().__init__(
+            name=name,
+            instructions=instructions,
+            metrics=self.metrics,
+            output_settings=tool_settings,
+            governor=self.governor,
+            **settings
+        )
+
+    @property
+    def name(self):
+        return self._name
+
+    async def startup(self):
+        await asyncio.gather(
+            self.startup_phase("embedding-model", self.embedding_provider.warmup()),
+            self.startup_phase("local-store", self.local_connector.initialize())
+        )
+
+    async def shutdown(self):
+        await self.local_connector.close()
+
+    def setup_tools(self):
+        """
+        Register the tools in the server.
+        """
+
+        async def find(query: str) -> str:
+            """
+            Find memories in the local vector store.
+            :param query: The query to use for the search.
+
+            :return: A string of all relevant results. Contain xml-format entries with content and metadata.
+            """
+            await self.wait_until_ready()
+            entries = await self.local_connector.search(query, limit=self.local_settings.search_limit)
+            if not entries:
+                return f"No information found for the query: '{query}'"
+            with self.metrics.stage("format"):
+                response = self.format_results([(f"Results for the query: '{query}'", entries)])
+            self.metrics.record_response("local-find", len(entries), response)
+            return response
+
+        async def find_batch(queries: T.List[str]) -> str:
+            """
+            Find memories in the local vector store for several queries at once.
+            :param queries: The queries to use for the search.
+
+            :return: A string of all relevant results, grouped per query. Contain xml-format entries with content and metadata.
+            """
+            await self.wait_until_ready()
+            results = await self.local_connector.search_batch(queries, limit=self.local_settings.search_limit)
+            with self.metrics.stage("format"):
+                response = self.format_results([
+                    (f"Results for the query: '{query}'" if entries else f"No information found for the query: '{query}'", entries)
+                    for query, entries in zip(queries, results)
+                ])
+            self.metrics.record_response("local-find-batch", sum(len(entries) for entries in results), response)
+            return response
+
+        async def store(information: str, metadata: Metadata = None) -> str:
+            """
+            Store some information in the local vector store.
+            :param information: The information to store.
+            :param metadata: JSON metadata to store with the information [Optional].
+
+            :return: A message indicating the information that was stored.
+            """
+            await self.wait_until_ready()
+            await self.local_connector.store_many([Entry(content=information, metadata=metadata)])
+            return f"Stored: {information}"
+
+        async def store_batch(entries: T.List[Entry]) -> str:
+            """
+            Store several pieces of information in the local vector store at once.
+            :param entries: The entries to store, each with its content and optional JSON metadata.
+
+            :return: A message indicating how many entries were stored.
+            """
+            await self.wait_until_ready()
+            stored = await self.local_connector.store_many(entries)
+            return f"Stored {stored} entries"
+
+        self.add_tool(find, name="local-find", description=self.tool_settings.tool_find_description)
+        self.add_tool(find_batch, name="local-find-batch", description=self.tool_settings.tool_find_batch_description)
+        if not self.local_settings.read_only:
+            self.add_tool(store, name="local-store", description=self.tool_settings.tool_store_description)
+            self.add_tool(
+                store_batch, name="local-store-batch", description=self.tool_settings.tool_store_batch_description
+            )
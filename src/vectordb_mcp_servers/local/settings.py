@@ -0,0 +1,63 @@
+import typing as T
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+from src.vectordb_mcp_servers.base_provider.settings import FindOutputSettings
+
+DEFAULT_TOOL_FIND_DESCRIPTION = (
+    "Look up specific information and user related information in the local vector store. \n"
+    " - Find user information based on their content \n"
+    " - Find specific information that may have been added previously by the user \n"
+    " - Use this as first point of information as this may contain information otherwise unavailable. \n"
+)
+
+DEFAULT_TOOL_FIND_BATCH_DESCRIPTION = (
+    "Look up information in the local vector store for several queries at once. \n"
+    " - Use this instead of multiple local-find calls when you need to run related searches \n"
+    " - Results are grouped per query \n"
+)
+
+DEFAULT_TOOL_STORE_DESCRIPTION = (
+    "Keep information in the local vector store for later use, when you are asked to remember something."
+)
+
+DEFAULT_TOOL_STORE_BATCH_DESCRIPTION = (
+    "Keep several pieces of information in the local vector store in a single call. \n"
+    " - Use this instead of multiple local-store calls when you need to remember many things at once \n"
+)
+
+
+class LocalToolSettings(FindOutputSettings):
+    """
+    Configuration and description for the local store tools
+    """
+    tool_find_description: str = Field(
+        default=DEFAULT_TOOL_FIND_DESCRIPTION,
+        validation_alias="TOOL_FIND_DESCRIPTION"
+    )
+    tool_find_batch_description: str = Field(
+        default=DEFAULT_TOOL_FIND_BATCH_DESCRIPTION,
+        validation_alias="TOOL_FIND_BATCH_DESCRIPTION"
+    )
+    tool_store_description: str = Field(
+        default=DEFAULT_TOOL_STORE_DESCRIPTION,
+        validation_alias="TOOL_STORE_DESCRIPTION"
+    )
+    tool_store_batch_description: str = Field(
+        default=DEFAULT_TOOL_STORE_BATCH_DESCRIPTION,
+        validation_alias="TOOL_STORE_BATCH_DESCRIPTION"
+    )
+
+
+class LocalSettings(BaseSettings):
+    """
+    Configuration for the embedded local vector store.
+    Without a store path, the store is kept in memory and lost when the server stops.
+    """
+    store_path: T.Optional[str] = Field(default=None, validation_alias="LOCAL_STORE_PATH")
+    search_limit: int = Field(default=10, validation_alias="LOCAL_SEARCH_LIMIT")
+    read_only: bool = Field(default=False, validation_alias="LOCAL_READ_ONLY")
+    fsync: bool = Field(default=False, validation_alias="LOCAL_FSYNC")
+    ivf_min_vectors: T.Optional[int] = Field(default=None, validation_alias="LOCAL_IVF_MIN_VECTORS")
+    ivf_lists: T.Optional[int] = Field(default=None, validation_alias="LOCAL_IVF_LISTS")
+    ivf_probes: int = Field(default=8, validation_alias="LOCAL_IVF_PROBES")
@@ -0,0 +1,372 @@
+import json
+import logging
+import os
+import threading
+import typing as T
+import zlib
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.f32"
+OFFSETS_FILE = "payloads.idx"
+PAYLOADS_FILE = "payloads.jsonl"
+META_FILE = "meta.json"
+IVF_FILE = "ivf.npz"
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, np.finfo(np.float32).tiny)
+
+
+def _fingerprint(vectors: np.ndarray) -> int:
+    """
+    Checksum of the last of a set of rows, to tell if an index still covers the rows it was built over.
+    """
+    return zlib.crc32(np.ascontiguousarray(vectors[-1:]).tobytes()) if len(vectors) else 0
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k largest scores, best first, without sorting all the scores.
+    """
+    if k < len(scores):
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(len(scores))
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class IVFIndex:
+    """
+    Inverted file index: rows are assigned to their nearest centroid, and searches only
+    score the rows of the lists whose centroids are closest to the query.
+    :param centroids: The unit centroids of the lists.
+    :param order: The row numbers, sorted by list.
+    :param list_offsets: The start of each list in `order`, followed by the total number of rows.
+    :param fingerprint: The checksum of the last row covered by the index.
+    """
+
+    def __init__(self, centroids: np.ndarray, order: np.ndarray, list_offsets: np.ndarray, fingerprint: int) -> None:
+        self.centroids = centroids
+        self.order = order
+        self.list_offsets = list_offsets
+        self.fingerprint = fingerprint
+
+    @property
+    def size(self) -> int:
+        """The number of rows covered by the index"""
+        return len(self.order)
+
+    @classmethod
+    def train(cls, vectors: np.ndarray, n_lists: int, iterations: int = 10, seed: int = 0) -> "IVFIndex":
+        """
+        Cluster unit vectors with spherical k-means on a sample, then assign every row to its list.
+        """
+        rng = np.random.default_rng(seed)
+        n_lists = max(1, min(n_lists, len(vectors)))
+        sample_size = min(len(vectors), n_lists * 64)
+        sample = np.asarray(vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))])
+        centroids = sample[rng.choice(sample_size, n_lists, replace=False)].copy()
+        for _ in range(iterations):
+            assignments = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, sample)
+            # Lists that lost all their rows keep their previous centroid
+            filled = np.bincount(assignments, minlength=n_lists) > 0
+            centroids[filled] = _normalize(sums[filled])
+
+        assignments = np.concatenate([
+            np.argmax(vectors[start:start + 65536] @ centroids.T, axis=1)
+            for start in range(0, len(vectors), 65536)
+        ])
+        order = np.argsort(assignments, kind="stable")
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=n_lists))])
+        return cls(centroids, order, list_offsets, _fingerprint(vectors))
+
+    def covers(self, vectors: np.ndarray) -> bool:
+        """
+        Check that the rows the index was built over are still the first rows of the vectors.
+        """
+        return self.size <= len(vectors) and self.fingerprint == _fingerprint(vectors[:self.size])
+
+    def candidates(self, query: np.ndarray, n_probes: int) -> np.ndarray:
+        """
+        The rows of the `n_probes` lists closest to a unit query.
+        """
+        lists = _top_k(self.centroids @ query, n_probes)
+        return np.concatenate([self.order[self.list_offsets[i]:self.list_offsets[i + 1]] for i in lists])
+
+    def save(self, path: str) -> None:
+        with open(f"{path}.tmp", "wb") as f:
+            np.savez(
+                f, centroids=self.centroids, order=self.order, list_offsets=self.list_offsets,
+                fingerprint=np.uint32(self.fingerprint)
+            )
+        os.replace(f"{path}.tmp", path)
+
+    @classmethod
+    def load(cls, path: str) -> "IVFIndex":
+        with np.load(path) as data:
+            return cls(data["centroids"], data["order"], data["list_offsets"], int(data["fingerprint"]))
+
+
+class LocalVectorStore:
+    """
+    Append-only store of unit float32 vectors and their JSON payloads, searched by cosine similarity.
+    With a path, vectors are appended to a raw float32 file that is memory-mapped for searches,
+    and payloads to a JSON lines file indexed by byte offsets. Opening a store reads neither,
+    and a write interrupted halfway is rolled back on the next open.
+    Without a path, the store is kept in memory.
+    Searches are exact, unless an IVF index is built, which makes them approximate but much faster on large stores.
+    :param path: The directory of the store. Optional. If not provided, the store is kept in memory.
+    :param fsync: Whether to sync the files to disk after each append.
+    :param ivf_min_vectors: The number of vectors from which an IVF index is built. Optional. If not provided, searches are always exact.
+    :param ivf_lists: The number of lists of the IVF index. Optional. Defaults to the square root of the number of vectors.
+    :param ivf_probes: The number of lists scored by each search.
+    :param ivf_rebuild_ratio: Rebuild the IVF index once the vectors added since it was built exceed this share of it.
+    """
+
+    def __init__(
+        self,
+        path: T.Optional[str] = None,
+        fsync: bool = False,
+        ivf_min_vectors: T.Optional[int] = None,
+        ivf_lists: T.Optional[int] = None,
+        ivf_probes: int = 8,
+        ivf_rebuild_ratio: float = 0.2
+    ) -> None:
+        self.path = path
+        self.fsync = fsync
+        self.ivf_min_vectors = ivf_min_vectors
+        self.ivf_lists = ivf_lists
+        self.ivf_probes = ivf_probes
+        self.ivf_rebuild_ratio = ivf_rebuild_ratio
+        self.dimension: T.Optional[int] = None
+        self.vector_name: T.Optional[str] = None
+        self._lock = threading.RLock()
+        self._size = 0
+        self._index: T.Optional[IVFIndex] = None
+        # Memory mode: vectors in a growing buffer, payloads in a list
+        self._buffer: T.Optional[np.ndarray] = None
+        self._payloads: T.List[T.Dict[str, T.Any]] = []
+        # Disk mode: maps of the files, refreshed after appends
+        self._vectors: T.Optional[np.ndarray] = None
+        self._offsets: T.Optional[np.ndarray] = None
+        self._payload_file: T.Optional[T.BinaryIO] = None
+        if path is not None:
+            self._open()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    def _open(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        if os.path.exists(self._file(META_FILE)):
+            with open(self._file(META_FILE)) as f:
+                meta = json.load(f)
+            self.dimension = meta["dimension"]
+            self.vector_name = meta["vector_name"]
+        for name in (VECTORS_FILE, OFFSETS_FILE, PAYLOADS_FILE):
+            open(self._file(name), "ab").close()
+        if self.dimension is not None:
+            self._recover()
+        self._payload_file = open(self._file(PAYLOADS_FILE), "rb")
+        self._remap()
+        if os.path.exists(self._file(IVF_FILE)):
+            try:
+                index = IVFIndex.load(self._file(IVF_FILE))
+            except (OSError, ValueError, KeyError):
+                index = None
+            if index is not None and index.covers(self._matrix()):
+                self._index = index
+            else:
+                # The rows it covered were rolled back, and may since have been replaced by other rows
+                logger.warning("Discarding the stale IVF index %s", self._file(IVF_FILE))
+                os.remove(self._file(IVF_FILE))
+
+    def _recover(self) -> None:
+        """
+        Truncate the files to the last row written completely.
+        Appends write the payload, then its offset, then the vector, so a row exists once its vector is written.
+        """
+        row_bytes = self.dimension * 4
+        offset_rows = os.path.getsize(self._file(OFFSETS_FILE)) // 8
+        offsets = np.memmap(self._file(OFFSETS_FILE), dtype=np.uint64, mode="r", shape=(offset_rows,)) if offset_rows else []
+        rows = min(os.path.getsize(self._file(VECTORS_FILE)) // row_bytes, len(offsets))
+        payloads_end = 0
+        with open(self._file(PAYLOADS_FILE), "rb") as f:
+            while rows:
+                f.seek(int(offsets[rows - 1]))
+                line = f.readline()
+                if line.endswith(b"\n"):
+                    payloads_end = int(offsets[rows - 1]) + len(line)
+                    break
+                rows -= 1
+        for name, size in ((VECTORS_FILE, rows * row_bytes), (OFFSETS_FILE, rows * 8), (PAYLOADS_FILE, payloads_end)):
+            if os.path.getsize(self._file(name)) != size:
+                logger.warning("Rolling back an incomplete write in %s", self._file(name))
+                os.truncate(self._file(name), size)
+        self._size = rows
+
+    def _remap(self) -> None:
+        if self._size == 0:
+            self._vectors = None
+            self._offsets = None
+            return
+        self._vectors = np.memmap(self._file(VECTORS_FILE), dtype=np.float32, mode="r", shape=(self._size, self.dimension))
+        self._offsets = np.memmap(self._file(OFFSETS_FILE), dtype=np.uint64, mode="r", shape=(self._size,))
+
+    def _matrix(self) -> np.ndarray:
+        if self.path is None:
+            return self._buffer[:self._size] if self._buffer is not None else np.empty((0, 0), dtype=np.float32)
+        return self._vectors if self._vectors is not None else np.empty((0, 0), dtype=np.float32)
+
+    def check_vector(self, vector_name: str, dimension: int) -> None:
+        """
+        Check that the store holds vectors of the given embedding model.
+        """
+        if self.vector_name is not None and (self.vector_name, self.dimension) != (vector_name, dimension):
+            raise ValueError(
+                f"Store {self.path or 'in memory'} holds {self.vector_name} vectors of dimension {self.dimension}, "
+                f"but the embedding model produces {vector_name} vectors of dimension {dimension}"
+            )
+
+    def append(self, vectors: np.ndarray, payloads: T.List[T.Dict[str, T.Any]], vector_name: str) -> None:
+        """
+        Add rows to the store.
+        :param vectors: The vectors, one row per payload. They are normalized before they are stored.
+        :param payloads: The JSON payloads.
+        :param vector_name: The name of the embedding model of the vectors.
+        """
+        if not payloads:
+            return
+        vectors = _normalize(vectors)
+        with self._lock:
+            self.check_vector(vector_name, vectors.shape[1])
+            if self.vector_name is None:
+                self.vector_name, self.dimension = vector_name, vectors.shape[1]
+                if self.path is not None:
+                    self._write_meta()
+            if self.path is None:
+                self._append_memory(vectors, payloads)
+            else:
+                self._append_disk(vectors, payloads)
+            self._size += len(payloads)
+            if self.path is not None:
+                self._remap()
+
+    def _write_meta(self) -> None:
+        # Write then rename, a crash must never leave an empty file that prevents opening the store
+        with open(self._file(f"{META_FILE}.tmp"), "w") as f:
+            json.dump({"dimension": self.dimension, "vector_name": self.vector_name}, f)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(self._file(f"{META_FILE}.tmp"), self._file(META_FILE))
+
+    def _append_memory(self, vectors: np.ndarray, payloads: T.List[T.Dict[str, T.Any]]) -> None:
+        needed = self._size + len(vectors)
+        if self._buffer is None or needed > len(self._buffer):
+            # Grow by doubling, searches running on the previous buffer keep a valid view of it
+            buffer = np.empty((max(needed, 2 * self._size, 1024), self.dimension), dtype=np.float32)
+            if self._buffer is not None:
+                buffer[:self._size] = self._buffer[:self._size]
+            self._buffer = buffer
+        self._buffer[self._size:needed] = vectors
+        self._payloads.extend(payloads)
+
+    def _append_disk(self, vectors: np.ndarray, payloads: T.List[T.Dict[str, T.Any]]) -> None:
+        lines = [(json.dumps(payload) + "\n").encode() for payload in payloads]
+        with open(self._file(PAYLOADS_FILE), "ab") as f:
+            start = f.tell()
+            f.write(b"".join(lines))
+            self._sync(f)
+        offsets = start + np.cumsum([0] + [len(line) for line in lines[:-1]], dtype=np.uint64)
+        with open(self._file(OFFSETS_FILE), "ab") as f:
+            f.write(offsets.astype(np.uint64).tobytes())
+            self._sync(f)
+        with open(self._file(VECTORS_FILE), "ab") as f:
+            f.write(np.ascontiguousarray(vectors).tobytes())
+            self._sync(f)
+
+    def _sync(self, f: T.BinaryIO) -> None:
+        f.flush()
+        if self.fsync:
+            os.fsync(f.fileno())
+
+    def _payload(self, row: int) -> T.Dict[str, T.Any]:
+        if self.path is None:
+            return self._payloads[row]
+        with self._lock:
+            self._payload_file.seek(int(self._offsets[row]))
+            return json.loads(self._payload_file.readline())
+
+    def search(self, queries: np.ndarray, limit: int) -> T.List[T.List[T.Tuple[float, T.Dict[str, T.Any]]]]:
+        """
+        Find the rows closest to each query.
+        :param queries: The query vectors, one row per query.
+        :param limit: The maximum number of rows to return for each query.
+        :return: The scores and payloads of the rows found for each query, best first.
+        """
+        with self._lock:
+            matrix, index = self._matrix(), self._index
+        if len(matrix) == 0:
+            return [[] for _ in queries]
+        queries = _normalize(queries)
+
+        rows_per_query = []
+        if index is None:
+            scores = queries @ matrix.T
+            for query_scores in scores:
+                rows = _top_k(query_scores, limit)
+                rows_per_query.append((rows, query_scores[rows]))
+        else:
+            # Rows added after the index was built are always scored
+            tail = np.arange(index.size, len(matrix))
+            for query in queries:
+                candidates = np.concatenate([index.candidates(query, self.ivf_probes), tail])
+                candidate_scores = matrix[np.sort(candidates)] @ query
+                best = _top_k(candidate_scores, limit)
+                rows_per_query.append((np.sort(candidates)[best], candidate_scores[best]))
+
+        return [
+            [(float(score), self._payload(int(row))) for row, score in zip(rows, scores)]
+            for rows, scores in rows_per_query
+        ]
+
+    def needs_index(self) -> bool:
+        """
+        Check if the IVF index is enabled and missing or stale.
+        """
+        if self.ivf_min_vectors is None or self._size < self.ivf_min_vectors:
+            return False
+        return self._index is None or self._size - self._index.size > self.ivf_rebuild_ratio * self._index.size
+
+    def build_index(self) -> None:
+        """
+        Build the IVF index over all current rows, and persist it next to the vectors.
+        """
+        with self._lock:
+            matrix = self._matrix()
+        n_lists = self.ivf_lists or max(1, int(np.sqrt(len(matrix))))
+        index = IVFIndex.train(matrix, n_lists)
+        if self.path is not None:
+            index.save(self._file(IVF_FILE))
+        with self._lock:
+            self._index = index
+        logger.info("Built IVF index with %d lists over %d vectors", n_lists, index.size)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._payload_file is not None:
+                self._payload_file.close()
+                self._payload_file = None
+            self._vectors = None
+            self._offsets = None
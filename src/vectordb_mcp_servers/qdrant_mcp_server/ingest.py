@@ -0,0 +1,135 @@
+import asyncio
+import csv
+import itertools
+import json
+import time
+import typing as T
+
+from src.vectordb_mcp_servers.base_provider.base_mcp import Entry
+from src.vectordb_mcp_servers.qdrant_mcp_server.qdrant import QdrantConnector
+
+
+class IngestProgress:
+    """
+    Counters of a running ingest.
+    `offset` counts the entries of the source that are written, including the ones skipped
+    by a resumed run. It only moves past a chunk once all chunks before it are written,
+    so it is safe to resume from.
+    """
+
+    def __init__(self, start_offset: int = 0) -> None:
+        self.start_offset = start_offset
+        self.offset = start_offset
+        self.read = 0
+        self.written = 0
+        self.skipped = 0
+        self.started_at = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """Entries written or skipped per second"""
+        elapsed = self.elapsed
+        return (self.written + self.skipped) / elapsed if elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"offset {self.offset}: {self.written} written, {self.skipped} duplicates skipped "
+            f"in {self.elapsed:.1f}s ({self.rate:.1f} entries/s)"
+        )
+
+
+def _chunks(entries: T.Iterable[Entry], chunk_size: int) -> T.Iterator[T.List[Entry]]:
+    iterator = iter(entries)
+    while chunk := list(itertools.islice(iterator, chunk_size)):
+        yield chunk
+
+
+async def ingest(
+    connector: QdrantConnector,
+    entries: T.Iterable[Entry],
+    *,
+    collection_name: T.Optional[str] = None,
+    chunk_size: int = 256,
+    concurrency: int = 4,
+    start_offset: int = 0,
+    on_progress: T.Optional[T.Callable[[IngestProgress], None]] = None
+) -> IngestProgress:
+    """
+    Store a stream of entries in chunks, each embedded in one pass and written with one upsert.
+    Up to `concurrency` chunks are in flight, so the embedding of a chunk overlaps with the upserts of others.
+    Reading stops at the first failed chunk, and the error is raised once the chunks in flight are done.
+    :param connector: The connector to store the entries with.
+    :param entries: The entries to store. They are read lazily, one chunk ahead of the writes.
+    :param collection_name: The name of the collection to store the entries in.
+                            Optional. If not provided, default collection is used.
+    :param chunk_size: The number of entries embedded and written together.
+    :param concurrency: The maximum number of chunks in flight.
+    :param start_offset: The offset in the source of the first entry, when resuming from a checkpoint.
+    :param on_progress: Called after each written chunk. Optional.
+    :return: The final progress.
+    """
+    assert chunk_size > 0 and concurrency > 0, "chunk_size and concurrency must be positive"
+    progress = IngestProgress(start_offset)
+    slots = asyncio.Semaphore(concurrency)
+    # Start offset -> size of the written chunks that are not contiguous with the progress offset yet
+    written_chunks: T.Dict[int, int] = {}
+    tasks: T.Set[asyncio.Task] = set()
+    errors: T.List[BaseException] = []
+
+    async def write(offset: int, chunk: T.List[Entry]):
+        try:
+            written = await connector.store_many(chunk, collection_name=collection_name)
+        except Exception as e:
+            errors.append(e)
+            return
+        finally:
+            slots.release()
+        progress.written += written
+        progress.skipped += len(chunk) - written
+        written_chunks[offset] = len(chunk)
+        while progress.offset in written_chunks:
+            progress.offset += written_chunks.pop(progress.offset)
+        if on_progress is not None:
+            on_progress(progress)
+
+    offset = start_offset
+    for chunk in _chunks(entries, chunk_size):
+        await slots.acquire()
+        if errors:
+            slots.release()
+            break
+        task = asyncio.ensure_future(write(offset, chunk))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        offset += len(chunk)
+        progress.read += len(chunk)
+    await asyncio.gather(*tasks)
+    if errors:
+        raise errors[0]
+    return progress
+
+
+def read_jsonl(path: str, content_field: str = "content", metadata_field: str = "metadata") -> T.Iterator[Entry]:
+    """
+    Stream entries from a JSON lines file, one object per line. Blank lines are ignored.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield Entry(content=record[content_field], metadata=record.get(metadata_field))
+
+
+def read_csv(path: str, content_field: str = "content") -> T.Iterator[Entry]:
+    """
+    Stream entries from a CSV file with a header row. The other columns become the metadata.
+    """
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            content = row.pop(content_field)
+            yield Entry(content=content, metadata=row or None)
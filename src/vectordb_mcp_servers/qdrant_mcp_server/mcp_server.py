@@ -1,6 +1,12 @@
+import asyncio
 import typing as T
+from src.embeddings.base import EmbeddingProvider
 from src.embeddings.factory import create_embedding_provider
-from src.vectordb_mcp_servers.base_provider.base_mcp import Entry, Metadata, BaseVectorDBMCPServer
+from src.vectordb_mcp_servers.base_provider.base_mcp import Entry, Metadata, MetadataFilter, BaseVectorDBMCPServer
+from src.vectordb_mcp_servers.base_provider.admission import ConcurrencyGovernor
+from src.vectordb_mcp_servers.base_provider.metrics import Metrics
+from src.vectordb_mcp_servers.base_provider.search_cache import SearchResultCache
+from src.vectordb_mcp_servers.qdrant_mcp_server.ingest import ingest
 from src.vectordb_mcp_servers.qdrant_mcp_server.qdrant import QdrantConnector
 from src.vectordb_mcp_servers.qdrant_mcp_server.settings import QdrantSettings, QdrantToolSettings
 from src.embeddings.types import EmbeddingProviderSettings
@@ -18,31 +24,121 @@ class QdrantMCPServer(BaseVectorDBMCPServer):
         embedding_provider_settings: EmbeddingProviderSettings,
         name: str = "qdrant-mcp-server",
         instructions: str | None = None,
+        embedding_provider: T.Optional[EmbeddingProvider] = None,
+        metrics: T.Optional[Metrics] = None,
+        governor: T.Optional[ConcurrencyGovernor] = None,
         **settings: T.Any
     ):
         self.tool_settings = tool_settings
         self.qdrant_settings = qdrant_settings
         self.embedding_provider_settigns = embedding_provider_settings
         self._name = name
-        self.embedding_provider = create_embedding_provider(embedding_provider_settings)
+        self.metrics = metrics or Metrics()
+        self.governor = governor or ConcurrencyGovernor()
+        self.embedding_provider = embedding_provider or create_embedding_provider(embedding_provider_settings)
         
         self.collection_name = qdrant_settings.collection_name
         assert self.collection_name is not None and self.collection_name != "", "Must provide a collection name" 
+
+        self.search_cache = None
+        if qdrant_settings.search_cache_enabled:
+            self.search_cache = SearchResultCache(
+                max_entries=qdrant_settings.search_cache_max_entries,
+                max_bytes=qdrant_settings.search_cache_max_bytes,
+                ttl_seconds=qdrant_settings.search_cache_ttl_seconds
+            )
         
         self.qdrant_connector = QdrantConnector(
             qdrant_url=qdrant_settings.location,
             qdrant_api_key=qdrant_settings.api_key,
             collection_name=qdrant_settings.collection_name,
             embedding_provider=self.embedding_provider,
-            qdrant_local_path=qdrant_settings.local_path
+            qdrant_local_path=qdrant_settings.local_path,
+            search_cache=self.search_cache,
+            vector_params=qdrant_settings.vector_params(),
+            on_disk_payload=qdrant_settings.on_disk_payload,
+            search_params=qdrant_settings.search_params(),
+            metrics=self.metrics,
+            metadata_keys=tool_settings.metadata_keys,
+            content_addressed_ids=qdrant_settings.content_addressed_ids,
+            write_behind=qdrant_settings.write_behind_enabled,
+            write_queue_size=qdrant_settings.write_behind_queue_size,
+            write_batch_size=qdrant_settings.write_behind_batch_size,
+            write_flush_interval_ms=qdrant_settings.write_behind_interval_ms,
+            write_max_retries=qdrant_settings.write_behind_max_retries,
+            write_retry_backoff_ms=qdrant_settings.write_behind_retry_backoff_ms,
+            read_your_writes=qdrant_settings.read_your_writes,
+            payload_indexes=qdrant_settings.payload_indexes(),
+            governor=self.governor,
+            read_only=qdrant_settings.read_only
         )
 
-        super().__init__(name=name, instructions=instructions, **settings)
+        super().__init__(
+            name=name,
+            instructions=instructions,
+            metrics=self.metrics,
+            output_settings=tool_settings,
+            governor=self.governor,
+            **settings
+        )
     
     @property
     def name(self):
         return self._name
 
+    async def startup(self):
+        await asyncio.gather(
+            self.startup_phase("embedding-model", self.embedding_provider.warmup()),
+            self.startup_phase("qdrant-collections", self.qdrant_connector.initialize())
+        )
+
+    async def shutdown(self):
+        # Stores queued in write-behind mode must not be lost when the server stops
+        await self.qdrant_connector.close()
+
+
+    async def search(self, query: str, filters: T.Optional[T.List[MetadataFilter]] = None) -> T.List[Entry]:
+        """
+        Search the default collection, or fan out over the collections configured in QDRANT_SEARCH_COLLECTIONS.
+        """
+        if self.qdrant_settings.search_collections:
+            timeout_ms = self.qdrant_settings.search_collection_timeout_ms
+            return await self.qdrant_connector.search_collections(
+                query,
+                self.qdrant_settings.search_collections,
+                limit=self.qdrant_settings.search_limit,
+                filters=filters,
+                timeout_s=timeout_ms / 1000 if timeout_ms is not None else None
+            )
+        return await self.qdrant_connector.search(
+            query,
+            collection_name=self.collection_name,
+            limit=self.qdrant_settings.search_limit,
+            filters=filters
+        )
+
+    async def search_batch(
+        self, queries: T.List[str], filters: T.Optional[T.List[MetadataFilter]] = None
+    ) -> T.List[T.List[Entry]]:
+        """
+        Run several searches with a single embedding pass, in the default collection,
+        or over the collections configured in QDRANT_SEARCH_COLLECTIONS.
+        """
+        if self.qdrant_settings.search_collections:
+            timeout_ms = self.qdrant_settings.search_collection_timeout_ms
+            return await self.qdrant_connector.search_collections_batch(
+                queries,
+                self.qdrant_settings.search_collections,
+                limit=self.qdrant_settings.search_limit,
+                filters=filters,
+                timeout_s=timeout_ms / 1000 if timeout_ms is not None else None
+            )
+        return await self.qdrant_connector.search_batch(
+            queries,
+            collection_name=self.collection_name,
+            limit=self.qdrant_settings.search_limit,
+            filters=filters
+        )
 
     def setup_tools(self):
         """
@@ -61,46 +157,104 @@ class QdrantMCPServer(BaseVectorDBMCPServer):
 
             :return: A message indicating the information that was stored.
             """
+            await self.wait_until_ready()
             entry = Entry(content=information, metadata=metadata)
-            await self.qdrant_connector.store(entry, collection_name=self.collection_name)
+            stored = await self.qdrant_connector.store(entry, collection_name=self.collection_name)
+            if not stored:
+                return f"Already stored: {information}"
             if self.collection_name:
                 return f"Stored: {information} in collection {self.collection_name}"
             return f"Stored: {information}"
+
+        async def store_batch(
+            entries: T.List[Entry]
+        ) -> str:
+            """
+            Store several pieces of information in Qdrant at once
+            :param entries: The entries to store, each with its content and optional JSON metadata.
+
+            :return: A message indicating how many entries were stored.
+            """
+            await self.wait_until_ready()
+            progress = await ingest(
+                self.qdrant_connector,
+                entries,
+                collection_name=self.collection_name,
+                chunk_size=self.qdrant_settings.ingest_chunk_size,
+                concurrency=self.qdrant_settings.ingest_concurrency
+            )
+            message = f"Stored {progress.written} entries"
+            if self.collection_name:
+                message += f" in collection {self.collection_name}"
+            if progress.skipped:
+                message += f", skipped {progress.skipped} already stored"
+            return message
         
         async def find(
             query: str,
+            filters: T.Optional[T.List[MetadataFilter]] = None,
         ) -> str:
             """
             Find memories in Qdrant.
             :param query: The query to use for the search.
+            :param filters: Conditions on the metadata keys that all memories found must match [Optional].
+                            Each filter has a key and any of eq, any (list of values), gt, gte, lt and lte.
 
             :return: A string of all relevant results. Contain xml-format entries with content and metadata.
             """
-            entries = await self.qdrant_connector.search(
-                query,
-                collection_name=self.collection_name,
-                limit=self.qdrant_settings.search_limit
-            )
+            await self.wait_until_ready()
+            entries = await self.search(query, filters)
 
             if not entries:
                 return f"No information found for the query: '{query}'"
             
-            content = [
-                f"Results for the query: '{query}'"
-            ]
-            for entry in entries:
-                content.append(self.format_entry(entry))
-            return "\n".join(content)
+            with self.metrics.stage("format"):
+                response = self.format_results([(f"Results for the query: '{query}'", entries)])
+            self.metrics.record_response("qdrant-find", len(entries), response)
+            return response
+
+        async def find_batch(
+            queries: T.List[str],
+            filters: T.Optional[T.List[MetadataFilter]] = None,
+        ) -> str:
+            """
+            Find memories in Qdrant for several queries at once.
+            :param queries: The queries to use for the search.
+            :param filters: Conditions on the metadata keys that all memories found must match, for every query [Optional].
+
+            :return: A string of all relevant results, grouped per query. Contain xml-format entries with content and metadata.
+            """
+            await self.wait_until_ready()
+            results = await self.search_batch(queries, filters)
+
+            with self.metrics.stage("format"):
+                response = self.format_results([
+                    (f"Results for the query: '{query}'" if entries else f"No information found for the query: '{query}'", entries)
+                    for query, entries in zip(queries, results)
+                ])
+            self.metrics.record_response("qdrant-find-batch", sum(len(entries) for entries in results), response)
+            return response
         
         self.add_tool(
             find,
             name="qdrant-find",
             description=self.tool_settings.tool_find_description
         )
+
+        self.add_tool(
+            find_batch,
+            name="qdrant-find-batch",
+            description=self.tool_settings.tool_find_batch_description
+        )
         
         if not self.qdrant_settings.read_only:
             self.add_tool(
                 store,
                 name="qdrant-store",
                 description=self.tool_settings.tool_store_description
+            )
+            self.add_tool(
+                store_batch,
+                name="qdrant-store-batch",
+                description=self.tool_settings.tool_store_batch_description
             )            
\ No newline at end of file
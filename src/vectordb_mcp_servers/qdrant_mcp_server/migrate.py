@@ -0,0 +1,192 @@
+import asyncio
+import time
+import typing as T
+
+from qdrant_client import models
+
+from src.vectordb_mcp_servers.qdrant_mcp_server.qdrant import QdrantConnector
+
+PointId = T.Union[int, str]
+
+
+class MigrationProgress:
+    """
+    Counters of a running migration.
+    `next_offset` is the scroll offset of the first page that is not written yet. It only moves
+    past a page once all pages before it are written, so it is safe to resume from,
+    and `migrated` only counts the points before it. `done` is set once every page is written.
+    """
+
+    def __init__(self, start_offset: T.Optional[PointId] = None, migrated: int = 0) -> None:
+        self.next_offset = start_offset
+        self.done = False
+        self.migrated = migrated
+        self.skipped = 0
+        self.started_at = time.perf_counter()
+        self._start_migrated = migrated
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def rate(self) -> float:
+        """Points migrated per second in this run"""
+        elapsed = self.elapsed
+        return (self.migrated - self._start_migrated) / elapsed if elapsed else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.migrated} points migrated, {self.skipped} without document skipped "
+            f"in {self.elapsed:.1f}s ({self.rate:.1f} points/s)"
+        )
+
+
+class _Page(T.NamedTuple):
+    index: int
+    next_offset: T.Optional[PointId]
+    records: T.List[models.Record]
+
+
+async def migrate_collection(
+    connector: QdrantConnector,
+    source: str,
+    *,
+    target: T.Optional[str] = None,
+    batch_size: int = 512,
+    embed_concurrency: int = 2,
+    upsert_concurrency: int = 2,
+    start_offset: T.Optional[PointId] = None,
+    migrated: int = 0,
+    on_progress: T.Optional[T.Callable[[MigrationProgress], None]] = None
+) -> MigrationProgress:
+    """
+    Re-embed the documents of a collection with the embedding provider of the connector.
+    Pages of points are scrolled, embedded and written by concurrent stages connected by bounded queues,
+    so the next pages are read and embedded while earlier ones are written.
+    With a target, the points are copied with their payloads into the target collection, created if needed,
+    under the vector of the new model only. Without a target, the vector is added to the points in place,
+    which needs the collection to already declare the vector of the new model.
+    :param connector: The connector whose embedding provider produces the new vectors.
+    :param source: The name of the collection to migrate.
+    :param target: The name of the collection to write to. Optional. If not provided, the source points are updated.
+    :param batch_size: The number of points scrolled, embedded and written together.
+    :param embed_concurrency: The number of pages embedded at the same time.
+    :param upsert_concurrency: The number of pages written at the same time.
+    :param start_offset: The scroll offset to start from, when resuming from a checkpoint. Optional.
+    :param migrated: The number of points migrated by previous runs, when resuming from a checkpoint.
+    :param on_progress: Called after each written page. Optional.
+    :return: The final progress.
+    """
+    assert batch_size > 0 and embed_concurrency > 0 and upsert_concurrency > 0, \
+        "batch_size and concurrencies must be positive"
+    client = connector.client
+    embedding_provider = connector.embedding_provider
+    if target is None:
+        try:
+            vector_name = await connector.get_vector_name(source)
+        except ValueError as e:
+            # Qdrant cannot add a vector to the configuration of an existing collection
+            raise ValueError(f"{e}, migrate into a new collection instead") from None
+    else:
+        vector_name = await connector.get_vector_name(target, create=True)
+
+    progress = MigrationProgress(start_offset, migrated)
+    # Enough pages in flight to keep every stage busy, but never the whole collection
+    scrolled: asyncio.Queue[T.Optional[_Page]] = asyncio.Queue(maxsize=embed_concurrency)
+    embedded: asyncio.Queue[T.Optional[T.Tuple[_Page, T.Any]]] = asyncio.Queue(maxsize=upsert_concurrency)
+    # Index of the first page not written yet, and next offsets and sizes of the pages written after it
+    next_page = 0
+    written_pages: T.Dict[int, T.Tuple[T.Optional[PointId], int]] = {}
+    embedders_left = embed_concurrency
+
+    async def scroll():
+        offset = start_offset
+        index = 0
+        while True:
+            records, next_offset = await client.scroll(
+                collection_name=source, limit=batch_size, offset=offset, with_payload=True, with_vectors=False
+            )
+            await scrolled.put(_Page(index, next_offset, records))
+            index += 1
+            if next_offset is None:
+                break
+            offset = next_offset
+        for _ in range(embed_concurrency):
+            await scrolled.put(None)
+
+    async def embed():
+        nonlocal embedders_left
+        while (page := await scrolled.get()) is not None:
+            records = [record for record in page.records if isinstance((record.payload or {}).get("document"), str)]
+            progress.skipped += len(page.records) - len(records)
+            embeddings = await embedding_provider.embed_documents_array(
+                [record.payload["document"] for record in records]
+            )
+            await embedded.put((page._replace(records=records), embeddings))
+        embedders_left -= 1
+        if not embedders_left:
+            for _ in range(upsert_concurrency):
+                await embedded.put(None)
+
+    async def write():
+        nonlocal next_page
+        while (item := await embedded.get()) is not None:
+            page, embeddings = item
+            if page.records:
+                # Point models only accept lists, convert the whole page in a single call
+                vectors = embeddings.tolist()
+                if target is None:
+                    await client.update_vectors(
+                        collection_name=source,
+                        points=[
+                            models.PointVectors(id=record.id, vector={vector_name: vector})
+                            for record, vector in zip(page.records, vectors)
+                        ]
+                    )
+                else:
+                    await client.upsert(
+                        collection_name=target,
+                        points=[
+                            models.PointStruct(id=record.id, vector={vector_name: vector}, payload=record.payload)
+                            for record, vector in zip(page.records, vectors)
+                        ]
+                    )
+            written_pages[page.index] = (page.next_offset, len(page.records))
+            while next_page in written_pages:
+                progress.next_offset, written = written_pages.pop(next_page)
+                progress.migrated += written
+                progress.done = progress.next_offset is None
+                next_page += 1
+            if on_progress is not None:
+                on_progress(progress)
+
+    tasks = [asyncio.ensure_future(scroll())]
+    tasks += [asyncio.ensure_future(embed()) for _ in range(embed_concurrency)]
+    tasks += [asyncio.ensure_future(write()) for _ in range(upsert_concurrency)]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if task.exception() is not None:
+                raise task.exception()
+    finally:
+        # A failed stage leaves the others waiting on the queues
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return progress
+
+
+async def switch_alias(connector: QdrantConnector, alias: str, collection_name: str):
+    """
+    Point an alias at a collection, replacing the collection it pointed to in the same atomic operation,
+    so that clients using the alias never see it missing.
+    """
+    response = await connector.client.get_aliases()
+    operations = []
+    if any(existing.alias_name == alias for existing in response.aliases):
+        operations.append(models.DeleteAliasOperation(delete_alias=models.DeleteAlias(alias_name=alias)))
+    operations.append(
+        models.CreateAliasOperation(create_alias=models.CreateAlias(collection_name=collection_name, alias_name=alias))
+    )
+    await connector.client.update_collection_aliases(change_aliases_operations=operations)
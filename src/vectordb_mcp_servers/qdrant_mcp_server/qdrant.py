@@ -1,11 +1,82 @@
+import asyncio
+import fnmatch
+import hashlib
+import json
 import logging
+import time
 import uuid
 import typing as T
 
+import numpy as np
 from qdrant_client import AsyncQdrantClient, models
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse
 
-from src.vectordb_mcp_servers.base_provider.base_mcp import Entry
+from src.vectordb_mcp_servers.base_provider.admission import ConcurrencyGovernor
+from src.vectordb_mcp_servers.base_provider.base_mcp import Entry, MetadataFilter
+from src.vectordb_mcp_servers.base_provider.metrics import Metrics
+from src.vectordb_mcp_servers.base_provider.search_cache import SearchResultCache
+from src.vectordb_mcp_servers.base_provider.write_buffer import WriteBehindBuffer
 from src.embeddings.base import EmbeddingProvider
+from src.embeddings.cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# How long the list of collections is reused to resolve collection patterns
+_COLLECTION_NAMES_TTL_S = 10.0
+
+# Namespace of the content-addressed point IDs
+_CONTENT_ID_NAMESPACE = uuid.UUID("6f0c3a52-7d0e-4c1b-9a57-2f4e8b1d3c90")
+
+
+def content_point_id(entry: Entry) -> str:
+    """
+    Derive a point ID from the normalized content and the metadata of an entry,
+    so that storing the same entry twice addresses the same point.
+    """
+    metadata = json.dumps(entry.metadata or {}, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(f"{normalize_query(entry.content)}\x00{metadata}".encode()).hexdigest()
+    return str(uuid.uuid5(_CONTENT_ID_NAMESPACE, digest))
+
+
+def to_qdrant_filter(filters: T.Optional[T.List[MetadataFilter]]) -> T.Optional[models.Filter]:
+    """
+    Translate metadata filters into a Qdrant filter on the metadata payload, all filters must match.
+    """
+    if not filters:
+        return None
+    conditions = []
+    for metadata_filter in filters:
+        key = f"metadata.{metadata_filter.key}"
+        if metadata_filter.eq is not None:
+            conditions.append(models.FieldCondition(key=key, match=models.MatchValue(value=metadata_filter.eq)))
+        if metadata_filter.any is not None:
+            conditions.append(models.FieldCondition(key=key, match=models.MatchAny(any=metadata_filter.any)))
+        bounds = {
+            bound: getattr(metadata_filter, bound)
+            for bound in ("gt", "gte", "lt", "lte") if getattr(metadata_filter, bound) is not None
+        }
+        if bounds:
+            conditions.append(models.FieldCondition(key=key, range=models.Range(**bounds)))
+    return models.Filter(must=conditions)
+
+
+def _filters_key(filters: T.Optional[T.List[MetadataFilter]]) -> T.Optional[str]:
+    """
+    Canonical form of metadata filters, used in the keys of cached searches.
+    """
+    if not filters:
+        return None
+    return json.dumps([metadata_filter.model_dump(exclude_none=True) for metadata_filter in filters], sort_keys=True)
+
+
+def _is_not_found(error: Exception) -> bool:
+    """
+    Check if an error raised by the Qdrant client means that the collection does not exist.
+    Remote servers answer with a 404, while the local mode raises a ValueError.
+    """
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 404
+    return isinstance(error, ValueError) and "not found" in str(error).lower()
 
 
 class QdrantConnector:
@@ -16,6 +87,28 @@ class QdrantConnector:
     :param collection_name: The name of the default collection to use. If not provided, each tool will required collection name to be provided.
     :param embedding_provider: The embedding provider to use
     :param qdrant_local_path: The path to storage directory for the Qdrant client, if local model is used.
+    :param search_cache: The cache for search results. Optional. If not provided, every search queries Qdrant.
+    :param vector_params: Parameters of the vectors of created collections, such as distance, on_disk,
+                          hnsw_config or quantization_config. Optional. Defaults to in-RAM COSINE vectors.
+    :param on_disk_payload: Whether created collections store their payload on disk. Optional.
+    :param search_params: Parameters of the searches, such as hnsw_ef or quantization rescoring. Optional.
+    :param metrics: The metrics recording the time spent in each stage. Optional.
+    :param metadata_keys: The metadata keys to fetch with the results. Optional. If not provided, all metadata is fetched.
+    :param content_addressed_ids: Whether to derive point IDs from the content and metadata of entries,
+                                  so that entries already stored are neither embedded nor written again.
+    :param write_behind: Whether stores are queued and written in batches in the background.
+    :param write_queue_size: The maximum number of queued stores. Further stores wait for room.
+    :param write_batch_size: The maximum number of entries written in a single upsert.
+    :param write_flush_interval_ms: How long queued stores wait for more stores to join their batch.
+    :param write_max_retries: How many times a failed background upsert is tried again before its stores are lost.
+    :param write_retry_backoff_ms: The delay before the first retry of a background upsert, doubled for each following one.
+    :param read_your_writes: Whether searches first write the stores queued for their collection,
+                             and background upserts wait until the points are searchable.
+    :param payload_indexes: Metadata keys to index, mapped to the type of their index, so that filtered searches stay fast.
+                            Optional. Indexes are created with the collections, and added to existing collections
+                            at startup for the default collection, or when first written to.
+    :param read_only: Whether the connector must never write, so that a read-only API key works. Payload indexes are not created.
+    :param governor: The admission control that embedding calls and Qdrant reads and writes run through. Optional.
     """
 
     def __init__(
@@ -24,16 +117,88 @@ class QdrantConnector:
             qdrant_api_key: T.Optional[str],
             collection_name: T.Optional[str],
             embedding_provider: EmbeddingProvider,
-            qdrant_local_path: T.Optional[str] = None
+            qdrant_local_path: T.Optional[str] = None,
+            search_cache: T.Optional[SearchResultCache] = None,
+            vector_params: T.Optional[T.Dict[str, T.Any]] = None,
+            on_disk_payload: T.Optional[bool] = None,
+            search_params: T.Optional[models.SearchParams] = None,
+            metrics: T.Optional[Metrics] = None,
+            metadata_keys: T.Optional[T.List[str]] = None,
+            content_addressed_ids: bool = False,
+            write_behind: bool = False,
+            write_queue_size: int = 1024,
+            write_batch_size: int = 64,
+            write_flush_interval_ms: float = 50.0,
+            write_max_retries: int = 3,
+            write_retry_backoff_ms: float = 100.0,
+            read_your_writes: bool = True,
+            payload_indexes: T.Optional[T.Dict[str, models.PayloadSchemaType]] = None,
+            governor: T.Optional[ConcurrencyGovernor] = None,
+            read_only: bool = False
     ) -> None:
         self._qdrant_url = qdrant_url.rstrip("/") if qdrant_url else None
         self._qdrant_api_key = qdrant_api_key
         self._default_collection_name = collection_name
         self._embedding_provider = embedding_provider
+        self._search_cache = search_cache
+        self._vector_params = {"distance": models.Distance.COSINE, **(vector_params or {})}
+        self._on_disk_payload = on_disk_payload
+        self._search_params = search_params
+        self._metrics = metrics or Metrics()
+        self._governor = governor or ConcurrencyGovernor()
+        self._content_addressed_ids = content_addressed_ids
+        self._read_your_writes = read_your_writes
+        self._payload_indexes = {f"metadata.{key}": schema for key, schema in (payload_indexes or {}).items()}
+        self._read_only = read_only
+        # Collections whose payload indexes were checked, and created if allowed
+        self._indexed_collections: T.Set[str] = set()
+        self._write_buffer = None
+        if write_behind:
+            self._write_buffer = WriteBehindBuffer(
+                self._write_buffered,
+                max_queue_size=write_queue_size,
+                max_batch_size=write_batch_size,
+                flush_interval_ms=write_flush_interval_ms,
+                max_retries=write_max_retries,
+                retry_backoff_ms=write_retry_backoff_ms,
+                metrics=self._metrics
+            )
+        # Only fetch the payload fields used to build entries
+        self._payload_fields = ["document", "metadata"]
+        if metadata_keys is not None:
+            self._payload_fields = ["document"] + [f"metadata.{key}" for key in metadata_keys]
+        # Known collections, mapped to the parameters of each of their named vectors
+        self._collection_vectors: T.Dict[str, T.Dict[str, models.VectorParams]] = {}
+        self._collection_lock = asyncio.Lock()
+        self._collection_names: T.Optional[T.Tuple[float, T.List[str]]] = None
         self._client = AsyncQdrantClient(
             location=self._qdrant_url, api_key=self._qdrant_api_key, path=qdrant_local_path
         )
     
+    @property
+    def client(self) -> AsyncQdrantClient:
+        """The Qdrant client, for maintenance tasks such as migrations"""
+        return self._client
+
+    @property
+    def embedding_provider(self) -> EmbeddingProvider:
+        return self._embedding_provider
+
+    async def get_vector_name(self, collection_name: str, create: bool = False) -> str:
+        """
+        Get the name of the vector of the embedding provider in a collection.
+        :param collection_name: The name of the collection.
+        :param create: Whether to create the collection if it does not exist.
+        :raises ValueError: If the collection does not exist and is not created, or has no vector for the embedding provider.
+        """
+        if create:
+            vectors = await self._ensure_collection_exists(collection_name)
+        else:
+            vectors = await self._describe_collection(collection_name)
+            if vectors is None:
+                raise ValueError(f"Collection {collection_name} does not exist")
+        return self._check_vector(collection_name, vectors)
+
     async def get_collection_names(self) -> T.List[str]:
         """
         Get the names of all collections in the Qdrant server.
@@ -43,74 +208,502 @@ class QdrantConnector:
         return [collection.name for collection in response.collections]
 
 
-    async def _ensure_collection_exists(self, collection_name: str):
+    async def initialize(self):
+        """
+        Load the state of the default collection, so that requests do not have to check it,
+        and add the missing payload indexes to it unless the connector is read-only.
+        """
+        if self._default_collection_name:
+            if await self._describe_collection(self._default_collection_name) is not None:
+                await self._ensure_payload_indexes(self._default_collection_name)
+
+    async def _describe_collection(self, collection_name: str) -> T.Optional[T.Dict[str, models.VectorParams]]:
+        """
+        Get the named vectors of a collection, asking Qdrant only if the collection is not known yet.
+        :param collection_name: The name of the collection.
+        :return: A mapping of vector names to vector parameters, or None if the collection does not exist.
+        """
+        if collection_name in self._collection_vectors:
+            return self._collection_vectors[collection_name]
+        try:
+            info = await self._client.get_collection(collection_name)
+        except (UnexpectedResponse, ValueError) as e:
+            if _is_not_found(e):
+                return None
+            raise
+        vectors = info.config.params.vectors
+        if isinstance(vectors, models.VectorParams):
+            vectors = {"": vectors}
+        self._collection_vectors[collection_name] = dict(vectors or {})
+        return self._collection_vectors[collection_name]
+
+    def _forget_collection(self, collection_name: str):
+        """
+        Drop the known state of a collection, after Qdrant reported that it does not exist.
+        """
+        self._collection_vectors.pop(collection_name, None)
+        self._indexed_collections.discard(collection_name)
+
+    def _check_vector(self, collection_name: str, vectors: T.Dict[str, models.VectorParams]) -> str:
+        """
+        Check that the collection has a vector matching the embedding provider.
+        :return: The name of the vector to use.
+        """
+        vector_name = self._embedding_provider.get_vector_name()
+        if vector_name not in vectors:
+            raise ValueError(
+                f"Collection {collection_name} has no vector named {vector_name}, "
+                f"available vectors: {', '.join(vectors) or 'none'}"
+            )
+        return vector_name
+
+    async def _ensure_collection_exists(self, collection_name: str) -> T.Dict[str, models.VectorParams]:
         """
         Ensure that the collection exists, creating it if necessary.
         :param collection_name: The name of the collection to ensure exists.
+        :return: A mapping of vector names to vector parameters of the collection.
         """
-        collection_exists = await self._client.collection_exists(collection_name)
-        if not collection_exists:
-            vector_size = self._embedding_provider.get_vector_size()
-            vector_name = self._embedding_provider.get_vector_name()
-            await self._client.create_collection(
-                collection_name=collection_name,
-                vectors_config={
-                    vector_name: models.VectorParams(
-                        size=vector_size,
-                        distance=models.Distance.COSINE
+        vectors = self._collection_vectors.get(collection_name)
+        if vectors is not None and collection_name in self._indexed_collections:
+            return vectors
+        async with self._collection_lock:
+            vectors = await self._describe_collection(collection_name)
+            if vectors is not None:
+                await self._ensure_payload_indexes(collection_name)
+            else:
+                vectors = {
+                    self._embedding_provider.get_vector_name(): models.VectorParams(
+                        size=self._embedding_provider.get_vector_size(),
+                        **self._vector_params
                     )
                 }
+                await self._client.create_collection(
+                    collection_name=collection_name,
+                    vectors_config=vectors,
+                    on_disk_payload=self._on_disk_payload
+                )
+                await self._create_payload_indexes(collection_name)
+                self._collection_vectors[collection_name] = vectors
+            return vectors
+
+    async def _ensure_payload_indexes(self, collection_name: str):
+        """
+        Add the configured payload indexes that an existing collection does not have yet, once per collection.
+        Read-only connectors never create them, since their API key may not allow it.
+        """
+        if collection_name in self._indexed_collections:
+            return
+        if not self._read_only and self._payload_indexes:
+            info = await self._client.get_collection(collection_name)
+            await self._create_payload_indexes(collection_name, existing=info.payload_schema or {})
+        self._indexed_collections.add(collection_name)
+
+    async def _create_payload_indexes(self, collection_name: str, existing: T.Collection[str] = ()):
+        """
+        Create the configured payload indexes that the collection does not have yet.
+        """
+        for field_name, field_schema in self._payload_indexes.items():
+            if field_name in existing:
+                continue
+            await self._client.create_payload_index(
+                collection_name=collection_name, field_name=field_name, field_schema=field_schema
             )
+        self._indexed_collections.add(collection_name)
     
-    async def store(self, entry: Entry, *, collection_name: T.Optional[str] = None):
+    async def store(self, entry: Entry, *, collection_name: T.Optional[str] = None) -> bool:
         """
         Store some information in the Qdrant collection, along with specified metadata.
+        In write-behind mode, the entry is queued and written in the background.
         :param entry: The entry to store in the Qdrant collection.
         :param collection_name: The name of the collection to store the information in.
                                 Optional. If not provided, default collection is used.
+        :return: False if the entry was already stored and has been skipped, True otherwise.
+        """
+        if self._write_buffer is not None:
+            collection_name = collection_name or self._default_collection_name
+            assert collection_name is not None
+            with self._metrics.stage("enqueue"):
+                await self._write_buffer.put(collection_name, entry)
+            return True
+        return await self.store_many([entry], collection_name=collection_name) == 1
+
+    async def _write_buffered(self, collection_name: str, entries: T.List[Entry]) -> int:
+        # Without read-your-writes nobody waits for the points, let Qdrant index them asynchronously
+        return await self.store_many(entries, collection_name=collection_name, wait=self._read_your_writes)
+
+    async def flush(self, collection_name: T.Optional[str] = None):
+        """
+        Write the stores queued in write-behind mode and wait until they are written.
+        :param collection_name: Only write the stores of this collection. Optional.
+        :raises WriteBehindError: If queued stores were lost since the last flush.
+        """
+        if self._write_buffer is not None:
+            await self._write_buffer.flush(collection_name)
+
+    async def close(self):
+        """
+        Write the queued stores and stop the background writer.
+        :raises WriteBehindError: If queued stores were lost since the last flush.
+        """
+        if self._write_buffer is not None:
+            await self._write_buffer.close()
+
+    async def _read_pending_writes(self, collection_name: str):
+        if self._read_your_writes and self._write_buffer is not None and self._write_buffer.pending(collection_name):
+            with self._metrics.stage("flush"):
+                # Lost stores are reported to whoever flushes or closes the connector, not to searches
+                await self._write_buffer.flush(collection_name, raise_errors=False)
+
+    async def store_many(
+        self, entries: T.List[Entry], *, collection_name: T.Optional[str] = None, wait: bool = True
+    ) -> int:
+        """
+        Store several entries in the Qdrant collection with a single embedding pass and a single upsert.
+        With content-addressed IDs, entries already in the collection, or repeated in the list, are skipped.
+        :param entries: The entries to store in the Qdrant collection.
+        :param collection_name: The name of the collection to store the information in.
+                                Optional. If not provided, default collection is used.
+        :param wait: Whether to wait until the points are indexed before returning.
+        :return: The number of entries written. The others were duplicates.
         """
         
         collection_name = collection_name or self._default_collection_name
         assert collection_name is not None
-        await self._ensure_collection_exists(collection_name)
+        with self._metrics.stage("collection_check"):
+            vectors = await self._ensure_collection_exists(collection_name)
+        vector_name = self._check_vector(collection_name, vectors)
 
-        embeddings = await self._embedding_provider.embed_documents([entry.content])
+        if self._content_addressed_ids:
+            # Later duplicates within the list collapse onto the first entry with the same ID
+            new_entries = {}
+            for entry in entries:
+                new_entries.setdefault(content_point_id(entry), entry)
+            with self._metrics.stage("dedup"):
+                existing = await self._existing_ids(collection_name, list(new_entries))
+            for point_id in existing:
+                new_entries.pop(point_id, None)
+        else:
+            new_entries = {uuid.uuid4().hex: entry for entry in entries}
+        if not new_entries:
+            return 0
 
-        vector_name = self._embedding_provider.get_vector_name()
-        payload = {"document": entry.content, "metadata": entry.metadata}
-        await self._client.upsert(
-            collection_name=collection_name,
-            points=[
-                models.PointStruct(
-                    id=uuid.uuid4().hex,
-                    vector={vector_name: embeddings[0]},
-                    payload=payload
+        with self._metrics.stage("embed"):
+            embeddings = await self._governor.run_embedding(
+                self._embedding_provider.embed_documents_array, [entry.content for entry in new_entries.values()]
+            )
+
+        # Point models only accept lists, convert the whole batch in a single call
+        points = [
+            models.PointStruct(
+                id=point_id,
+                vector={vector_name: vector},
+                payload={"document": entry.content, "metadata": entry.metadata}
+            )
+            for (point_id, entry), vector in zip(new_entries.items(), embeddings.tolist())
+        ]
+        try:
+            with self._metrics.stage("upsert"):
+                await self._governor.run_backend(
+                    self._client.upsert, collection_name=collection_name, points=points, wait=wait
                 )
-            ]
-        )
+        except (UnexpectedResponse, ValueError) as e:
+            if not _is_not_found(e):
+                raise
+            # The collection was deleted since it was last seen, create it again
+            self._forget_collection(collection_name)
+            await self._ensure_collection_exists(collection_name)
+            await self._governor.run_backend(
+                self._client.upsert, collection_name=collection_name, points=points, wait=wait
+            )
+        if self._search_cache is not None:
+            self._search_cache.invalidate(collection_name)
+        return len(points)
+
+    async def _existing_ids(self, collection_name: str, point_ids: T.List[str]) -> T.Set[str]:
+        """
+        Get which of the given point IDs are already stored in the collection, in a single request.
+        """
+        try:
+            records = await self._governor.run_backend(
+                self._client.retrieve,
+                collection_name=collection_name, ids=point_ids, with_payload=False, with_vectors=False
+            )
+        except (UnexpectedResponse, ValueError) as e:
+            if not _is_not_found(e):
+                raise
+            # The collection was deleted since it was last seen, it is created again on upsert
+            return set()
+        return {str(record.id) for record in records}
     
-    async def search(self, query: str, *, collection_name: T.Optional[str] = None, limit: int = 10) -> T.List[Entry]:
+    async def search(
+        self,
+        query: str,
+        *,
+        collection_name: T.Optional[str] = None,
+        limit: int = 10,
+        filters: T.Optional[T.List[MetadataFilter]] = None
+    ) -> T.List[Entry]:
         """
         Find points in the Qdrant collection. If there are no entries found, an empty list is returned.
         :param query: The query to use for the search.
         :param collection_name: The name of the collection to search in. 
                                 Optional. If not provided, default collection is used.
         :param limit: The maximum number of entries to return.
+        :param filters: Conditions on the metadata that all entries found must match. Optional.
         :return: A list of entries found
         """
         
         collection_name = collection_name or self._default_collection_name
-        collection_exists = await self._client.collection_exists(collection_name)
-        if not collection_exists: return []
+        await self._read_pending_writes(collection_name)
+        if self._search_cache is not None:
+            cache_key = (query, limit, _filters_key(filters))
+            cached_entries = self._search_cache.get(collection_name, cache_key)
+            if cached_entries is not None:
+                return cached_entries
+            cache_version = self._search_cache.version(collection_name)
 
-        query_vector = await self._embedding_provider.embed_query(query)
-        vector_name = self._embedding_provider.get_vector_name()
+        with self._metrics.stage("collection_check"):
+            vectors = await self._describe_collection(collection_name)
+        if vectors is None: return []
+        vector_name = self._check_vector(collection_name, vectors)
+
+        with self._metrics.stage("embed"):
+            query_vectors = await self._governor.run_embedding(self._embedding_provider.embed_queries_array, [query])
+
+        try:
+            with self._metrics.stage("query"):
+                # The client takes the float32 array as is
+                search_results = await self._governor.run_backend(
+                    self._client.query_points,
+                    collection_name=collection_name,
+                    query=query_vectors[0],
+                    using=vector_name,
+                    limit=limit,
+                    query_filter=to_qdrant_filter(filters),
+                    search_params=self._search_params,
+                    with_payload=self._payload_fields
+                )
+        except (UnexpectedResponse, ValueError) as e:
+            if not _is_not_found(e):
+                raise
+            self._forget_collection(collection_name)
+            return []
+
+        entries = self._to_entries(search_results.points)
+        if self._search_cache is not None:
+            self._search_cache.put(collection_name, cache_key, entries, version=cache_version)
+        return entries
+
+    async def search_batch(
+        self,
+        queries: T.List[str],
+        *,
+        collection_name: T.Optional[str] = None,
+        limit: int = 10,
+        filters: T.Optional[T.List[MetadataFilter]] = None
+    ) -> T.List[T.List[Entry]]:
+        """
+        Run several searches in the Qdrant collection with a single embedding pass and a single request.
+        :param queries: The queries to use for the search.
+        :param collection_name: The name of the collection to search in.
+                                Optional. If not provided, default collection is used.
+        :param limit: The maximum number of entries to return for each query.
+        :param filters: Conditions on the metadata that all entries found must match, for every query. Optional.
+        :return: A list of entries found for each query, in the order of the queries.
+        """
+
+        collection_name = collection_name or self._default_collection_name
+        filters_key = _filters_key(filters)
+        await self._read_pending_writes(collection_name)
+        results: T.List[T.Optional[T.List[Entry]]] = [None] * len(queries)
+        if self._search_cache is not None:
+            cache_version = self._search_cache.version(collection_name)
+            for index, query in enumerate(queries):
+                results[index] = self._search_cache.get(collection_name, (query, limit, filters_key))
+        missing = [index for index, entries in enumerate(results) if entries is None]
+        if not missing:
+            return results
+
+        with self._metrics.stage("collection_check"):
+            vectors = await self._describe_collection(collection_name)
+        if vectors is None: return [[] for _ in queries]
+        vector_name = self._check_vector(collection_name, vectors)
 
-        search_results = await self._client.query_points(
-            collection_name=collection_name,
-            query=query_vector,
-            using=vector_name,
-            limit=limit
+        with self._metrics.stage("embed"):
+            query_vectors = await self._governor.run_embedding(
+                self._embedding_provider.embed_queries_array, [queries[index] for index in missing]
+            )
+
+        query_filter = to_qdrant_filter(filters)
+        try:
+            with self._metrics.stage("query"):
+                responses = await self._governor.run_backend(
+                    self._client.query_batch_points,
+                    collection_name=collection_name,
+                    requests=[
+                        models.QueryRequest(
+                            query=query_vector, using=vector_name, limit=limit, filter=query_filter,
+                            params=self._search_params, with_payload=self._payload_fields
+                        )
+                        for query_vector in query_vectors.tolist()
+                    ]
+                )
+        except (UnexpectedResponse, ValueError) as e:
+            if not _is_not_found(e):
+                raise
+            self._forget_collection(collection_name)
+            return [[] for _ in queries]
+
+        for index, response in zip(missing, responses):
+            results[index] = self._to_entries(response.points)
+            if self._search_cache is not None:
+                self._search_cache.put(collection_name, (queries[index], limit, filters_key), results[index], version=cache_version)
+        return results
+
+    @staticmethod
+    def _to_entries(points: T.List[models.ScoredPoint]) -> T.List[Entry]:
+        return [Entry(content=point.payload["document"], metadata=point.payload.get("metadata")) for point in points]
+
+    async def _resolve_collections(self, collections: T.List[str]) -> T.List[str]:
+        """
+        Expand the shell-style patterns of a list of collections, such as memories-2024-*, into collection names.
+        The list of existing collections is only fetched for patterns, and reused for a few seconds.
+        """
+        names = []
+        for collection in collections:
+            if not any(char in collection for char in "*?["):
+                names.append(collection)
+                continue
+            if self._collection_names is None or time.monotonic() - self._collection_names[0] > _COLLECTION_NAMES_TTL_S:
+                self._collection_names = (time.monotonic(), await self.get_collection_names())
+            names.extend(fnmatch.filter(self._collection_names[1], collection))
+        return list(dict.fromkeys(names))
+
+    async def search_collections(
+        self,
+        query: str,
+        collections: T.List[str],
+        *,
+        limit: int = 10,
+        filters: T.Optional[T.List[MetadataFilter]] = None,
+        timeout_s: T.Optional[float] = None
+    ) -> T.List[Entry]:
+        """
+        Search several collections with a single embedding pass, querying them concurrently,
+        and merge the results by score. Collections that do not exist, do not answer in time,
+        fail, or have no vector for the embedding provider are skipped.
+        :param query: The query to use for the search.
+        :param collections: The names of the collections, or shell-style patterns of names.
+        :param limit: The maximum number of entries to return over all collections.
+        :param filters: Conditions on the metadata that all entries found must match. Optional.
+        :param timeout_s: How long to wait for each collection. Optional. If not provided, wait for all of them.
+        :return: The best entries found over all collections.
+        :raises ValueError: If the collections that returned results compare vectors with different distances.
+        """
+        results = await self.search_collections_batch(
+            [query], collections, limit=limit, filters=filters, timeout_s=timeout_s
+        )
+        return results[0]
+
+    async def search_collections_batch(
+        self,
+        queries: T.List[str],
+        collections: T.List[str],
+        *,
+        limit: int = 10,
+        filters: T.Optional[T.List[MetadataFilter]] = None,
+        timeout_s: T.Optional[float] = None
+    ) -> T.List[T.List[Entry]]:
+        """
+        Run several searches over several collections with a single embedding pass, and a single
+        request per collection, sent concurrently. See `search_collections`.
+        :param queries: The queries to use for the search.
+        :param collections: The names of the collections, or shell-style patterns of names.
+        :param limit: The maximum number of entries to return for each query, over all collections.
+        :param filters: Conditions on the metadata that all entries found must match, for every query. Optional.
+        :param timeout_s: How long to wait for each collection. Optional. If not provided, wait for all of them.
+        :return: The best entries found over all collections for each query, in the order of the queries.
+        :raises ValueError: If the collections that returned results compare vectors with different distances.
+        """
+        if not queries:
+            return []
+        collection_names = await self._resolve_collections(collections)
+        if not collection_names:
+            return [[] for _ in queries]
+        for collection_name in collection_names:
+            await self._read_pending_writes(collection_name)
+
+        with self._metrics.stage("embed"):
+            query_vectors = await self._governor.run_embedding(self._embedding_provider.embed_queries_array, queries)
+        return await self._search_collection_vectors(
+            query_vectors, collection_names, limit=limit, filters=filters, timeout_s=timeout_s
         )
 
-        return [Entry(content=result.payload["document"], metadata=result.payload.get("metadata")) for result in search_results.points]
\ No newline at end of file
+    async def _search_collection_vectors(
+        self,
+        query_vectors: np.ndarray,
+        collection_names: T.List[str],
+        *,
+        limit: int,
+        filters: T.Optional[T.List[MetadataFilter]],
+        timeout_s: T.Optional[float]
+    ) -> T.List[T.List[Entry]]:
+        """
+        Search collections with query vectors already embedded, and merge the results of each query by score.
+        """
+        query_filter = to_qdrant_filter(filters)
+        no_points = [[] for _ in query_vectors]
+
+        async def query_collection(collection_name: str) -> T.Tuple[T.Optional[models.Distance], T.List[T.List[models.ScoredPoint]]]:
+            vectors = await self._describe_collection(collection_name)
+            if vectors is None:
+                return None, no_points
+            vector_name = self._check_vector(collection_name, vectors)
+            try:
+                responses = await self._governor.run_backend(
+                    self._client.query_batch_points,
+                    collection_name=collection_name,
+                    requests=[
+                        models.QueryRequest(
+                            query=query_vector, using=vector_name, limit=limit, filter=query_filter,
+                            params=self._search_params, with_payload=self._payload_fields
+                        )
+                        for query_vector in query_vectors.tolist()
+                    ]
+                )
+            except (UnexpectedResponse, ValueError) as e:
+                if not _is_not_found(e):
+                    raise
+                self._forget_collection(collection_name)
+                return None, no_points
+            return vectors[vector_name].distance, [response.points for response in responses]
+
+        async def query_or_skip(collection_name: str) -> T.Tuple[T.Optional[models.Distance], T.List[T.List[models.ScoredPoint]]]:
+            # A single collection that is slow, unreachable or built for another model must not fail the whole search
+            try:
+                return await asyncio.wait_for(query_collection(collection_name), timeout_s)
+            except asyncio.TimeoutError:
+                logger.warning("Search in collection %s timed out after %.0f ms, skipping it", collection_name, timeout_s * 1000)
+            except (UnexpectedResponse, ResponseHandlingException, ValueError, OSError) as e:
+                logger.warning("Search in collection %s failed, skipping it: %s", collection_name, e)
+            return None, no_points
+
+        with self._metrics.stage("query"):
+            responses = await asyncio.gather(*(query_or_skip(name) for name in collection_names))
+
+        # Scores of different distances are not comparable, and distances are better when smaller
+        distances = {distance for distance, points in responses if any(points)}
+        if len(distances) > 1:
+            raise ValueError(
+                "Cannot merge the results of collections with different distances: " + ", ".join(
+                    f"{name} ({distance.value})"
+                    for name, (distance, points) in zip(collection_names, responses) if any(points)
+                )
+            )
+        smaller_is_better = bool(distances & {models.Distance.EUCLID, models.Distance.MANHATTAN})
+        results = []
+        for index in range(len(query_vectors)):
+            points = [point for _, points in responses for point in points[index]]
+            points.sort(key=lambda point: point.score, reverse=not smaller_is_better)
+            results.append(self._to_entries(points[:limit]))
+        return results
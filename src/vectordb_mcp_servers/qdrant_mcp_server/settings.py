@@ -1,11 +1,19 @@
 import typing as T
 from pydantic import Field
 from pydantic_settings import BaseSettings
+from qdrant_client import models
+
+from src.vectordb_mcp_servers.base_provider.settings import FindOutputSettings
 
 DEFAULT_TOOL_STORE_DESCRIPTION = (
     "Keep the memory for later use, when you are asked to remember something."
 )
 
+DEFAULT_TOOL_STORE_BATCH_DESCRIPTION = (
+    "Keep several memories for later use in a single call. Use this tool instead of "
+    "multiple qdrant-store calls when you need to remember many things at once."
+)
+
 DEFAULT_TOOL_FIND_DESCRIPTION = (
     "Look up memories in Qdrant. Use this tool when you need to: \n"
     " - Find memories by their content \n"
@@ -13,7 +21,12 @@ DEFAULT_TOOL_FIND_DESCRIPTION = (
     " - Get some personal information about the user \n"
 )
 
-class QdrantToolSettings(BaseSettings):
+DEFAULT_TOOL_FIND_BATCH_DESCRIPTION = (
+    "Look up memories in Qdrant for several queries at once. Use this tool instead of "
+    "multiple qdrant-find calls when you need to run related searches. Results are grouped per query."
+)
+
+class QdrantToolSettings(FindOutputSettings):
     """
     Configuration for all the tools
     """
@@ -21,10 +34,18 @@ class QdrantToolSettings(BaseSettings):
         default=DEFAULT_TOOL_STORE_DESCRIPTION,
         validation_alias="TOOL_STORE_DESCRIPTION"
     )
+    tool_store_batch_description: str = Field(
+        default=DEFAULT_TOOL_STORE_BATCH_DESCRIPTION,
+        validation_alias="TOOL_STORE_BATCH_DESCRIPTION"
+    )
     tool_find_description: str = Field(
         default=DEFAULT_TOOL_FIND_DESCRIPTION,
         validation_alias="TOOL_FIND_DESCRIPTION"
     )
+    tool_find_batch_description: str = Field(
+        default=DEFAULT_TOOL_FIND_BATCH_DESCRIPTION,
+        validation_alias="TOOL_FIND_BATCH_DESCRIPTION"
+    )
 
 
 class QdrantSettings(BaseSettings):
@@ -37,4 +58,95 @@ class QdrantSettings(BaseSettings):
     location: T.Optional[str] = Field(default=None, validation_alias="QDRANT_URL")
     api_key: T.Optional[str] = Field(default=None, validation_alias="QDRANT_API_KEY")
     search_limit: int = Field(default=10, validation_alias="QDRANT_SEARCH_LIMIT")
-    read_only: bool = Field(default=False, validation_alias="QDRANT_READ_ONLY")
\ No newline at end of file
+    read_only: bool = Field(default=False, validation_alias="QDRANT_READ_ONLY")
+    content_addressed_ids: bool = Field(default=False, validation_alias="QDRANT_CONTENT_ADDRESSED_IDS")
+    write_behind_enabled: bool = Field(default=False, validation_alias="QDRANT_WRITE_BEHIND_ENABLED")
+    write_behind_queue_size: int = Field(default=1024, validation_alias="QDRANT_WRITE_BEHIND_QUEUE_SIZE")
+    write_behind_batch_size: int = Field(default=64, validation_alias="QDRANT_WRITE_BEHIND_BATCH_SIZE")
+    write_behind_interval_ms: float = Field(default=50.0, validation_alias="QDRANT_WRITE_BEHIND_INTERVAL_MS")
+    write_behind_max_retries: int = Field(default=3, validation_alias="QDRANT_WRITE_BEHIND_MAX_RETRIES")
+    write_behind_retry_backoff_ms: float = Field(default=100.0, validation_alias="QDRANT_WRITE_BEHIND_RETRY_BACKOFF_MS")
+    read_your_writes: bool = Field(default=True, validation_alias="QDRANT_READ_YOUR_WRITES")
+    ingest_chunk_size: int = Field(default=256, validation_alias="QDRANT_INGEST_CHUNK_SIZE")
+    ingest_concurrency: int = Field(default=4, validation_alias="QDRANT_INGEST_CONCURRENCY")
+    # Collections searched by the find tools instead of the default one, as names or patterns such as "memories-*"
+    search_collections: T.Optional[T.List[str]] = Field(default=None, validation_alias="QDRANT_SEARCH_COLLECTIONS")
+    search_collection_timeout_ms: T.Optional[float] = Field(default=2000.0, validation_alias="QDRANT_SEARCH_COLLECTION_TIMEOUT_MS")
+    # Metadata keys to index, as "key" for a keyword index or "key:type", such as "year:integer"
+    indexed_metadata_keys: T.Optional[T.List[str]] = Field(default=None, validation_alias="QDRANT_INDEXED_METADATA_KEYS")
+    search_cache_enabled: bool = Field(default=False, validation_alias="QDRANT_SEARCH_CACHE_ENABLED")
+    search_cache_max_entries: int = Field(default=1024, validation_alias="QDRANT_SEARCH_CACHE_MAX_ENTRIES")
+    search_cache_max_bytes: T.Optional[int] = Field(default=64 * 1024 * 1024, validation_alias="QDRANT_SEARCH_CACHE_MAX_BYTES")
+    search_cache_ttl_seconds: T.Optional[float] = Field(default=None, validation_alias="QDRANT_SEARCH_CACHE_TTL_SECONDS")
+    distance: T.Literal["Cosine", "Euclid", "Dot", "Manhattan"] = Field(default="Cosine", validation_alias="QDRANT_DISTANCE")
+    hnsw_m: T.Optional[int] = Field(default=None, validation_alias="QDRANT_HNSW_M")
+    hnsw_ef_construct: T.Optional[int] = Field(default=None, validation_alias="QDRANT_HNSW_EF_CONSTRUCT")
+    on_disk_vectors: T.Optional[bool] = Field(default=None, validation_alias="QDRANT_ON_DISK_VECTORS")
+    on_disk_payload: T.Optional[bool] = Field(default=None, validation_alias="QDRANT_ON_DISK_PAYLOAD")
+    quantization: T.Literal["none", "scalar", "product", "binary"] = Field(default="none", validation_alias="QDRANT_QUANTIZATION")
+    quantization_always_ram: T.Optional[bool] = Field(default=True, validation_alias="QDRANT_QUANTIZATION_ALWAYS_RAM")
+    quantization_quantile: T.Optional[float] = Field(default=None, validation_alias="QDRANT_QUANTIZATION_QUANTILE")
+    quantization_compression: T.Literal["x4", "x8", "x16", "x32", "x64"] = Field(default="x16", validation_alias="QDRANT_QUANTIZATION_COMPRESSION")
+    search_hnsw_ef: T.Optional[int] = Field(default=None, validation_alias="QDRANT_SEARCH_HNSW_EF")
+    search_rescore: T.Optional[bool] = Field(default=None, validation_alias="QDRANT_SEARCH_RESCORE")
+    search_oversampling: T.Optional[float] = Field(default=None, validation_alias="QDRANT_SEARCH_OVERSAMPLING")
+
+    def vector_params(self) -> T.Dict[str, T.Any]:
+        """
+        Parameters of the vectors of the collections created by the connector, besides their size.
+        """
+        hnsw_config = None
+        if self.hnsw_m is not None or self.hnsw_ef_construct is not None:
+            hnsw_config = models.HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+        quantization_config = None
+        if self.quantization == "scalar":
+            quantization_config = models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=self.quantization_quantile,
+                    always_ram=self.quantization_always_ram
+                )
+            )
+        elif self.quantization == "product":
+            quantization_config = models.ProductQuantization(
+                product=models.ProductQuantizationConfig(
+                    compression=models.CompressionRatio(self.quantization_compression),
+                    always_ram=self.quantization_always_ram
+                )
+            )
+        elif self.quantization == "binary":
+            quantization_config = models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=self.quantization_always_ram)
+            )
+
+        return {
+            "distance": models.Distance(self.distance),
+            "hnsw_config": hnsw_config,
+            "quantization_config": quantization_config,
+            "on_disk": self.on_disk_vectors
+        }
+
+    def search_params(self) -> T.Optional[models.SearchParams]:
+        """
+        Parameters of the searches, matching the way collections are created.
+        """
+        quantization = None
+        if self.quantization != "none" and (self.search_rescore is not None or self.search_oversampling is not None):
+            quantization = models.QuantizationSearchParams(
+                rescore=self.search_rescore,
+                oversampling=self.search_oversampling
+            )
+        if self.search_hnsw_ef is None and quantization is None:
+            return None
+        return models.SearchParams(hnsw_ef=self.search_hnsw_ef, quantization=quantization)
+
+    def payload_indexes(self) -> T.Dict[str, models.PayloadSchemaType]:
+        """
+        Payload indexes to create for the metadata keys, mapped to the type of each index.
+        """
+        indexes = {}
+        for indexed_key in self.indexed_metadata_keys or []:
+            key, _, schema = indexed_key.partition(":")
+            indexes[key] = models.PayloadSchemaType(schema or "keyword")
+        return indexes
\ No newline at end of file
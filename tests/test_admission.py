@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from src.vectordb_mcp_servers.base_provider.admission import (
+    AdaptiveLimiter, ConcurrencyGovernor, DeadlineExceededError, OverloadedError
+)
+
+
+async def hold(event: asyncio.Event) -> str:
+    await event.wait()
+    return "done"
+
+
+def test_queue_overflow_is_refused():
+    async def run():
+        limiter = AdaptiveLimiter("backend", max_limit=1, max_queue=1)
+        release = asyncio.Event()
+        running = asyncio.ensure_future(limiter.run(hold, release))
+        waiting = asyncio.ensure_future(limiter.run(hold, release))
+        await asyncio.sleep(0)
+        with pytest.raises(OverloadedError):
+            await limiter.run(hold, release)
+        assert limiter.get_stats() == {"limit": 1, "in_flight": 1, "waiting": 1, "rejected": 1}
+        release.set()
+        assert await asyncio.gather(running, waiting) == ["done", "done"]
+        assert limiter.get_stats()["in_flight"] == 0
+
+    asyncio.run(run())
+
+
+def test_deadline_is_enforced():
+    async def run():
+        governor = ConcurrencyGovernor(backend_concurrency=1, call_timeout_ms=50)
+        release = asyncio.Event()
+        with pytest.raises(DeadlineExceededError):
+            await governor.run_call("find", governor.run_backend, hold, release)
+        # The abandoned call keeps its slot until its work is done
+        assert governor.get_stats()["backend"]["in_flight"] == 1
+        release.set()
+        await asyncio.sleep(0.01)
+        assert governor.get_stats()["backend"]["in_flight"] == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_does_not_break_the_queue():
+    async def run():
+        limiter = AdaptiveLimiter("backend", max_limit=1, max_queue=4)
+        first, second = asyncio.Event(), asyncio.Event()
+        running = asyncio.ensure_future(limiter.run(hold, first))
+        waiting = asyncio.ensure_future(limiter.run(hold, second))
+        await asyncio.sleep(0)
+        first.set()
+        # The running call finishes in this iteration, and releases its slot in the next one,
+        # where the cancelled waiter is still queued
+        await asyncio.sleep(0)
+        waiting.cancel()
+        await running
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert limiter.get_stats()["in_flight"] == 0
+        assert limiter.get_stats()["waiting"] == 0
+        second.set()
+        assert await limiter.run(hold, second) == "done"
+
+    asyncio.run(run())
+
+
+def test_slot_handed_over_to_a_cancelled_waiter_is_passed_on():
+    async def run():
+        limiter = AdaptiveLimiter("backend", max_limit=1, max_queue=4)
+        release = asyncio.Event()
+        running = asyncio.ensure_future(limiter.run(hold, release))
+        cancelled = asyncio.ensure_future(limiter.run(hold, release))
+        last = asyncio.ensure_future(limiter.run(hold, release))
+        await asyncio.sleep(0)
+        release.set()
+        await running
+        # The slot was handed to the first waiter, which is cancelled before it runs
+        cancelled.cancel()
+        assert await last == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        assert limiter.get_stats()["in_flight"] == 0
+
+    asyncio.run(run())
+
+
+def test_deadline_under_overload_raises_deadline_error():
+    async def run():
+        governor = ConcurrencyGovernor(backend_concurrency=1, call_timeout_ms=20)
+        release = asyncio.Event()
+        blocker = asyncio.ensure_future(governor.run_backend(hold, release))
+        await asyncio.sleep(0)
+
+        async def call():
+            return await governor.run_call("find", governor.run_backend, hold, release)
+
+        results = await asyncio.gather(*(call() for _ in range(10)), return_exceptions=True)
+        assert all(isinstance(result, DeadlineExceededError) for result in results)
+        release.set()
+        await blocker
+        assert governor.get_stats()["backend"] == {"limit": 1, "in_flight": 0, "waiting": 0, "rejected": 0}
+
+    asyncio.run(run())
+
+
+def test_limit_shrinks_on_slow_calls_and_grows_back():
+    async def run():
+        limiter = AdaptiveLimiter("embedding", max_limit=10, target_latency_ms=20, backoff=0.5)
+
+        async def call(seconds: float):
+            await asyncio.sleep(seconds)
+
+        await asyncio.gather(*(limiter.run(call, 0.05) for _ in range(10)))
+        # Slow calls finishing together only back off once per target latency
+        assert limiter.get_stats()["limit"] == 5
+        await asyncio.sleep(0.03)
+        await limiter.run(call, 0.05)
+        assert limiter.get_stats()["limit"] == 2
+        for _ in range(100):
+            await limiter.run(call, 0)
+        assert limiter.get_stats()["limit"] == 10
+
+    asyncio.run(run())
@@ -0,0 +1,153 @@
+import asyncio
+import time
+
+import pytest
+
+from benchmarks.fake_embedding import DeterministicEmbeddingProvider
+from benchmarks.opensearch_stub import OpenSearchStub
+from src.vectordb_mcp_servers.aoss.aoss_connector import AOSSConnector, BulkIndexError
+from src.vectordb_mcp_servers.base_provider.base_mcp import Entry
+
+INDEX_NAME = "memories"
+VECTOR_SIZE = 16
+
+
+@pytest.fixture
+def embedding_provider():
+    return DeterministicEmbeddingProvider(vector_size=VECTOR_SIZE)
+
+
+def start_stub(embedding_provider: DeterministicEmbeddingProvider, latency_ms: float = 0.0) -> OpenSearchStub:
+    stub = OpenSearchStub(INDEX_NAME, VECTOR_SIZE, latency_ms=latency_ms).start()
+    texts = [f"document {i}" for i in range(20)]
+    stub.add_documents([
+        {"text": text, "metadata": {"i": i}, "embedding": embedding}
+        for i, (text, embedding) in enumerate(zip(texts, embedding_provider._embed_all(texts).tolist()))
+    ])
+    return stub
+
+
+def make_connector(stub: OpenSearchStub, embedding_provider: DeterministicEmbeddingProvider, **kwargs) -> AOSSConnector:
+    return AOSSConnector(
+        host_url=stub.url,
+        aws_region="us-east-1",
+        index_name=INDEX_NAME,
+        embedding_provider=embedding_provider,
+        use_sigv4=False,
+        **kwargs
+    )
+
+
+def test_concurrent_searches_overlap(embedding_provider):
+    latency_ms = 300
+    stub = start_stub(embedding_provider, latency_ms=latency_ms)
+    try:
+        connector = make_connector(stub, embedding_provider)
+
+        async def run() -> float:
+            await connector.initialize()
+            start = time.perf_counter()
+            results = await asyncio.gather(*(connector.search(f"document {i}", limit=3) for i in range(8)))
+            elapsed = time.perf_counter() - start
+            assert all(len(entries) == 3 for entries in results)
+            return elapsed
+
+        elapsed = asyncio.run(run())
+    finally:
+        stub.stop()
+    # Serialized searches would take 8 latencies
+    assert elapsed < 2 * latency_ms / 1000
+
+
+@pytest.fixture
+def stub(embedding_provider):
+    stub = start_stub(embedding_provider)
+    yield stub
+    stub.stop()
+
+
+def store(connector: AOSSConnector, count: int) -> int:
+    async def run() -> int:
+        await connector.initialize()
+        return await connector.store_many([Entry(content=f"new document {i}", metadata={"i": i}) for i in range(count)])
+    return asyncio.run(run())
+
+
+def test_bulk_retries_throttled_requests(stub, embedding_provider):
+    stub.throttled_requests = 2
+    connector = make_connector(stub, embedding_provider, bulk_retry_backoff_ms=1)
+    assert store(connector, 5) == 5
+    assert stub.bulk_requests == 3
+    assert stub.count() == 25
+
+
+def test_bulk_retries_throttled_documents(stub, embedding_provider):
+    stub.throttled_items = 3
+    connector = make_connector(stub, embedding_provider, bulk_retry_backoff_ms=1)
+    assert store(connector, 5) == 5
+    assert stub.bulk_requests == 2
+    # Only the throttled documents are sent again
+    assert stub.bulk_request_bytes[1] < stub.bulk_request_bytes[0]
+    assert stub.count() == 25
+
+
+def test_bulk_skips_rejected_documents(stub, embedding_provider):
+    stub.rejected_items = 2
+    connector = make_connector(stub, embedding_provider, bulk_retry_backoff_ms=1)
+    assert store(connector, 5) == 3
+    assert stub.bulk_requests == 1
+    assert stub.count() == 23
+
+
+def test_bulk_splits_requests_by_size(stub, embedding_provider):
+    bulk_max_bytes = 1000
+    connector = make_connector(stub, embedding_provider, bulk_max_bytes=bulk_max_bytes)
+    assert store(connector, 10) == 10
+    assert stub.bulk_requests > 1
+    assert all(size <= bulk_max_bytes for size in stub.bulk_request_bytes)
+    assert stub.count() == 30
+
+
+def test_bulk_fails_after_max_retries(stub, embedding_provider):
+    stub.throttled_requests = 100
+    connector = make_connector(stub, embedding_provider, bulk_max_retries=2, bulk_retry_backoff_ms=1)
+    with pytest.raises(RuntimeError, match="after 2 retries"):
+        store(connector, 5)
+    assert stub.bulk_requests == 3
+    assert stub.count() == 20
+
+
+def test_failed_chunk_reports_documents_indexed_by_the_others(stub, embedding_provider):
+    stub.throttled_requests = 1
+    connector = make_connector(
+        stub, embedding_provider, bulk_max_documents=2, bulk_concurrency=1, bulk_max_retries=0
+    )
+    with pytest.raises(BulkIndexError) as error:
+        store(connector, 5)
+    assert error.value.indexed == 3
+    assert stub.count() == 23
+
+
+
+def test_refused_request_reports_documents_indexed_by_the_others(stub, embedding_provider):
+    stub.refused_requests = 1
+    connector = make_connector(stub, embedding_provider, bulk_max_documents=2, bulk_concurrency=1)
+    with pytest.raises(BulkIndexError) as error:
+        store(connector, 5)
+    assert error.value.indexed == 3
+    assert stub.bulk_requests == 3
+    assert stub.count() == 23
+
+
+def test_failed_request_reports_documents_indexed_in_it(stub, embedding_provider):
+    stub.throttled_items = 1
+    connector = make_connector(stub, embedding_provider, bulk_max_retries=0)
+    with pytest.raises(BulkIndexError) as error:
+        store(connector, 5)
+    assert error.value.indexed == 4
+    assert stub.count() == 24
+
+
+def test_search_batch_without_queries(stub, embedding_provider):
+    connector = make_connector(stub, embedding_provider)
+    assert asyncio.run(connector.search_batch([])) == []
@@ -0,0 +1,43 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from benchmarks.fake_embedding import DeterministicEmbeddingProvider
+from src.embeddings.cache import CachedEmbeddingProvider, _SqliteVectorStore
+
+
+def test_persisted_embeddings_survive_restarts(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    provider = DeterministicEmbeddingProvider(vector_size=8)
+    queries = ["first query", "second  query", "first query"]
+
+    first = CachedEmbeddingProvider(provider, max_entries=10, persist_path=path)
+    expected = asyncio.run(first.embed_queries_array(queries))
+    assert first.get_stats()["misses"] == 2
+
+    second = CachedEmbeddingProvider(provider, max_entries=10, persist_path=path)
+    embeddings = asyncio.run(second.embed_queries_array(["second query", "first query"]))
+    np.testing.assert_array_equal(embeddings, expected[[1, 0]])
+    assert second.get_stats()["disk_hits"] == 2
+    assert second.get_stats()["misses"] == 0
+
+
+def test_persistent_tier_runs_off_the_event_loop(tmp_path, monkeypatch):
+    threads = []
+    for name in ("get_many", "put_many"):
+        method = getattr(_SqliteVectorStore, name)
+
+        def record(self, *args, _method=method, **kwargs):
+            threads.append(threading.current_thread())
+            return _method(self, *args, **kwargs)
+
+        monkeypatch.setattr(_SqliteVectorStore, name, record)
+
+    cache = CachedEmbeddingProvider(
+        DeterministicEmbeddingProvider(vector_size=8), max_entries=10, persist_path=str(tmp_path / "cache.sqlite")
+    )
+    asyncio.run(cache.embed_queries_array(["first query", "second query"]))
+    # One lookup and one write for the whole batch
+    assert len(threads) == 2
+    assert threading.main_thread() not in threads
@@ -0,0 +1,163 @@
+import os
+
+import numpy as np
+import pytest
+
+from src.vectordb_mcp_servers.local.vector_store import (
+    IVF_FILE, META_FILE, OFFSETS_FILE, PAYLOADS_FILE, VECTORS_FILE, LocalVectorStore
+)
+
+DIMENSION = 16
+VECTOR_NAME = "test-model"
+
+
+def random_vectors(count: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((count, DIMENSION)).astype(np.float32)
+
+
+def append(store: LocalVectorStore, vectors: np.ndarray, prefix: str = "doc") -> None:
+    store.append(vectors, [{"document": f"{prefix}{i}"} for i in range(len(vectors))], VECTOR_NAME)
+
+
+def best_documents(store: LocalVectorStore, queries: np.ndarray, limit: int = 1):
+    return [[payload["document"] for _, payload in hits] for hits in store.search(queries, limit)]
+
+
+def test_store_persists_across_reopen(tmp_path):
+    vectors = random_vectors(50)
+    store = LocalVectorStore(str(tmp_path))
+    append(store, vectors)
+    store.close()
+
+    store = LocalVectorStore(str(tmp_path))
+    assert len(store) == 50
+    assert (store.vector_name, store.dimension) == (VECTOR_NAME, DIMENSION)
+    assert best_documents(store, vectors[[3, 42]]) == [["doc3"], ["doc42"]]
+    append(store, random_vectors(5, seed=1), prefix="new")
+    assert len(store) == 55
+    store.close()
+
+
+def test_memory_store_searches_without_path():
+    vectors = random_vectors(30)
+    store = LocalVectorStore()
+    append(store, vectors[:10])
+    append(store, vectors[10:])
+    assert len(store) == 30
+    assert best_documents(store, vectors[[0, 29]]) == [["doc0"], ["doc19"]]
+
+
+@pytest.mark.parametrize("torn_file, torn_bytes", [
+    (PAYLOADS_FILE, b'{"document": "tor'),
+    (OFFSETS_FILE, b"\x00\x01\x02"),
+    (VECTORS_FILE, b"\x00" * (DIMENSION * 4 - 4)),
+])
+def test_torn_writes_are_rolled_back(tmp_path, torn_file, torn_bytes):
+    vectors = random_vectors(20)
+    store = LocalVectorStore(str(tmp_path))
+    append(store, vectors)
+    store.close()
+    sizes = {name: os.path.getsize(tmp_path / name) for name in (VECTORS_FILE, OFFSETS_FILE, PAYLOADS_FILE)}
+    with open(tmp_path / torn_file, "ab") as f:
+        f.write(torn_bytes)
+
+    store = LocalVectorStore(str(tmp_path))
+    assert len(store) == 20
+    assert {name: os.path.getsize(tmp_path / name) for name in sizes} == sizes
+    append(store, random_vectors(1, seed=1), prefix="next")
+    assert best_documents(store, random_vectors(1, seed=1)) == [["next0"]]
+    store.close()
+
+
+def test_row_without_vector_is_rolled_back(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    append(store, random_vectors(10))
+    store.close()
+    # The payload and offset of an eleventh row were written, but not its vector
+    with open(tmp_path / PAYLOADS_FILE, "ab") as f:
+        offset = f.tell()
+        f.write(b'{"document": "lost"}\n')
+    with open(tmp_path / OFFSETS_FILE, "ab") as f:
+        f.write(np.uint64(offset).tobytes())
+
+    store = LocalVectorStore(str(tmp_path))
+    assert len(store) == 10
+    assert os.path.getsize(tmp_path / PAYLOADS_FILE) == offset
+    store.close()
+
+
+def test_meta_file_is_replaced_atomically(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    append(store, random_vectors(1))
+    store.close()
+    assert sorted(os.listdir(tmp_path)) == sorted([META_FILE, OFFSETS_FILE, PAYLOADS_FILE, VECTORS_FILE])
+
+
+def test_vector_name_and_dimension_are_checked(tmp_path):
+    store = LocalVectorStore(str(tmp_path))
+    append(store, random_vectors(3))
+    with pytest.raises(ValueError, match="dimension"):
+        store.append(np.ones((1, DIMENSION + 1), dtype=np.float32), [{"document": "x"}], VECTOR_NAME)
+    with pytest.raises(ValueError, match="other-model"):
+        store.append(random_vectors(1), [{"document": "x"}], "other-model")
+    store.close()
+
+    store = LocalVectorStore(str(tmp_path))
+    store.check_vector(VECTOR_NAME, DIMENSION)
+    with pytest.raises(ValueError):
+        store.check_vector("other-model", DIMENSION)
+    store.close()
+
+
+def test_ivf_recall_against_exact_search(tmp_path):
+    # Clustered vectors, as embeddings are, with queries close to stored vectors
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((20, DIMENSION))
+    vectors = (centers[rng.integers(0, 20, 4000)] + 0.3 * rng.standard_normal((4000, DIMENSION))).astype(np.float32)
+    queries = vectors[rng.choice(4000, 50, replace=False)] + 0.05 * rng.standard_normal((50, DIMENSION)).astype(np.float32)
+
+    store = LocalVectorStore(str(tmp_path), ivf_min_vectors=1000, ivf_probes=8)
+    append(store, vectors)
+    exact = best_documents(store, queries, limit=10)
+    assert store.needs_index()
+    store.build_index()
+    assert not store.needs_index()
+    approximate = best_documents(store, queries, limit=10)
+    recall = np.mean([len(set(a) & set(e)) / 10 for a, e in zip(approximate, exact)])
+    assert recall >= 0.9
+    store.close()
+
+    store = LocalVectorStore(str(tmp_path), ivf_min_vectors=1000, ivf_probes=8)
+    assert store._index is not None
+    assert best_documents(store, queries, limit=10) == approximate
+    store.close()
+
+
+def test_stale_ivf_index_is_discarded(tmp_path):
+    store = LocalVectorStore(str(tmp_path), ivf_min_vectors=50, ivf_probes=1)
+    append(store, random_vectors(100), prefix="a")
+    store.build_index()
+    store.close()
+    stale_index = (tmp_path / IVF_FILE).read_bytes()
+    # Roll the store back to 80 rows, as after a crash, then write other rows over the old row numbers
+    row_bytes = DIMENSION * 4
+    os.truncate(tmp_path / VECTORS_FILE, 80 * row_bytes + 5)
+    store = LocalVectorStore(str(tmp_path), ivf_min_vectors=50, ivf_probes=1)
+    assert len(store) == 80
+    assert store._index is None
+    assert not os.path.exists(tmp_path / IVF_FILE)
+    new_vectors = random_vectors(40, seed=1)
+    append(store, new_vectors, prefix="b")
+    store.close()
+
+    store = LocalVectorStore(str(tmp_path), ivf_min_vectors=50, ivf_probes=1)
+    assert store._index is None
+    assert best_documents(store, new_vectors) == [[f"b{i}"] for i in range(40)]
+    store.close()
+
+    # An index left over from before the rollback covers row numbers that now hold other vectors
+    (tmp_path / IVF_FILE).write_bytes(stale_index)
+    store = LocalVectorStore(str(tmp_path), ivf_min_vectors=50, ivf_probes=1)
+    assert store._index is None
+    assert best_documents(store, new_vectors) == [[f"b{i}"] for i in range(40)]
+    store.close()
@@ -0,0 +1,46 @@
+import asyncio
+
+from benchmarks.fake_embedding import DeterministicEmbeddingProvider
+from src.embeddings.types import EmbeddingProviderSettings
+from src.vectordb_mcp_servers.base_provider.base_mcp import Entry
+from src.vectordb_mcp_servers.local.local_mcp import LocalMCPServer
+from src.vectordb_mcp_servers.local.settings import LocalSettings, LocalToolSettings
+
+
+def make_server(**output_settings) -> LocalMCPServer:
+    return LocalMCPServer(
+        LocalToolSettings(**output_settings),
+        LocalSettings(LOCAL_SEARCH_LIMIT=5),
+        EmbeddingProviderSettings(),
+        embedding_provider=DeterministicEmbeddingProvider(vector_size=16),
+        eager_startup=True,
+        log_level="WARNING"
+    )
+
+
+async def find_batch(server: LocalMCPServer, queries) -> str:
+    await server._begin_startup()
+    await server.local_connector.store_many([Entry(content=f"memory number {i} " * 5) for i in range(20)])
+    content, _ = await server.call_tool("local-find-batch", {"queries": queries})
+    return content[0].text
+
+
+def test_find_batch_output_stays_within_the_cap():
+    for cap in (0, 20, 75, 200, 1000):
+        output = asyncio.run(find_batch(make_server(FIND_MAX_OUTPUT_CHARS=cap), [f"query {i}" for i in range(30)]))
+        assert len(output) <= cap
+
+
+def test_omitted_results_are_reported_once():
+    output = asyncio.run(find_batch(make_server(FIND_MAX_OUTPUT_CHARS=200), [f"query {i}" for i in range(30)]))
+    assert output.count("<omitted>") == 1
+    assert output.endswith("results omitted, they did not fit in the output budget</omitted>")
+    omitted = int(output.split("<omitted>")[1].split()[0])
+    assert output.count("<entry>") + omitted == 30 * 5
+
+
+def test_output_is_complete_without_cap():
+    output = asyncio.run(find_batch(make_server(), [f"query {i}" for i in range(3)]))
+    assert output.count("Results for the query") == 3
+    assert output.count("<entry>") == 15
+    assert "<omitted>" not in output
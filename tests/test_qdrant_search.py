@@ -0,0 +1,107 @@
+import asyncio
+from typing import List
+
+import numpy as np
+import pytest
+from qdrant_client import models
+
+from benchmarks.fake_embedding import DeterministicEmbeddingProvider
+from src.vectordb_mcp_servers.base_provider.base_mcp import Entry
+from src.vectordb_mcp_servers.qdrant_mcp_server.qdrant import QdrantConnector
+
+
+class CountingEmbeddingProvider(DeterministicEmbeddingProvider):
+    def __init__(self) -> None:
+        super().__init__(vector_size=8)
+        self.query_calls = 0
+
+    async def embed_queries_array(self, queries: List[str]) -> np.ndarray:
+        self.query_calls += 1
+        return await super().embed_queries_array(queries)
+
+
+async def make_connector(provider: CountingEmbeddingProvider) -> QdrantConnector:
+    connector = QdrantConnector(":memory:", None, "memories-a", provider)
+    for name in ("memories-a", "memories-b"):
+        await connector.store_many(
+            [Entry(content=f"{name} document {i}") for i in range(5)], collection_name=name
+        )
+    return connector
+
+
+def count_batch_requests(connector: QdrantConnector) -> List[str]:
+    collections = []
+    query_batch_points = connector.client.query_batch_points
+
+    async def counting(**kwargs):
+        collections.append(kwargs["collection_name"])
+        return await query_batch_points(**kwargs)
+
+    connector.client.query_batch_points = counting
+    return collections
+
+
+def test_batch_over_collections_embeds_once():
+    async def run():
+        provider = CountingEmbeddingProvider()
+        connector = await make_connector(provider)
+        queries = ["memories-a document 1", "memories-b document 3", "document"]
+        expected = [await connector.search_collections(query, ["memories-*"], limit=4) for query in queries]
+
+        provider.query_calls = 0
+        collections = count_batch_requests(connector)
+        results = await connector.search_collections_batch(queries, ["memories-*"], limit=4)
+        assert provider.query_calls == 1
+        assert sorted(collections) == ["memories-a", "memories-b"]
+        return expected, results
+
+    expected, results = asyncio.run(run())
+    assert results == expected
+    assert results[0][0].content == "memories-a document 1"
+    assert results[1][0].content == "memories-b document 3"
+    assert all(len(entries) == 4 for entries in results)
+
+
+def test_batch_over_collections_skips_failing_collections():
+    async def run():
+        connector = await make_connector(CountingEmbeddingProvider())
+        query_batch_points = connector.client.query_batch_points
+
+        async def failing(**kwargs):
+            if kwargs["collection_name"] == "memories-b":
+                raise ConnectionError("refused")
+            return await query_batch_points(**kwargs)
+
+        connector.client.query_batch_points = failing
+        return await connector.search_collections_batch(
+            ["memories-a document 1", "memories-b document 1"], ["memories-a", "memories-b", "missing"], limit=3
+        )
+
+    results = asyncio.run(run())
+    assert [len(entries) for entries in results] == [3, 3]
+    assert all(entry.content.startswith("memories-a") for entries in results for entry in entries)
+
+
+def test_batch_over_collections_refuses_mixed_distances():
+    async def run():
+        provider = CountingEmbeddingProvider()
+        connector = await make_connector(provider)
+        await connector.client.create_collection(
+            "memories-euclid",
+            vectors_config={"deterministic": models.VectorParams(size=8, distance=models.Distance.EUCLID)}
+        )
+        await connector.client.upsert("memories-euclid", points=[
+            models.PointStruct(id=1, vector={"deterministic": provider._embed("e").tolist()}, payload={"document": "e"})
+        ])
+        await connector.search_collections_batch(["e", "document"], ["memories-*"])
+
+    with pytest.raises(ValueError, match="different distances"):
+        asyncio.run(run())
+
+
+def test_batch_over_collections_without_queries():
+    async def run():
+        connector = await make_connector(CountingEmbeddingProvider())
+        return await connector.search_collections_batch([], ["memories-*"])
+
+    assert asyncio.run(run()) == []
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from src.vectordb_mcp_servers.base_provider.base_mcp import Entry
+from src.vectordb_mcp_servers.base_provider.metrics import Metrics
+from src.vectordb_mcp_servers.base_provider.write_buffer import WriteBehindBuffer, WriteBehindError
+
+
+class FlakyWriter:
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.written = []
+
+    async def __call__(self, collection_name, entries):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        self.written.extend(entry.content for entry in entries)
+
+
+def make_buffer(writer: FlakyWriter, metrics: Metrics) -> WriteBehindBuffer:
+    return WriteBehindBuffer(writer, flush_interval_ms=1, max_retries=2, retry_backoff_ms=1, metrics=metrics)
+
+
+def test_failed_writes_are_retried():
+    writer, metrics = FlakyWriter(failures=2), Metrics(enabled=True)
+
+    async def run():
+        buffer = make_buffer(writer, metrics)
+        for i in range(3):
+            await buffer.put("memories", Entry(content=f"entry {i}"))
+        await buffer.close()
+
+    asyncio.run(run())
+    assert writer.written == ["entry 0", "entry 1", "entry 2"]
+    assert 'write_behind_retries_total{collection="memories"} 2' in metrics.render_prometheus()
+
+
+def test_lost_entries_are_reported_once():
+    writer, metrics = FlakyWriter(failures=100), Metrics(enabled=True)
+
+    async def run():
+        buffer = make_buffer(writer, metrics)
+        await buffer.put("memories", Entry(content="entry"))
+        # Searches flush without raising, the loss is kept for the next flush
+        await buffer.flush("memories", raise_errors=False)
+        with pytest.raises(WriteBehindError, match="1 to memories"):
+            await buffer.flush()
+        await buffer.flush()
+        await buffer.put("memories", Entry(content="entry"))
+        with pytest.raises(WriteBehindError):
+            await buffer.close()
+
+    asyncio.run(run())
+    assert writer.written == []
+    assert 'write_behind_lost_entries_total{collection="memories"} 2' in metrics.render_prometheus()